@@ -0,0 +1,35 @@
+import json
+import argparse
+from src.AdaptiveRag.batch import BatchRunner
+from src.AdaptiveRag.server import load_settings
+from src.AdaptiveRag.progress import configure_logging
+
+
+def parse_provider_limits(values):
+    limits = {}
+    for value in values or []:
+        provider, _, limit = value.partition("=")
+        limits[provider.strip()] = int(limit)
+    return limits
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Answer the questions of a JSONL file with the Adaptive RAG graph.")
+    parser.add_argument("input", help="Input JSONL file, one {\"question\": ..., \"id\": ...} object per line")
+    parser.add_argument("output", help="Output JSONL file with one result per question")
+    parser.add_argument("--workers", type=int, default=8, help="Number of questions answered concurrently")
+    parser.add_argument("--provider-limit", action="append", metavar="PROVIDER=N",
+                        help="Maximum concurrent LLM calls for a provider, e.g. OpenAI=8 (repeatable)")
+    parser.add_argument("--no-resume", action="store_true", help="Overwrite the output file instead of resuming")
+    parser.add_argument("--config", help="Path of the ini file with the [SERVER] settings")
+    args = parser.parse_args()
+
+    # Progress goes to stderr, the summary on stdout stays parseable
+    configure_logging()
+    settings = load_settings(args.config)
+    runner = BatchRunner(
+        settings.user_input,
+        max_workers=args.workers,
+        provider_limits=parse_provider_limits(args.provider_limit)
+    )
+    print(json.dumps(runner.run(args.input, args.output, resume=not args.no_resume)))
@@ -0,0 +1,61 @@
+import json
+import argparse
+from src.AdaptiveRag.benchmark import BenchmarkRunner, IndexBenchmark, LocalCorpusServer, SplitBenchmark, SCENARIOS
+from src.AdaptiveRag.progress import configure_logging
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Adaptive RAG graph and ingest pipeline offline.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable), all scenarios if omitted")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of times every question is asked")
+    parser.add_argument("--workers", type=int, default=4, help="Number of questions answered concurrently")
+    parser.add_argument("--pages-per-topic", type=int, default=5, help="Number of corpus articles per topic")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per LLM call")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Simulated seconds per answer token")
+    parser.add_argument("--embedding-latency", type=float, default=0.0, help="Simulated seconds per embedding call")
+    parser.add_argument("--search-latency", type=float, default=0.0, help="Simulated seconds per web search")
+    parser.add_argument("--trace-memory", action="store_true", help="Report peak Python memory (slower)")
+    parser.add_argument("--index", action="store_true",
+                        help="Compare recall@k and latency of the FAISS index types instead of running the graph")
+    parser.add_argument("--index-vectors", type=int, default=100000, help="Number of vectors of the index benchmark")
+    parser.add_argument("--index-dimension", type=int, default=256, help="Vector dimension of the index benchmark")
+    parser.add_argument("--index-queries", type=int, default=500, help="Number of queries of the index benchmark")
+    parser.add_argument("--split", action="store_true",
+                        help="Compare serial and process-pool splitting throughput instead of running the graph")
+    parser.add_argument("--split-documents", type=int, default=2000, help="Number of pages of the split benchmark")
+    parser.add_argument("--split-workers", type=int, action="append",
+                        help="Worker process count of the split benchmark (repeatable)")
+    args = parser.parse_args()
+
+    # Progress goes to stderr, the JSON report on stdout stays parseable
+    configure_logging()
+
+    if args.split:
+        split_benchmark = SplitBenchmark(num_documents=args.split_documents)
+        print(json.dumps(split_benchmark.run(workers=args.split_workers), indent=2))
+        raise SystemExit(0)
+
+    if args.index:
+        index_benchmark = IndexBenchmark(
+            num_vectors=args.index_vectors, dimension=args.index_dimension, num_queries=args.index_queries
+        )
+        print(json.dumps(index_benchmark.run(), indent=2))
+        raise SystemExit(0)
+
+    with LocalCorpusServer(pages_per_topic=args.pages_per_topic) as corpus:
+        benchmark = BenchmarkRunner(
+            corpus.urls(),
+            llm_latency=args.llm_latency,
+            token_latency=args.token_latency,
+            embedding_latency=args.embedding_latency,
+            search_latency=args.search_latency,
+            workers=args.workers,
+            trace_memory=args.trace_memory
+        )
+
+        report = {"ingest": benchmark.run_ingest(), "scenarios": []}
+        for name in args.scenario or list(SCENARIOS):
+            report["scenarios"].append(benchmark.run_scenario(SCENARIOS[name], repeats=args.repeats))
+
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,8 @@
+import uvicorn
+from src.AdaptiveRag.server import create_app, load_settings
+from src.AdaptiveRag.progress import configure_logging
+
+if __name__ == "__main__":
+    configure_logging()
+    settings = load_settings()
+    uvicorn.run(create_app(settings), host=settings.host, port=settings.port)
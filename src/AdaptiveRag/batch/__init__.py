@@ -0,0 +1,2 @@
+from src.AdaptiveRag.batch.concurrency import ProviderConcurrencyLimiter
+from src.AdaptiveRag.batch.runner import BatchRunner
@@ -0,0 +1,55 @@
+import threading
+from typing import Any, Dict, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+class ProviderConcurrencyLimiter(BaseCallbackHandler):
+    """Callback handler capping the number of concurrent LLM calls per provider.
+
+    A worker blocks in ``on_chat_model_start`` until a slot of its provider is
+    free and gives the slot back when the call ends or fails, so a large
+    worker pool never has more calls in flight than the provider's rate
+    limits allow. Providers without a limit are not throttled.
+    """
+
+    # Block the calling worker thread itself rather than a callback executor
+    run_inline = True
+    raise_error = True
+
+    def __init__(self, provider: str, limits: Dict[str, int]):
+        """Initialize the limiter.
+
+        Args:
+            provider: Provider of the calls made with this handler, e.g. "OpenAI"
+            limits: Maximum concurrent calls per provider
+        """
+        limit = limits.get(provider)
+        self.semaphore = threading.BoundedSemaphore(limit) if limit else None
+        self._held: Dict[UUID, bool] = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, run_id: UUID) -> None:
+        if self.semaphore is None:
+            return
+        self.semaphore.acquire()
+        with self._lock:
+            self._held[run_id] = True
+
+    def _release(self, run_id: UUID) -> None:
+        with self._lock:
+            held = self._held.pop(run_id, False)
+        if held:
+            self.semaphore.release()
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._acquire(run_id)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._acquire(run_id)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._release(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        self._release(run_id)
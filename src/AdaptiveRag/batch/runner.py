@@ -0,0 +1,188 @@
+import logging
+import json
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Set
+from src.AdaptiveRag.graph import GraphBuilder
+from src.AdaptiveRag.llm import get_llm
+from src.AdaptiveRag.retriever import Retriever
+from src.AdaptiveRag.tools.tool_manager import ToolManager
+from src.AdaptiveRag.state import RequestBudget
+from src.AdaptiveRag.batch.concurrency import ProviderConcurrencyLimiter
+from src.AdaptiveRag.metrics import Instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class BatchRunner:
+    """Answers the questions of a JSONL file with one shared graph and a pool of workers.
+
+    Every input line is a JSON object with a ``question`` and an optional
+    ``id`` (the line number otherwise). Every output line records the answer,
+    the nodes the request went through, the time spent in each of them, the
+    stop reason and the number of LLM calls, or the error that ended the
+    request. Results are appended as they finish, so an interrupted run can
+    be resumed: questions whose id already has a successful result in the
+    output file are skipped.
+    """
+
+    def __init__(self,
+                 user_input: Dict[str, Any],
+                 max_workers: int = 8,
+                 provider_limits: Optional[Dict[str, int]] = None,
+                 retriever: Optional[Retriever] = None,
+                 tool_manager: Optional[ToolManager] = None):
+        """Build the index and compile the graph once for the whole batch.
+
+        Args:
+            user_input: Dictionary containing user configuration
+            max_workers: Number of questions answered concurrently
+            provider_limits: Maximum concurrent LLM calls per provider, e.g. {"OpenAI": 8}
+            retriever: An already built retriever to use, one is built if omitted
+            tool_manager: Tool manager providing the web search tool, the default Tavily tools if omitted
+
+        Raises:
+            RuntimeError: If the LLM or the graph cannot be initialized
+        """
+        self.user_input = user_input
+        self.max_workers = max(1, max_workers)
+
+        if get_llm(user_input=user_input) is None:
+            raise RuntimeError(f"Failed to initialize the {user_input.get('selected_llm')} LLM")
+
+        if retriever is None:
+            retriever = Retriever(user_input)
+            retriever.get_retriever()
+        self.retriever = retriever
+
+        self.graph = GraphBuilder(user_input, retriever=self.retriever, tool_manager=tool_manager).setup_graph()
+        if self.graph is None:
+            raise RuntimeError("Graph setup failed")
+
+        self.budget = RequestBudget(user_input)
+        self.limiter = ProviderConcurrencyLimiter(user_input.get("selected_llm"), provider_limits or {})
+
+    @staticmethod
+    def read_questions(input_path: str) -> Iterator[Dict[str, Any]]:
+        """Read the questions of a JSONL file, giving every question an id.
+
+        Args:
+            input_path: Path of the input JSONL file
+
+        Yields:
+            dict: The input record with an ``id``
+        """
+        with open(input_path, mode="r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                record.setdefault("id", line_number)
+                yield record
+
+    @staticmethod
+    def completed_ids(output_path: str) -> Set[str]:
+        """Ids already answered successfully in an earlier, possibly interrupted, run.
+
+        Args:
+            output_path: Path of the output JSONL file
+
+        Returns:
+            set: The ids as strings
+        """
+        completed = set()
+        if not Path(output_path).exists():
+            return completed
+
+        with open(output_path, mode="r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line may be cut short by the interruption
+                    continue
+                if not result.get("error"):
+                    completed.add(str(result.get("id")))
+        return completed
+
+    def answer(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one question through the graph.
+
+        Node latencies are measured between consecutive graph updates, so the
+        time of the routing edge following a node is attributed to that node.
+
+        Args:
+            record: Input record with ``id`` and ``question``
+
+        Returns:
+            dict: The result record written to the output file
+        """
+        result = {"id": record["id"], "question": record["question"]}
+        route: List[str] = []
+        node_latencies: List[Dict[str, Any]] = []
+        final_state: Dict[str, Any] = {}
+
+        state, config = self.budget.start(record["question"])
+        config["callbacks"] = config["callbacks"] + [self.limiter]
+        request_metrics = Instrumentation.start_request(config) if self.user_input.get("metrics") else None
+
+        started = last = time.perf_counter()
+        try:
+            for update in self.graph.stream(state, config=config, stream_mode="updates"):
+                now = time.perf_counter()
+                for node, node_update in update.items():
+                    route.append(node)
+                    node_latencies.append({"node": node, "seconds": round(now - last, 4)})
+                    final_state.update(node_update or {})
+                last = now
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {str(e)}"
+
+        result.update({
+            "answer": final_state.get("generation"),
+            "route": route,
+            "node_latencies": node_latencies,
+            "total_seconds": round(time.perf_counter() - started, 4),
+            "stop_reason": final_state.get("stop_reason"),
+            "llm_calls": RequestBudget.llm_calls(final_state, config)
+        })
+        if request_metrics is not None:
+            result["metrics"] = request_metrics.summary()
+        return result
+
+    def run(self, input_path: str, output_path: str, resume: bool = True) -> Dict[str, int]:
+        """Answer every question of the input file and append the results to the output file.
+
+        Args:
+            input_path: Path of the input JSONL file
+            output_path: Path of the output JSONL file
+            resume: Skip questions already answered successfully in the output file
+
+        Returns:
+            dict: Number of questions answered, failed and skipped
+        """
+        completed = self.completed_ids(output_path) if resume else set()
+        all_records = list(self.read_questions(input_path))
+        records = [record for record in all_records if str(record["id"]) not in completed]
+        counts = {"answered": 0, "failed": 0, "skipped": len(all_records) - len(records)}
+        logger.info(f"---ANSWERING {len(records)} QUESTION(S) WITH {self.max_workers} WORKER(S), SKIPPING {counts['skipped']}---")
+
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, mode="a" if resume else "w", encoding="utf-8") as out, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Terminate a line cut short by an interruption before appending
+            if resume and out.tell() and not Path(output_path).read_bytes().endswith(b"\n"):
+                out.write("\n")
+
+            futures = [executor.submit(self.answer, record) for record in records]
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                counts["failed" if result.get("error") else "answered"] += 1
+
+                # Only this thread writes; flushing every line keeps the file resumable
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                logger.info(f"---COMPLETED {done}/{len(records)}: {result['id']}---")
+
+        return counts
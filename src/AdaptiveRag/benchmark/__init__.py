@@ -0,0 +1,6 @@
+from src.AdaptiveRag.benchmark.fakes import FakeChatModel, FakeLLM, HashingEmbeddings, StubSearchTool, register_fakes
+from src.AdaptiveRag.benchmark.corpus import LocalCorpusServer
+from src.AdaptiveRag.benchmark.scenarios import Scenario, SCENARIOS
+from src.AdaptiveRag.benchmark.runner import BenchmarkRunner
+from src.AdaptiveRag.benchmark.index_benchmark import IndexBenchmark
+from src.AdaptiveRag.benchmark.split_benchmark import SplitBenchmark
@@ -0,0 +1,144 @@
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+TOPIC_WORDS = {
+    "agents": "agent planning memory tool use reflection task decomposition autonomous loop observation action",
+    "prompt-engineering": "prompt instruction few shot chain of thought example template zero shot reasoning format",
+    "adversarial-attacks": "adversarial attack jailbreak suffix token manipulation red teaming robustness defense"
+}
+FILLER_WORDS = "the a of and to in is that for on with as by this it model language large system".split()
+BOILERPLATE = "<nav>Home | Posts | Archive | About</nav>"
+FOOTER = "<footer>Copyright 2024. All rights reserved. Subscribe to the newsletter.</footer>"
+
+
+def generate_page(topic: str, page: int, paragraphs: int = 40, words_per_paragraph: int = 120) -> str:
+    """Generate a deterministic HTML article about a topic.
+
+    Args:
+        topic: One of the TOPIC_WORDS topics
+        page: Page number, seeds the generator
+        paragraphs: Number of paragraphs
+        words_per_paragraph: Number of words per paragraph
+
+    Returns:
+        str: The HTML page
+    """
+    rng = random.Random(f"{topic}-{page}")
+    topic_words = TOPIC_WORDS[topic].split()
+    body = []
+    for _ in range(paragraphs):
+        words = [rng.choice(topic_words if rng.random() < 0.4 else FILLER_WORDS) for _ in range(words_per_paragraph)]
+        body.append(f"<p>{' '.join(words).capitalize()}.</p>")
+
+    return (
+        f"<html><head><title>{topic} {page}</title></head><body>{BOILERPLATE}"
+        f"<article><h1>{topic.replace('-', ' ').title()} part {page}</h1>{''.join(body)}</article>"
+        f"{FOOTER}</body></html>"
+    )
+
+
+class LocalCorpusServer:
+    """Serves generated articles over HTTP on localhost, so ingest runs the real loader without the internet.
+
+    Every response can be delayed to simulate a slow site. The server records
+    when each request arrived and the peak number of requests it was serving
+    at the same time, so tests can check how a client paces its requests.
+    """
+
+    def __init__(self, pages_per_topic: int = 5, paragraphs: int = 40, latency: float = 0.0, jitter: float = 0.0):
+        """Initialize the server.
+
+        Args:
+            pages_per_topic: Number of articles per topic
+            paragraphs: Number of paragraphs per article
+            latency: Delay of every response in seconds
+            jitter: Maximum extra delay in seconds, fixed per article so responses complete out of order
+        """
+        self.pages_per_topic = pages_per_topic
+        self.paragraphs = paragraphs
+        self.latency = latency
+        self.jitter = jitter
+        self.request_times: List[float] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _delay(self, path: str) -> float:
+        return self.latency + random.Random(path).random() * self.jitter
+
+    def _enter_request(self) -> None:
+        with self._lock:
+            self.request_times.append(time.monotonic())
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _exit_request(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _handler(self):
+        corpus = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                corpus._enter_request()
+                try:
+                    self._respond()
+                finally:
+                    corpus._exit_request()
+
+            def _respond(self):
+                parts = self.path.strip("/").split("/")
+                if len(parts) != 2 or parts[0] not in TOPIC_WORDS or not parts[1].isdigit():
+                    self.send_error(404)
+                    return
+                time.sleep(corpus._delay(self.path))
+                body = generate_page(parts[0], int(parts[1]), paragraphs=corpus.paragraphs).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> List[str]:
+        """Start serving in a background thread.
+
+        Returns:
+            List[str]: URLs of all articles
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.urls()
+
+    def urls(self) -> List[str]:
+        """URLs of all articles served."""
+        host, port = self._server.server_address[:2]
+        return [
+            f"http://{host}:{port}/{topic}/{page}"
+            for topic in TOPIC_WORDS for page in range(self.pages_per_topic)
+        ]
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "LocalCorpusServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
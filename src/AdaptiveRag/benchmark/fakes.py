@@ -0,0 +1,208 @@
+import re
+import json
+import time
+import asyncio
+import hashlib
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+import numpy as np
+from pydantic import BaseModel, Field
+from langchain_core.callbacks import CallbackManagerForLLMRun, AsyncCallbackManagerForLLMRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import BaseTool
+from src.AdaptiveRag.llm.base_llm import BaseLLMProvider
+from src.AdaptiveRag.llm.llm import LLM_PROVIDERS
+from src.AdaptiveRag.retriever.embeddings import EMBEDDING_PROVIDERS
+from src.AdaptiveRag.tools.tool_manager import ToolManager
+
+FAKE_PROVIDER = "Fake"
+HASHING_PROVIDER = "Hashing"
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model answering from a script, with configurable latency and no network access.
+
+    Structured output calls are answered from ``responses``, keyed by the name
+    of the requested schema; plain text calls from the "text" key. Every
+    script is a list of rules ``{"when": substring, "output": ...}`` matched
+    against the rendered prompt; the first rule whose substring occurs in the
+    prompt (or that has no "when") wins. Scripts therefore depend on the
+    request's content only, and stay deterministic under concurrent requests.
+    """
+
+    model: str = "fake-chat-model"
+    responses: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict)
+    latency: float = 0.0
+    token_latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "latency": self.latency, "token_latency": self.token_latency}
+
+    @staticmethod
+    def _prompt(messages: List[BaseMessage]) -> str:
+        return "\n".join(message.content if isinstance(message.content, str) else str(message.content)
+                         for message in messages)
+
+    def _respond(self, messages: List[BaseMessage], schema_name: Optional[str]) -> str:
+        """Pick the scripted output for the prompt."""
+        script_name = schema_name or "text"
+        prompt = self._prompt(messages)
+
+        for rule in self.responses.get(script_name, []):
+            if not rule.get("when") or rule["when"] in prompt:
+                output = rule["output"]
+                return output if isinstance(output, str) else json.dumps(output)
+
+        raise ValueError(f"No scripted response for {script_name}")
+
+    @staticmethod
+    def _message(content: str, messages: List[BaseMessage]) -> AIMessage:
+        input_tokens = len(FakeChatModel._prompt(messages).split())
+        output_tokens = len(content.split())
+        return AIMessage(content=content, usage_metadata={
+            "input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens
+        })
+
+    def _generate(self,
+                  messages: List[BaseMessage],
+                  stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None,
+                  structured_output_schema: Optional[str] = None,
+                  **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        content = self._respond(messages, structured_output_schema)
+        return ChatResult(generations=[ChatGeneration(message=self._message(content, messages))])
+
+    async def _agenerate(self,
+                         messages: List[BaseMessage],
+                         stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                         structured_output_schema: Optional[str] = None,
+                         **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        content = self._respond(messages, structured_output_schema)
+        return ChatResult(generations=[ChatGeneration(message=self._message(content, messages))])
+
+    def _stream(self,
+                messages: List[BaseMessage],
+                stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        content = self._respond(messages, kwargs.get("structured_output_schema"))
+        for token in re.findall(r"\S+\s*", content):
+            time.sleep(self.token_latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    def with_structured_output(self, schema: Type[BaseModel], **kwargs: Any):
+        """Answer with a scripted instance of the schema."""
+        return self.bind(structured_output_schema=schema.__name__) | RunnableLambda(
+            lambda message: schema.model_validate_json(message.content)
+        )
+
+
+class FakeLLM(BaseLLMProvider):
+    """Provider handing out a FakeChatModel configured from ``llm_params``."""
+
+    API_KEY_NAME = "FAKE_API_KEY"
+    MODEL_KEY = "selected_fake_model"
+
+    def get_llm_model(self) -> Optional[BaseChatModel]:
+        self.llm = FakeChatModel(
+            model=self.user_input.get(self.MODEL_KEY) or "fake-chat-model",
+            **self._get_model_params()
+        )
+        return self.llm
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic local embeddings hashing words into a fixed number of signed buckets.
+
+    Texts sharing words get similar vectors, which is enough for retrieval
+    to behave plausibly without any provider call.
+    """
+
+    def __init__(self, model: str = "hashing-256", dimensions: int = 256, latency: float = 0.0):
+        """Initialize the embedding model.
+
+        Args:
+            model: Model name, part of the embedding cache namespace
+            dimensions: Number of dimensions of the vectors
+            latency: Simulated latency per call in seconds
+        """
+        self.model = model
+        self.dimensions = dimensions
+        self.latency = latency
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            digest = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+            vector[digest % self.dimensions] += 1.0 if digest >> 63 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency)
+        return self._embed(text)
+
+
+class StubSearchTool(BaseTool):
+    """Web search tool returning canned results about the query after a fixed latency."""
+
+    name: str = "web_search"
+    description: str = "Stub web search returning canned results."
+    max_results: int = 5
+    latency: float = 0.0
+    # Number of searches actually run, e.g. to check that cached searches skip the tool
+    calls: int = 0
+
+    def _results(self, query: str) -> List[Dict[str, str]]:
+        return [
+            {"url": f"https://search.invalid/{i}", "content": f"Result {i} about {query}: " + "lorem ipsum " * 50}
+            for i in range(self.max_results)
+        ]
+
+    def _run(self, query: str, **kwargs: Any) -> List[Dict[str, str]]:
+        self.calls += 1
+        time.sleep(self.latency)
+        return self._results(query)
+
+    async def _arun(self, query: str, **kwargs: Any) -> List[Dict[str, str]]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return self._results(query)
+
+
+def stub_tool_manager(latency: float = 0.0) -> ToolManager:
+    """Create a tool manager whose "web_search" tool is a StubSearchTool."""
+    tool_manager = ToolManager()
+    tool_manager.add_tool("web_search", StubSearchTool(latency=latency))
+    return tool_manager
+
+
+def register_fakes(embedding_latency: float = 0.0) -> None:
+    """Register the fake chat model and the hashing embeddings as providers.
+
+    Args:
+        embedding_latency: Simulated latency of every embedding call in seconds
+    """
+    LLM_PROVIDERS[FAKE_PROVIDER] = FakeLLM
+    EMBEDDING_PROVIDERS[HASHING_PROVIDER] = partial(HashingEmbeddings, latency=embedding_latency)
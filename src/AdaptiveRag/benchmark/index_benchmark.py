@@ -0,0 +1,115 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.AdaptiveRag.retriever.index_factory import IndexFactory
+
+# Index type and search parameters compared against the exact flat baseline
+DEFAULT_CONFIGURATIONS: List[Tuple[str, Dict[str, int]]] = [
+    ("ivf", {"nprobe": 1}),
+    ("ivf", {"nprobe": 8}),
+    ("ivf", {"nprobe": 32}),
+    ("hnsw", {"ef_search": 16}),
+    ("hnsw", {"ef_search": 64}),
+    ("hnsw", {"ef_search": 256}),
+    ("ivfpq", {"nprobe": 8}),
+    ("ivfpq", {"nprobe": 32})
+]
+
+
+class IndexBenchmark:
+    """Measures recall@k and query latency of the FAISS index types against exact search.
+
+    The corpus is synthetic: unit-norm vectors drawn around random cluster
+    centers, which mimics the topical structure of chunk embeddings. Queries
+    are perturbed corpus vectors, and the exact flat index provides the
+    ground-truth neighbors.
+    """
+
+    def __init__(self,
+                 num_vectors: int = 100000,
+                 dimension: int = 256,
+                 num_queries: int = 500,
+                 top_k: int = 4,
+                 num_clusters: int = 100,
+                 seed: int = 0):
+        """Initialize the benchmark.
+
+        Args:
+            num_vectors: Number of corpus vectors
+            dimension: Dimension of the vectors
+            num_queries: Number of queries measured
+            top_k: Number of neighbors retrieved per query
+            num_clusters: Number of topics the corpus vectors are drawn around
+            seed: Seed of the random generator
+        """
+        rng = np.random.default_rng(seed)
+        centers = rng.standard_normal((num_clusters, dimension)).astype(np.float32)
+        assignments = rng.integers(0, num_clusters, size=num_vectors)
+        self.vectors = self._normalize(centers[assignments] + 0.5 * rng.standard_normal((num_vectors, dimension)))
+
+        picks = rng.integers(0, num_vectors, size=num_queries)
+        self.queries = self._normalize(self.vectors[picks] + 0.3 * rng.standard_normal((num_queries, dimension)))
+        self.top_k = top_k
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    def _measure(self, factory: IndexFactory, index_type: str) -> Tuple[Dict[str, Any], np.ndarray]:
+        started = time.perf_counter()
+        index = factory.build(self.vectors, index_type=index_type)
+        index.add(self.vectors)
+        build_seconds = time.perf_counter() - started
+
+        latencies = []
+        neighbors = np.empty((len(self.queries), self.top_k), dtype=np.int64)
+        for i, query in enumerate(self.queries):
+            started = time.perf_counter()
+            _, ids = index.search(query.reshape(1, -1), self.top_k)
+            latencies.append(time.perf_counter() - started)
+            neighbors[i] = ids[0]
+
+        latencies = np.array(latencies) * 1000
+        return {
+            "index_type": IndexFactory.describe(index),
+            "build_seconds": round(build_seconds, 3),
+            "latency_ms": {
+                "mean": round(float(latencies.mean()), 4),
+                "p50": round(float(np.percentile(latencies, 50)), 4),
+                "p95": round(float(np.percentile(latencies, 95)), 4)
+            }
+        }, neighbors
+
+    def _recall(self, neighbors: np.ndarray, ground_truth: np.ndarray) -> float:
+        hits = sum(len(set(found) & set(truth)) for found, truth in zip(neighbors, ground_truth))
+        return round(hits / ground_truth.size, 4)
+
+    def run(self, configurations: Optional[Sequence[Tuple[str, Dict[str, int]]]] = None) -> Dict[str, Any]:
+        """Run the benchmark.
+
+        Args:
+            configurations: Index types and search parameters to compare, defaults to ``DEFAULT_CONFIGURATIONS``
+
+        Returns:
+            dict: Corpus size, the flat baseline and recall@k, latency and build time of every configuration
+        """
+        baseline, ground_truth = self._measure(IndexFactory(index_type="flat"), "flat")
+        baseline["recall"] = 1.0
+
+        results = []
+        for index_type, params in configurations or DEFAULT_CONFIGURATIONS:
+            result, neighbors = self._measure(IndexFactory(index_type=index_type, **params), index_type)
+            result.update(params=params, recall=self._recall(neighbors, ground_truth))
+            results.append(result)
+
+        return {
+            "vectors": len(self.vectors),
+            "dimension": self.vectors.shape[1],
+            "queries": len(self.queries),
+            "top_k": self.top_k,
+            "baseline": baseline,
+            "results": results
+        }
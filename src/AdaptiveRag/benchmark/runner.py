@@ -0,0 +1,173 @@
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.AdaptiveRag.batch import BatchRunner
+from src.AdaptiveRag.retriever import Retriever
+from src.AdaptiveRag.benchmark.fakes import FAKE_PROVIDER, HASHING_PROVIDER, register_fakes, stub_tool_manager
+from src.AdaptiveRag.benchmark.scenarios import Scenario
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percentile / 100 * (len(values) - 1))))]
+
+
+def _latency_stats(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 4) if values else 0.0,
+        "p50": round(_percentile(values, 50), 4),
+        "p95": round(_percentile(values, 95), 4)
+    }
+
+
+class BenchmarkRunner:
+    """Runs the real graph and ingest pipeline against the deterministic stand-ins.
+
+    The fake chat model, the hashing embeddings and the stub search tool
+    replace every network dependency, and the corpus is served from
+    localhost, so measured times are the project's own overhead plus the
+    configured simulated latencies. All caches are disabled so every run
+    does the full work.
+    """
+
+    def __init__(self,
+                 urls: List[str],
+                 llm_latency: float = 0.0,
+                 token_latency: float = 0.0,
+                 embedding_latency: float = 0.0,
+                 search_latency: float = 0.0,
+                 workers: int = 4,
+                 trace_memory: bool = False,
+                 extra_user_input: Optional[Dict[str, Any]] = None):
+        """Initialize the benchmark.
+
+        Args:
+            urls: URLs of the corpus to ingest
+            llm_latency: Simulated latency of every LLM call in seconds
+            token_latency: Simulated latency per streamed answer token in seconds
+            embedding_latency: Simulated latency of every embedding call in seconds
+            search_latency: Simulated latency of every web search in seconds
+            workers: Number of questions answered concurrently
+            trace_memory: Measure peak Python memory with tracemalloc (slows the run down)
+            extra_user_input: Configuration overriding the benchmark defaults
+        """
+        register_fakes(embedding_latency=embedding_latency)
+        self.urls = urls
+        self.llm_latency = llm_latency
+        self.token_latency = token_latency
+        self.search_latency = search_latency
+        self.workers = workers
+        self.trace_memory = trace_memory
+        self.extra_user_input = extra_user_input or {}
+        self.retriever: Optional[Retriever] = None
+
+    def user_input(self, responses: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Configuration of a benchmark run."""
+        user_input = {
+            "selected_llm": FAKE_PROVIDER,
+            "llm_params": {
+                "responses": responses or {},
+                "latency": self.llm_latency,
+                "token_latency": self.token_latency
+            },
+            "embedding_provider": HASHING_PROVIDER,
+            "urls": self.urls,
+            "query_routing_mode": "llm",
+            "embedding_cache": False,
+            "index_cache": False,
+            "llm_cache": False,
+            "semantic_cache": False,
+            "web_search_cache": False,
+            "loader_requests_per_second": 0
+        }
+        user_input.update(self.extra_user_input)
+        return user_input
+
+    def _start_memory(self) -> None:
+        if self.trace_memory:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+
+    def _peak_memory_mb(self) -> Optional[float]:
+        if not self.trace_memory:
+            return None
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return round(peak / 2 ** 20, 2)
+
+    def run_ingest(self) -> Dict[str, Any]:
+        """Load, split, embed and index the corpus.
+
+        Returns:
+            dict: Ingest time, number of pages and chunks, and throughput
+        """
+        self._start_memory()
+        started = time.perf_counter()
+
+        self.retriever = Retriever(self.user_input())
+        self.retriever.get_retriever()
+
+        seconds = time.perf_counter() - started
+        num_chunks = self.retriever.vector_store.index.ntotal
+        return {
+            "pages": len(self.urls) - len(self.retriever.loader.failed_urls),
+            "chunks": num_chunks,
+            "seconds": round(seconds, 4),
+            "chunks_per_second": round(num_chunks / seconds, 2) if seconds else 0.0,
+            "peak_memory_mb": self._peak_memory_mb()
+        }
+
+    def run_scenario(self, scenario: Scenario, repeats: int = 1) -> Dict[str, Any]:
+        """Answer the scenario's questions through the compiled graph.
+
+        Args:
+            scenario: The scenario to run
+            repeats: Number of times every question is asked
+
+        Returns:
+            dict: Throughput, request and per-node latencies, LLM calls, routes and memory
+        """
+        if self.retriever is None:
+            self.run_ingest()
+
+        runner = BatchRunner(
+            self.user_input(scenario.responses),
+            max_workers=self.workers,
+            retriever=self.retriever,
+            tool_manager=stub_tool_manager(latency=self.search_latency)
+        )
+        records = [
+            {"id": f"{i}-{j}", "question": question}
+            for i in range(repeats) for j, question in enumerate(scenario.questions)
+        ]
+
+        self._start_memory()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(runner.answer, records))
+        seconds = time.perf_counter() - started
+
+        node_latencies = defaultdict(list)
+        for result in results:
+            for latency in result["node_latencies"]:
+                node_latencies[latency["node"]].append(latency["seconds"])
+        llm_calls = [result["llm_calls"] for result in results]
+
+        return {
+            "scenario": scenario.name,
+            "requests": len(results),
+            "errors": sum(1 for result in results if result.get("error")),
+            "seconds": round(seconds, 4),
+            "requests_per_second": round(len(results) / seconds, 2) if seconds else 0.0,
+            "request_latency": _latency_stats([result["total_seconds"] for result in results]),
+            "node_latency": {node: _latency_stats(values) for node, values in node_latencies.items()},
+            "llm_calls": {"total": sum(llm_calls), "per_request": round(sum(llm_calls) / len(results), 2) if results else 0.0},
+            "routes": dict(Counter(" -> ".join(result["route"]) for result in results)),
+            "peak_memory_mb": self._peak_memory_mb()
+        }
@@ -0,0 +1,70 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+YES = {"binary_score": "yes"}
+NO = {"binary_score": "no"}
+ANSWER = (
+    "LLM powered agents combine a planning component that decomposes tasks, a memory component that "
+    "stores observations, and tool use that lets the model act on the outside world."
+)
+REWRITE_MARKER = "(rewritten)"
+
+
+@dataclass
+class Scenario:
+    """A benchmark scenario: the questions asked and how the fake LLM answers them."""
+
+    name: str
+    description: str
+    questions: List[str]
+    # FakeChatModel script, keyed by structured output schema name ("text" for plain text calls)
+    responses: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+
+
+def _responses(datasource: str, document_grades: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        "QueryRouter": [{"output": {"datasource": datasource}}],
+        "GradeDocument": document_grades,
+        "GradeDocuments": [{"output": {"binary_scores": ["yes"] * 4}}],
+        "GradeHallucinations": [{"output": YES}],
+        "GradeAnswer": [{"output": YES}],
+        "GradeAnswerQuality": [{"output": {"grounded_score": "yes", "answer_score": "yes"}}],
+        "text": [
+            # The question rewriter
+            {"when": "Refine the following question", "output": f"What are the components of LLM agents {REWRITE_MARKER}?"},
+            # The answer generator
+            {"output": ANSWER}
+        ]
+    }
+
+
+AGENT_QUESTIONS = [
+    "What are the main components of an LLM powered agent?",
+    "How do agents use memory and reflection?",
+    "What is task decomposition in agent planning?",
+    "How does chain of thought prompting work?",
+    "Which jailbreak attacks work against language models?"
+]
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario for scenario in [
+        Scenario(
+            name="happy_path",
+            description="Vectorstore route, all documents relevant, answer accepted on the first try",
+            questions=AGENT_QUESTIONS,
+            responses=_responses("vectorstore", [{"output": YES}])
+        ),
+        Scenario(
+            name="rewrite_loop",
+            description="Vectorstore route, no relevant documents until the question has been rewritten once",
+            questions=AGENT_QUESTIONS,
+            responses=_responses("vectorstore", [{"when": REWRITE_MARKER, "output": YES}, {"output": NO}])
+        ),
+        Scenario(
+            name="web_route",
+            description="Web search route, answer accepted on the first try",
+            questions=["What is the weather in Paris today?", "Who won the match last night?"],
+            responses=_responses("web_search", [{"output": YES}])
+        )
+    ]
+}
@@ -0,0 +1,104 @@
+import os
+import time
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain.schema import Document
+from src.AdaptiveRag.retriever.parallel_splitter import ParallelSplitter, create_splitter
+
+
+class SplitBenchmark:
+    """Compares the throughput of the serial splitter with the process-pool splitter.
+
+    The corpus is synthetic: pages of random words from a fixed vocabulary,
+    grouped into sentences and paragraphs so the recursive splitter exercises
+    all its separators. Every parallel run is checked to produce exactly the
+    chunks of the serial run.
+    """
+
+    def __init__(self,
+                 num_documents: int = 2000,
+                 words_per_document: int = 2000,
+                 chunk_size: int = 500,
+                 chunk_overlap: int = 0,
+                 seed: int = 0):
+        """Initialize the benchmark.
+
+        Args:
+            num_documents: Number of pages in the corpus
+            words_per_document: Number of words per page
+            chunk_size: Chunk size in tokens
+            chunk_overlap: Chunk overlap in tokens
+            seed: Seed of the random generator
+        """
+        rng = random.Random(seed)
+        vocabulary = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 10))) for _ in range(5000)]
+
+        self.documents = []
+        for i in range(num_documents):
+            words = rng.choices(vocabulary, k=words_per_document)
+            sentences = [" ".join(words[j:j + 15]) + "." for j in range(0, len(words), 15)]
+            paragraphs = [" ".join(sentences[j:j + 6]) for j in range(0, len(sentences), 6)]
+            self.documents.append(Document(page_content="\n\n".join(paragraphs), metadata={"source": f"doc-{i}"}))
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def _throughput(self, seconds: float, chunks: List[Document]) -> Dict[str, Any]:
+        return {
+            "seconds": round(seconds, 4),
+            "chunks": len(chunks),
+            "documents_per_second": round(len(self.documents) / seconds, 2) if seconds else 0.0,
+            "chunks_per_second": round(len(chunks) / seconds, 2) if seconds else 0.0
+        }
+
+    def run(self, workers: Optional[Sequence[int]] = None, chunksizes: Sequence[int] = (1, 8, 32)) -> Dict[str, Any]:
+        """Run the benchmark.
+
+        Pool start-up is excluded from the measured time, so the numbers show
+        the steady-state throughput of a long-lived retriever.
+
+        Args:
+            workers: Worker process counts to compare, defaults to 2, 4 and the number of CPU cores
+            chunksizes: Documents per work unit to compare
+
+        Returns:
+            dict: Corpus size, the serial baseline and the throughput and speedup of every configuration
+        """
+        serial_splitter = create_splitter(self.chunk_size, self.chunk_overlap)
+        started = time.perf_counter()
+        serial_chunks = serial_splitter.split_documents(self.documents)
+        baseline = self._throughput(time.perf_counter() - started, serial_chunks)
+
+        results = []
+        for max_workers in workers or sorted({2, 4, os.cpu_count() or 1}):
+            for chunksize in chunksizes:
+                splitter = ParallelSplitter(
+                    chunk_size=self.chunk_size,
+                    chunk_overlap=self.chunk_overlap,
+                    max_workers=max_workers,
+                    chunksize=chunksize,
+                    min_documents=0
+                )
+                # Start the workers before timing
+                splitter.split_documents(self.documents[:max_workers * chunksize])
+
+                started = time.perf_counter()
+                chunks = splitter.split_documents(self.documents)
+                result = self._throughput(time.perf_counter() - started, chunks)
+                splitter.close()
+
+                result.update(
+                    workers=max_workers,
+                    chunksize=chunksize,
+                    speedup=round(baseline["seconds"] / result["seconds"], 2) if result["seconds"] else 0.0,
+                    identical=chunks == serial_chunks
+                )
+                results.append(result)
+
+        return {
+            "documents": len(self.documents),
+            "chunk_size": self.chunk_size,
+            "baseline": baseline,
+            "results": results
+        }
@@ -0,0 +1,3 @@
+from src.AdaptiveRag.cache.semantic_cache import SemanticCache, get_semantic_cache
+from src.AdaptiveRag.cache.llm_cache import TieredLLMCache, get_llm_cache
+from src.AdaptiveRag.cache.web_search_cache import WebSearchCache, get_web_search_cache
@@ -0,0 +1,157 @@
+import json
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+# generation_info flag set on every generation served from the cache
+CACHED_GENERATION_KEY = "cached"
+
+
+class TieredLLMCache(BaseCache):
+    """Exact-match cache for deterministic LLM calls with an in-memory LRU tier and an optional SQLite tier.
+
+    Entries are keyed by a hash of the model configuration (LangChain's
+    ``llm_string``, which includes bound tools and structured output schemas)
+    and the fully rendered prompt. Lookups try the in-memory tier first, then
+    SQLite, promoting SQLite hits into memory.
+
+    LangChain reports cached calls to callbacks like real ones, so the
+    generations of a hit are returned with ``generation_info["cached"]`` set,
+    letting the request's ``LLMCallCounter`` leave them out.
+    """
+
+    def __init__(self, max_entries: int = 4096, sqlite_path: Optional[str] = None):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            sqlite_path: Path of the SQLite database, None for a memory-only cache
+        """
+        self.max_entries = max(1, max_entries)
+        self.memory: "OrderedDict[str, RETURN_VAL_TYPE]" = OrderedDict()
+        self.memory_hits = 0
+        self.sqlite_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = None
+
+        if sqlite_path:
+            Path(sqlite_path).parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, generations TEXT NOT NULL)"
+            )
+            self._connection.commit()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _mark_cached(value: RETURN_VAL_TYPE) -> RETURN_VAL_TYPE:
+        return [
+            generation.model_copy(update={
+                "generation_info": {**(generation.generation_info or {}), CACHED_GENERATION_KEY: True}
+            })
+            for generation in value
+        ]
+
+    def _remember(self, key: str, value: RETURN_VAL_TYPE) -> None:
+        """Insert into the memory tier, evicting the least recently used entry; the caller holds the lock."""
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Look up the generations cached for a prompt and model configuration."""
+        key = self._key(prompt, llm_string)
+
+        with self._lock:
+            value = self.memory.get(key)
+            if value is not None:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._mark_cached(value)
+
+            if self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT generations FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    try:
+                        value = [loads(generation) for generation in json.loads(row[0])]
+                    except Exception:
+                        value = None
+                    if value is not None:
+                        self._remember(key, value)
+                        self.sqlite_hits += 1
+                        return self._mark_cached(value)
+
+            self.misses += 1
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Cache the generations of a prompt and model configuration."""
+        key = self._key(prompt, llm_string)
+
+        with self._lock:
+            self._remember(key, return_val)
+
+            if self._connection is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, generations) VALUES (?, ?)",
+                    (key, json.dumps([dumps(generation) for generation in return_val]))
+                )
+                self._connection.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """Drop all cached entries from both tiers."""
+        with self._lock:
+            self.memory.clear()
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM llm_cache")
+                self._connection.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Report hit and miss counters per tier."""
+        with self._lock:
+            hits = self.memory_hits + self.sqlite_hits
+            total = hits + self.misses
+            return {
+                "entries": len(self.memory),
+                "memory_hits": self.memory_hits,
+                "sqlite_hits": self.sqlite_hits,
+                "misses": self.misses,
+                "hit_rate": hits / total if total else 0.0
+            }
+
+
+_llm_caches: Dict[tuple, TieredLLMCache] = {}
+_llm_caches_lock = threading.Lock()
+
+
+def get_llm_cache(user_input: Dict[str, Any]) -> Optional[TieredLLMCache]:
+    """Get the process-wide cache for deterministic classifier calls.
+
+    Args:
+        user_input: Dictionary containing user configuration
+
+    Returns:
+        The shared TieredLLMCache, or None if LLM call caching is disabled
+    """
+    if not user_input.get("llm_cache", True):
+        return None
+
+    key = (int(user_input.get("llm_cache_max_entries", 4096)), user_input.get("llm_cache_sqlite_path"))
+
+    with _llm_caches_lock:
+        if key not in _llm_caches:
+            _llm_caches[key] = TieredLLMCache(max_entries=key[0], sqlite_path=key[1])
+        return _llm_caches[key]
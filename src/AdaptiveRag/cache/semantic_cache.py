@@ -0,0 +1,219 @@
+import logging
+import time
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from src.AdaptiveRag.retriever.embeddings import get_embeddings, embedding_model_name
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SemanticCacheEntry:
+    """A validated answer stored in the semantic cache."""
+
+    question: str
+    generation: str
+    index_version: Optional[str]
+    created_at: float
+    last_used_at: float
+
+
+class SemanticCache:
+    """Caches validated answers and serves them for semantically equivalent questions.
+
+    Questions are embedded and kept in a small in-memory vector index. A new
+    question is answered from the cache when its cosine similarity to a
+    cached question reaches the threshold, so rephrasings of a question
+    that was already answered skip the whole graph. Entries expire after a
+    TTL, the least recently used ones are evicted beyond ``max_entries``, and
+    entries built against another version of the document index are ignored.
+    """
+
+    def __init__(self,
+                 embeddings: Embeddings,
+                 threshold: float = 0.95,
+                 ttl: Optional[float] = 3600.0,
+                 max_entries: int = 1000):
+        """Initialize the semantic cache.
+
+        Args:
+            embeddings: Embedding model used to embed questions
+            threshold: Minimum cosine similarity for a cache hit
+            ttl: Lifetime of an entry in seconds, None to never expire
+            max_entries: Maximum number of cached answers
+        """
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.entries: List[SemanticCacheEntry] = []
+        self.vectors: Optional[np.ndarray] = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, question: str) -> np.ndarray:
+        """Embed a question for lookup and storage.
+
+        Args:
+            question: The user question
+
+        Returns:
+            np.ndarray: The normalized question embedding
+        """
+        return self._normalize(self.embeddings.embed_query(question))
+
+    async def aembed(self, question: str) -> np.ndarray:
+        """Asynchronously embed a question for lookup and storage."""
+        return self._normalize(await self.embeddings.aembed_query(question))
+
+    def _remove(self, positions: List[int]) -> None:
+        """Remove entries and their vectors; the caller holds the lock."""
+        if not positions:
+            return
+        keep = sorted(set(range(len(self.entries))) - set(positions))
+        self.entries = [self.entries[i] for i in keep]
+        self.vectors = self.vectors[keep] if keep else None
+
+    def _expire(self, now: float) -> None:
+        """Drop expired entries; the caller holds the lock."""
+        if self.ttl is None:
+            return
+        self._remove([i for i, entry in enumerate(self.entries) if now - entry.created_at > self.ttl])
+
+    def lookup(self,
+               question: str,
+               index_version: Optional[str] = None,
+               embedding: Optional[np.ndarray] = None) -> Optional[str]:
+        """Find a cached answer for the question or a semantically equivalent one.
+
+        Args:
+            question: The user question
+            index_version: Version of the document index the answer must have been built against
+            embedding: Precomputed question embedding from ``embed``
+
+        Returns:
+            The cached generation, or None on a cache miss
+        """
+        embedding = self.embed(question) if embedding is None else embedding
+
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+
+            if self.vectors is not None:
+                similarities = self.vectors @ embedding
+                for position in np.argsort(-similarities):
+                    if similarities[position] < self.threshold:
+                        break
+                    entry = self.entries[position]
+                    if entry.index_version == index_version:
+                        entry.last_used_at = now
+                        self.hits += 1
+                        logger.info(f"---SEMANTIC CACHE HIT (SIMILARITY {similarities[position]:.3f})---")
+                        return entry.generation
+
+            self.misses += 1
+            return None
+
+    def store(self,
+              question: str,
+              generation: str,
+              index_version: Optional[str] = None,
+              embedding: Optional[np.ndarray] = None) -> None:
+        """Cache a validated answer.
+
+        Args:
+            question: The user question
+            generation: The validated answer produced by the graph
+            index_version: Version of the document index the answer was built against
+            embedding: Precomputed question embedding from ``embed``
+        """
+        embedding = self.embed(question) if embedding is None else embedding
+
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+
+            if len(self.entries) >= self.max_entries:
+                by_last_use = sorted(range(len(self.entries)), key=lambda i: self.entries[i].last_used_at)
+                self._remove(by_last_use[:len(self.entries) - self.max_entries + 1])
+
+            self.entries.append(SemanticCacheEntry(
+                question=question,
+                generation=generation,
+                index_version=index_version,
+                created_at=now,
+                last_used_at=now
+            ))
+            row = embedding.reshape(1, -1)
+            self.vectors = row if self.vectors is None else np.vstack([self.vectors, row])
+
+    def invalidate(self, index_version: Optional[str] = None) -> None:
+        """Drop cached answers.
+
+        Args:
+            index_version: Keep only entries built against this index version, drop all if None
+        """
+        with self._lock:
+            if index_version is None:
+                self.entries = []
+                self.vectors = None
+            else:
+                self._remove([i for i, entry in enumerate(self.entries) if entry.index_version != index_version])
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the size and hit rate of the cache."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+
+_semantic_caches: Dict[tuple, SemanticCache] = {}
+_semantic_caches_lock = threading.Lock()
+
+
+def get_semantic_cache(user_input: Dict[str, Any]) -> Optional[SemanticCache]:
+    """Get the process-wide semantic cache for the configuration.
+
+    Args:
+        user_input: Dictionary containing user configuration
+
+    Returns:
+        The shared SemanticCache, or None if semantic caching is disabled
+    """
+    if not user_input.get("semantic_cache", True):
+        return None
+
+    embeddings = get_embeddings(user_input)
+    key = (
+        embedding_model_name(embeddings),
+        float(user_input.get("semantic_cache_threshold", 0.95)),
+        user_input.get("semantic_cache_ttl", 3600.0),
+        int(user_input.get("semantic_cache_max_entries", 1000))
+    )
+
+    with _semantic_caches_lock:
+        if key not in _semantic_caches:
+            _semantic_caches[key] = SemanticCache(
+                embeddings=embeddings,
+                threshold=key[1],
+                ttl=key[2],
+                max_entries=key[3]
+            )
+        return _semantic_caches[key]
@@ -0,0 +1,182 @@
+import re
+import json
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class WebSearchCache:
+    """TTL cache for web search results with single-flight request coalescing.
+
+    Results are keyed by the normalized query (case-folded, whitespace
+    collapsed, trailing punctuation dropped) and the search parameters.
+    Entries expire after a TTL and the least recently used ones are evicted
+    beyond ``max_entries``. Concurrent identical searches, from any thread or
+    event loop, wait for the one request already in flight instead of
+    making their own; failed searches are not cached.
+    """
+
+    def __init__(self, ttl: Optional[float] = 900.0, max_entries: int = 256):
+        """Initialize the cache.
+
+        Args:
+            ttl: Lifetime of an entry in seconds, None to never expire
+            max_entries: Maximum number of cached searches
+        """
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.entries: "OrderedDict[str, Tuple[float, List[Any]]]" = OrderedDict()
+        self.in_flight: Dict[str, Future] = {}
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize a query so trivially different spellings share a cache entry."""
+        return re.sub(r"\s+", " ", query).strip().rstrip("?!.").strip().casefold()
+
+    def _key(self, query: str, params: Optional[Dict[str, Any]]) -> str:
+        return json.dumps([self.normalize_query(query), params or {}], sort_keys=True, default=str)
+
+    def _claim(self, key: str) -> Tuple[Optional[List[Any]], Future, bool]:
+        """Return a fresh cached result, or the in-flight future and whether the caller must run the search."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                created_at, results = entry
+                if self.ttl is None or time.time() - created_at < self.ttl:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return list(results), None, False
+                del self.entries[key]
+
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return None, future, False
+
+            future = Future()
+            self.in_flight[key] = future
+            self.misses += 1
+            return None, future, True
+
+    def _resolve(self, key: str, future: Future, results: Optional[List[Any]], error: Optional[BaseException]) -> None:
+        """Store a finished search and release the callers waiting for it."""
+        with self._lock:
+            self.in_flight.pop(key, None)
+            # Tools may report failures as a string instead of raising; only result lists are cached
+            if error is None and isinstance(results, list):
+                self.entries[key] = (time.time(), list(results))
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+
+        if error is None:
+            future.set_result(results)
+        else:
+            future.set_exception(error)
+
+    def search(self,
+               query: str,
+               search: Callable[[], List[Any]],
+               params: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Return the cached results for the query, running the search on a miss.
+
+        Args:
+            query: The search query
+            search: Callable running the actual search
+            params: Search parameters that are part of the cache key
+
+        Returns:
+            List: The search results
+        """
+        key = self._key(query, params)
+        results, future, leader = self._claim(key)
+        if future is None:
+            return results
+        if not leader:
+            return future.result()
+
+        try:
+            results = search()
+        except BaseException as e:
+            self._resolve(key, future, None, e)
+            raise
+        self._resolve(key, future, results, None)
+        return results
+
+    async def asearch(self,
+                      query: str,
+                      search: Callable[[], Awaitable[List[Any]]],
+                      params: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Asynchronously return the cached results for the query, running the search on a miss.
+
+        Args:
+            query: The search query
+            search: Coroutine function running the actual search
+            params: Search parameters that are part of the cache key
+
+        Returns:
+            List: The search results
+        """
+        key = self._key(query, params)
+        results, future, leader = self._claim(key)
+        if future is None:
+            return results
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            results = await search()
+        except BaseException as e:
+            self._resolve(key, future, None, e)
+            raise
+        self._resolve(key, future, results, None)
+        return results
+
+    def clear(self) -> None:
+        """Drop all cached searches; searches in flight are not affected."""
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Report hit, coalesced and miss counters."""
+        with self._lock:
+            total = self.hits + self.coalesced + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "coalesced": self.coalesced,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.coalesced) / total if total else 0.0
+            }
+
+
+_web_search_caches: Dict[tuple, WebSearchCache] = {}
+_web_search_caches_lock = threading.Lock()
+
+
+def get_web_search_cache(user_input: Dict[str, Any]) -> Optional[WebSearchCache]:
+    """Get the process-wide web search cache.
+
+    Args:
+        user_input: Dictionary containing user configuration
+
+    Returns:
+        The shared WebSearchCache, or None if web search caching is disabled
+    """
+    if not user_input.get("web_search_cache", True):
+        return None
+
+    ttl = user_input.get("web_search_cache_ttl", 900)
+    key = (float(ttl) if ttl else None, int(user_input.get("web_search_cache_max_entries", 256)))
+
+    with _web_search_caches_lock:
+        if key not in _web_search_caches:
+            _web_search_caches[key] = WebSearchCache(ttl=key[0], max_entries=key[1])
+        return _web_search_caches[key]
@@ -0,0 +1 @@
+from src.AdaptiveRag.context.packer import ContextPacker, get_context_packer
@@ -0,0 +1,154 @@
+import logging
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import tiktoken
+from langchain.schema import Document
+from src.AdaptiveRag.llm.llm import LLM_PROVIDERS
+from src.AdaptiveRag.retriever import RELEVANCE_SCORE_KEY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "cl100k_base"
+WORD = re.compile(r"\w+")
+
+
+class ContextPacker:
+    """Packs documents into a prompt context that fits a token budget.
+
+    Passages are ordered by their similarity score when every passage has
+    one; otherwise, e.g. for hybrid results fused by rank or web search
+    results, the retriever's order is kept. Passages mostly contained in an
+    already packed one are dropped, and passages are added in order while
+    they fit the budget, skipping those that don't in favor of smaller ones
+    further down. The best-ranked skipped passage is then truncated at a
+    token boundary into the room left, if enough is left for it to be useful.
+    """
+
+    SEPARATOR = "\n\n"
+
+    def __init__(self,
+                 token_budget: Optional[int] = 3000,
+                 model: Optional[str] = None,
+                 dedup_threshold: float = 0.8,
+                 shingle_size: int = 5,
+                 min_truncated_tokens: int = 64):
+        """Initialize the context packer.
+
+        Args:
+            token_budget: Maximum number of context tokens, None for no limit
+            model: Name of the model the context is sent to, selects the tokenizer
+            dedup_threshold: Fraction of a passage's word shingles already packed above which it is dropped
+            shingle_size: Number of words per shingle
+            min_truncated_tokens: Smallest truncated passage worth adding at the end of the budget
+        """
+        self.token_budget = token_budget
+        self.dedup_threshold = dedup_threshold
+        self.shingle_size = max(1, shingle_size)
+        self.min_truncated_tokens = min_truncated_tokens
+        self.encoding = self._encoding(model)
+
+    @staticmethod
+    def _encoding(model: Optional[str]) -> tiktoken.Encoding:
+        # Models tiktoken doesn't know (e.g. Llama or Claude) are counted with the closest generic encoding
+        try:
+            return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(DEFAULT_ENCODING)
+        except KeyError:
+            return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens of a text with the model's tokenizer."""
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def _shingles(self, text: str) -> Set[Tuple[str, ...]]:
+        words = WORD.findall(text.lower())
+        if len(words) <= self.shingle_size:
+            return {tuple(words)} if words else set()
+        return {tuple(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    @staticmethod
+    def _order(documents: List[Document]) -> List[Document]:
+        """Order documents by decreasing similarity score, or keep the retriever's order if any is unscored.
+
+        A partial set of scores can't be compared with the ranking the
+        retriever made, such as the reciprocal rank fusion of hybrid search.
+        """
+        if any(doc.metadata.get(RELEVANCE_SCORE_KEY) is None for doc in documents):
+            return list(documents)
+        return sorted(documents, key=lambda doc: doc.metadata[RELEVANCE_SCORE_KEY], reverse=True)
+
+    def select(self, documents: List[Document]) -> List[str]:
+        """Select the passages of the packed context.
+
+        Args:
+            documents: The documents to pack
+
+        Returns:
+            List[str]: The passages in packing order, the last one possibly truncated
+        """
+        passages = []
+        packed_shingles: Set[Tuple[str, ...]] = set()
+        separator_tokens = self.count_tokens(self.SEPARATOR)
+        remaining = self.token_budget
+        # Tokens of the best-ranked passage that didn't fit, truncated into the room left at the end
+        overflow: Optional[List[int]] = None
+
+        for doc in self._order(documents):
+            text = doc.page_content.strip()
+            shingles = self._shingles(text)
+            if not shingles:
+                continue
+            if len(shingles & packed_shingles) >= self.dedup_threshold * len(shingles):
+                logger.info("---CONTEXT: DROPPED OVERLAPPING PASSAGE---")
+                continue
+
+            if remaining is not None:
+                tokens = self.encoding.encode(text, disallowed_special=())
+                cost = len(tokens) + (separator_tokens if passages else 0)
+                if cost > remaining:
+                    logger.info("---CONTEXT: PASSAGE EXCEEDS THE REMAINING TOKEN BUDGET, TRYING SMALLER ONES---")
+                    if overflow is None:
+                        overflow = tokens
+                    continue
+                remaining -= cost
+
+            passages.append(text)
+            packed_shingles |= shingles
+
+        if overflow is not None:
+            room = remaining - (separator_tokens if passages else 0)
+            if room >= self.min_truncated_tokens or not passages:
+                logger.info("---CONTEXT: TOKEN BUDGET REACHED, TRUNCATING PASSAGE---")
+                passages.append(self.encoding.decode(overflow[:max(room, 0)]))
+
+        return passages
+
+    def pack(self, documents: List[Document]) -> str:
+        """Pack documents into a single context string within the token budget.
+
+        Args:
+            documents: The documents to pack
+
+        Returns:
+            str: The selected passages separated by double newlines
+        """
+        return self.SEPARATOR.join(self.select(documents))
+
+
+def get_context_packer(user_input: Dict[str, Any]) -> ContextPacker:
+    """Create the context packer for the configured model.
+
+    Args:
+        user_input: Dictionary containing user configuration
+
+    Returns:
+        ContextPacker: Packer using the selected model's tokenizer and the configured budget
+    """
+    llm_class = LLM_PROVIDERS.get(user_input.get("selected_llm"))
+    token_budget = user_input.get("context_token_budget", 3000)
+
+    return ContextPacker(
+        token_budget=int(token_budget) if token_budget else None,
+        model=user_input.get(llm_class.MODEL_KEY) if llm_class else None,
+        dedup_threshold=float(user_input.get("context_dedup_threshold", 0.8))
+    )
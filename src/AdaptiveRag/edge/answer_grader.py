@@ -19,7 +19,7 @@ class AnswerGrader:
         Args:
             user_input: Dictionary containing user configuration
         """
-        self.llm = get_llm(user_input)
+        self.llm = get_llm(user_input=user_input, use_cache=True)
         self.structured_answer_grader = self.llm.with_structured_output(GradeAnswer)
         self.answer_grader = None
         self._setup_answer_grader()
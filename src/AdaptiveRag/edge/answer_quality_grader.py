@@ -0,0 +1,62 @@
+from typing import Dict, Any
+from pydantic import BaseModel, Field
+from langchain_core.prompts import ChatPromptTemplate
+from src.AdaptiveRag.llm import get_llm
+
+class GradeAnswerQuality(BaseModel):
+    """Model for assessing both the factual grounding and the usefulness of an LLM-generated response."""
+
+    grounded_score: str = Field(
+        description="Response factual accuracy: 'yes' (grounded in facts) or 'no' (contains hallucinations)."
+    )
+    answer_score: str = Field(
+        description="Answer quality: 'yes' (resolves the question) or 'no' (inadequate response)."
+    )
+
+class AnswerQualityGrader:
+    """Evaluates in a single call whether a response is grounded in the documents and addresses the question."""
+
+    def __init__(self, user_input: Dict[str, str]):
+        """Initialize the combined grader with user input configuration.
+
+        Args:
+            user_input: Dictionary containing user configuration
+        """
+        self.llm = get_llm(user_input=user_input, use_cache=True)
+        self.structured_llm_grader = self.llm.with_structured_output(GradeAnswerQuality)
+        self.answer_quality_grader = None
+        self._setup_answer_quality_grader()
+
+    def _setup_answer_quality_grader(self):
+        """Create and configure the combined grading prompt template."""
+        system = """You are an expert grader assessing an LLM-generated response on two independent criteria.
+
+        1. Factual grounding (grounded_score):
+        - "yes" → The response is fully supported by the provided set of retrieved facts.
+        - "no" → The response contains information that is not explicitly supported or contradicts the facts.
+
+        2. Answer quality (answer_score):
+        - "yes" → The response fully resolves the user's question.
+        - "no" → The response is incomplete, off-topic, or does not sufficiently resolve the question.
+
+        Grade each criterion on its own; a response can be grounded but unhelpful, or helpful but ungrounded.
+        """
+
+        answer_quality_prompt = ChatPromptTemplate.from_messages([
+            ("system", system),
+            ("human", "Evaluate the following response: \n\n"
+                    "Set of Facts: \n{documents}\n\n"
+                    "User Question: {question}\n\n"
+                    "LLM-Generated Response: {generation}\n\n"
+                    "Provide both binary scores ('yes' or 'no')."),
+        ])
+
+        self.answer_quality_grader = answer_quality_prompt | self.structured_llm_grader
+
+    def get_answer_quality_grader(self):
+        """Return the configured combined grader.
+
+        Returns:
+            The configured answer quality grader pipeline
+        """
+        return self.answer_quality_grader
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingRouter:
+    """Routes questions locally by comparing their embedding against topic centroids.
+
+    The vectorstore side is represented by the embedded ``VECTORSTORE_TOPICS``
+    and by k-means centroids of the indexed chunk vectors, the web search side
+    by a handful of prototypical real-time topics. A question is routed
+    without an LLM call when the best vectorstore similarity beats the best
+    web search similarity (or the other way round) by at least the margin;
+    questions inside the ambiguous band are left to the LLM router.
+    """
+
+    WEB_SEARCH_TOPICS = [
+        "Latest news and current events",
+        "Today's weather forecast",
+        "Sports scores and match results",
+        "Stock prices and market updates",
+        "Recent product releases and announcements",
+        "People, places and general knowledge"
+    ]
+
+    def __init__(self,
+                 embeddings: Embeddings,
+                 vectorstore_topics: List[str],
+                 retriever=None,
+                 margin: float = 0.05,
+                 corpus_centroids: int = 8,
+                 corpus_sample_size: int = 4096):
+        """Initialize the router and embed the topic descriptions.
+
+        Args:
+            embeddings: Embedding model, the same one the index was built with
+            vectorstore_topics: Topics covered by the vectorstore
+            retriever: Retriever whose indexed chunks add corpus centroids, optional
+            margin: Minimum similarity difference for a local routing decision
+            corpus_centroids: Number of k-means centroids computed from the corpus
+            corpus_sample_size: Maximum number of chunk vectors clustered
+        """
+        self.embeddings = embeddings
+        self.retriever = retriever
+        self.margin = margin
+        self.corpus_centroids = corpus_centroids
+        self.corpus_sample_size = corpus_sample_size
+        self.topic_centroids = self._normalize(embeddings.embed_documents(vectorstore_topics))
+        self.web_centroids = self._normalize(embeddings.embed_documents(self.WEB_SEARCH_TOPICS))
+        self.vectorstore_centroids = self.topic_centroids
+        self.index_version = None
+        self.local_routes = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _kmeans(self, vectors: np.ndarray) -> np.ndarray:
+        """Cluster the chunk vectors into at most ``corpus_centroids`` centroids."""
+        k = min(self.corpus_centroids, len(vectors))
+        if k <= 1:
+            return self._normalize(vectors.mean(axis=0))
+
+        import faiss
+        kmeans = faiss.Kmeans(vectors.shape[1], k, niter=20, seed=1234, spherical=True)
+        kmeans.train(vectors)
+        return self._normalize(kmeans.centroids)
+
+    def _refresh_corpus_centroids(self) -> None:
+        """Recompute the corpus centroids whenever the indexed documents changed."""
+        if self.retriever is None or self.corpus_centroids <= 0:
+            return
+
+        index_version = self.retriever.index_version
+        if index_version == self.index_version:
+            return
+
+        with self._lock:
+            if index_version == self.index_version:
+                return
+
+            vectors = self.retriever.corpus_vectors(max_vectors=self.corpus_sample_size)
+            if vectors is not None and len(vectors):
+                logger.info("---COMPUTING CORPUS CENTROIDS FOR QUERY ROUTING---")
+                self.vectorstore_centroids = np.vstack([
+                    self.topic_centroids, self._kmeans(self._normalize(vectors))
+                ])
+            else:
+                self.vectorstore_centroids = self.topic_centroids
+            self.index_version = index_version
+
+    def scores(self, embedding: List[float]) -> Tuple[float, float]:
+        """Best cosine similarity of the question to each side.
+
+        Args:
+            embedding: The question embedding
+
+        Returns:
+            The best vectorstore similarity and the best web search similarity
+        """
+        self._refresh_corpus_centroids()
+        query = self._normalize(embedding)[0]
+        return float((self.vectorstore_centroids @ query).max()), float((self.web_centroids @ query).max())
+
+    def _decide(self, embedding: List[float]) -> Optional[str]:
+        vectorstore_score, web_score = self.scores(embedding)
+        logger.info(f"---EMBEDDING ROUTER SCORES: VECTORSTORE {vectorstore_score:.3f}, WEB SEARCH {web_score:.3f}---")
+
+        if vectorstore_score - web_score >= self.margin:
+            decision = "vectorstore"
+        elif web_score - vectorstore_score >= self.margin:
+            decision = "web_search"
+        else:
+            decision = None
+
+        if decision is None:
+            self.fallbacks += 1
+        else:
+            self.local_routes += 1
+        return decision
+
+    def route(self, question: str) -> Optional[str]:
+        """Route the question locally.
+
+        Args:
+            question: The user question
+
+        Returns:
+            str: "vectorstore" or "web_search", or None if the question is ambiguous
+        """
+        return self._decide(self.embeddings.embed_query(question))
+
+    async def aroute(self, question: str) -> Optional[str]:
+        """Asynchronously route the question locally.
+
+        Recomputing the corpus centroids reads vectors back from the index and
+        runs k-means, so it is done in a worker thread to keep the event loop free.
+
+        Args:
+            question: The user question
+
+        Returns:
+            str: "vectorstore" or "web_search", or None if the question is ambiguous
+        """
+        embedding = await self.embeddings.aembed_query(question)
+        await asyncio.to_thread(self._refresh_corpus_centroids)
+        return self._decide(embedding)
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many questions were routed locally and how many fell back to the LLM."""
+        return {"local_routes": self.local_routes, "fallbacks": self.fallbacks}
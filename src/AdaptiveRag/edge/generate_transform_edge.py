@@ -1,29 +1,50 @@
-from typing import Literal
-from src.AdaptiveRag.state import AdaptiveRAGState
+import logging
+from typing import Dict, Literal, Optional
+from langchain_core.runnables import RunnableConfig
+from src.AdaptiveRag.state import AdaptiveRAGState, RequestBudget
+
+logger = logging.getLogger(__name__)
 
 class GenerateOrRewriterEdge:
     """Decision node that determines whether to generate an answer or rewrite the question."""
+
+    def __init__(self, user_input: Optional[Dict[str, str]] = None):
+        """Initialize the edge with the request budget limits.
+
+        Args:
+            user_input: Dictionary containing user configuration
+        """
+        self.budget = RequestBudget(user_input or {})
     
-    def generate_or_rewriter_node(self, state: AdaptiveRAGState) -> Literal["question_rewriter_node", "answer_generator_node"]:
+    def generate_or_rewriter_node(self,
+                                  state: AdaptiveRAGState,
+                                  config: Optional[RunnableConfig] = None
+                                  ) -> Literal["question_rewriter_node", "answer_generator_node", "rewrite_budget_exhausted"]:
         """Determine the next step based on document relevance assessment.
         
         If there are relevant documents, proceed to answer generation.
-        If no relevant documents, route to question rewriting to improve retrieval.
+        If no relevant documents, route to question rewriting to improve retrieval,
+        unless the request's rewrite, LLM call or time budget is used up.
         
         Args:
             state: Dictionary containing the current state with filtered documents
+            config: Run config of the request, carrying its LLM call counter
             
         Returns:
             str: The name of the next node to route to in the pipeline
         """
-        print("---ASSESS DOCUMENT RELEVANCE FOR ROUTING DECISION---")
+        logger.info("---ASSESS DOCUMENT RELEVANCE FOR ROUTING DECISION---")
 
         filtered_documents = state.get("documents", [])
         
         if not filtered_documents:
-            print("---DECISION: NO RELEVANT DOCUMENTS FOUND, REWRITING QUERY---")
+            if self.budget.exhausted(state, config, next_step="rewrite"):
+                logger.info("---DECISION: NO RELEVANT DOCUMENTS FOUND AND BUDGET EXHAUSTED, STOPPING---")
+                return "rewrite_budget_exhausted"
+
+            logger.info("---DECISION: NO RELEVANT DOCUMENTS FOUND, REWRITING QUERY---")
             return "question_rewriter_node"
         
         doc_count = len(filtered_documents)
-        print(f"---DECISION: {doc_count} RELEVANT DOCUMENTS FOUND, GENERATING ANSWER---")
+        logger.info(f"---DECISION: {doc_count} RELEVANT DOCUMENTS FOUND, GENERATING ANSWER---")
         return "answer_generator_node"
\ No newline at end of file
@@ -1,74 +1,206 @@
-from typing import List, Dict, Any, Literal
+import logging
+from typing import List, Dict, Any, Literal, Optional
 from langchain.schema import Document
-from src.AdaptiveRag.state import AdaptiveRAGState
+from langchain_core.runnables import RunnableConfig, RunnableParallel
+from src.AdaptiveRag.state import AdaptiveRAGState, RequestBudget
 from src.AdaptiveRag.edge.hallucination_grader import HallucinationGrader
 from src.AdaptiveRag.edge.answer_grader import AnswerGrader
+from src.AdaptiveRag.edge.answer_quality_grader import AnswerQualityGrader
+from src.AdaptiveRag.context import get_context_packer
+
+logger = logging.getLogger(__name__)
 
 class HallucinationAnswerEdge:
     """Evaluates generated answers for hallucinations and relevance to the question."""
-    
+
+    # Grading modes: graders one after the other, both at once, or one combined grader
+    SEQUENTIAL = "sequential"
+    SPECULATIVE = "speculative"
+    COMBINED = "combined"
+
     def __init__(self, user_input: Dict[str, str]):
         """Initialize the edge evaluator with graders.
-        
+
         Args:
             user_input: Dictionary containing user configuration
         """
-        self.hallucination_grader = HallucinationGrader(user_input).get_hallucination_grader()
-        self.answer_grader = AnswerGrader(user_input).get_answer_grader()
-    
+        self.grading_mode = user_input.get("answer_grading_mode", self.SEQUENTIAL)
+        self.budget = RequestBudget(user_input)
+        self.context_packer = get_context_packer(user_input)
+        self.hallucination_grader = None
+        self.answer_grader = None
+        self.answer_quality_grader = None
+
+        if self.grading_mode == self.COMBINED:
+            self.answer_quality_grader = AnswerQualityGrader(user_input).get_answer_quality_grader()
+        else:
+            self.hallucination_grader = HallucinationGrader(user_input).get_hallucination_grader()
+            self.answer_grader = AnswerGrader(user_input).get_answer_grader()
+
+        # Runs both graders at the same time; the route is decided once both have returned
+        self.speculative_grader = RunnableParallel(
+            hallucination=self.hallucination_grader,
+            answer=self.answer_grader
+        ) if self.grading_mode == self.SPECULATIVE else None
+
     def _format_docs(self, documents: List[Document]) -> str:
-        """Format a list of documents into a single string.
-        
+        """Pack a list of documents into a single context string, as the answer generator does.
+
         Args:
             documents: List of Document objects to format
-            
+
+        Returns:
+            str: The packed document contents separated by double newlines
+        """
+        return self.context_packer.pack(documents)
+
+    def _route(self,
+               grounded: str,
+               answers_question: str,
+               state: AdaptiveRAGState,
+               config: Optional[RunnableConfig] = None
+               ) -> Literal["useful", "not useful", "not supported", "regeneration_budget_exhausted", "rewrite_budget_exhausted"]:
+        """Map the two grader verdicts to a routing decision.
+
+        A regeneration or rewrite is only allowed while the request's budget lasts.
+
+        Args:
+            grounded: Hallucination grader verdict ('yes' if grounded in the documents)
+            answers_question: Answer grader verdict ('yes' if the question is addressed)
+            state: Current pipeline state
+            config: Run config of the request, carrying its LLM call counter
+
         Returns:
-            str: Concatenated document contents separated by double newlines
+            str: Routing decision - "useful", "not useful", "not supported",
+            "regeneration_budget_exhausted" or "rewrite_budget_exhausted"
+        """
+        # If the answer contains hallucinations, route for regeneration
+        if grounded != "yes":
+            if self.budget.exhausted(state, config, next_step="regenerate"):
+                logger.info("---DECISION: ANSWER CONTAINS UNSUPPORTED INFORMATION, BUDGET EXHAUSTED---")
+                return "regeneration_budget_exhausted"
+            logger.info("---DECISION: ANSWER CONTAINS UNSUPPORTED INFORMATION---")
+            return "not supported"
+
+        # Determine final routing based on whether answer addresses question
+        if answers_question == "yes":
+            logger.info("---DECISION: ANSWER IS FACTUAL AND ADDRESSES THE QUESTION---")
+            return "useful"
+        elif self.budget.exhausted(state, config, next_step="rewrite"):
+            logger.info("---DECISION: ANSWER IS FACTUAL BUT DOES NOT ADDRESS THE QUESTION, BUDGET EXHAUSTED---")
+            return "rewrite_budget_exhausted"
+        else:
+            logger.info("---DECISION: ANSWER IS FACTUAL BUT DOES NOT ADDRESS THE QUESTION---")
+            return "not useful"
+
+    def _grader_input(self, state: AdaptiveRAGState) -> Dict[str, Any]:
+        """Collect the inputs shared by all graders from the pipeline state.
+
+        The answer is graded against the packed context it was generated from,
+        which the answer generator keeps in the state.
         """
-        return "\n\n".join(document.page_content for document in documents)
+        context = state.get("context")
+        return {
+            "documents": context if context is not None else self._format_docs(state["documents"]),
+            "question": state["question"],
+            "generation": state["generation"]
+        }
 
-    def hallucination_answer_edge(self, state: AdaptiveRAGState) -> Literal["useful", "not useful", "not supported"]:
+    def hallucination_answer_edge(self,
+                                  state: AdaptiveRAGState,
+                                  config: Optional[RunnableConfig] = None
+                                  ) -> Literal["useful", "not useful", "not supported", "regeneration_budget_exhausted", "rewrite_budget_exhausted"]:
         """Evaluate answer quality and determine the next routing step.
-        
+
         Performs two evaluations:
         1. Whether the generation is factually grounded in the documents
         2. If factual, whether it adequately addresses the question
-        
+
+        In speculative mode both graders run at the same time, and in combined
+        mode a single grader returns both verdicts in one call.
+
         Args:
             state: Current pipeline state with question, documents, and generation
-            
+            config: Run config of the request, carrying its LLM call counter
+
         Returns:
-            str: Routing decision - "useful", "not useful", or "not supported"
+            str: Routing decision - "useful", "not useful", "not supported",
+            "regeneration_budget_exhausted" or "rewrite_budget_exhausted"
         """
-        print("---EVALUATING ANSWER FOR HALLUCINATIONS AND RELEVANCE---")
-        
-        question = state["question"]
-        documents = state["documents"]
-        generation = state["generation"]
+        logger.info("---EVALUATING ANSWER FOR HALLUCINATIONS AND RELEVANCE---")
+
+        grader_input = self._grader_input(state)
+
+        if self.grading_mode == self.COMBINED:
+            logger.info("---CHECKING GROUNDING AND ANSWER QUALITY IN ONE CALL---")
+            score = self.answer_quality_grader.invoke(grader_input, config)
+            return self._route(score.grounded_score, score.answer_score, state, config)
+
+        if self.grading_mode == self.SPECULATIVE:
+            logger.info("---CHECKING GROUNDING AND ANSWER QUALITY IN PARALLEL---")
+            scores = self.speculative_grader.invoke(grader_input, config)
+            return self._route(scores["hallucination"].binary_score, scores["answer"].binary_score, state, config)
 
         # Step 1: Check for hallucinations
-        print("---CHECKING IF ANSWER IS FACTUALLY GROUNDED---")
+        logger.info("---CHECKING IF ANSWER IS FACTUALLY GROUNDED---")
         hallucination_score = self.hallucination_grader.invoke({
-            "documents": self._format_docs(documents), 
-            "generation": generation
-        })
-        
-        # If the answer contains hallucinations, route for regeneration
+            "documents": grader_input["documents"],
+            "generation": grader_input["generation"]
+        }, config)
+
         if hallucination_score.binary_score != "yes":
-            print("---DECISION: ANSWER CONTAINS UNSUPPORTED INFORMATION---")
-            return "not supported"
-        
+            return self._route(hallucination_score.binary_score, "no", state, config)
+
         # Step 2: Check if the answer addresses the question
-        print("---ANSWER IS FACTUAL, CHECKING IF IT ADDRESSES THE QUESTION---")
+        logger.info("---ANSWER IS FACTUAL, CHECKING IF IT ADDRESSES THE QUESTION---")
         answer_score = self.answer_grader.invoke({
-            "question": question, 
-            "generation": generation
-        })
-        
-        # Determine final routing based on whether answer addresses question
-        if answer_score.binary_score == "yes":
-            print("---DECISION: ANSWER IS FACTUAL AND ADDRESSES THE QUESTION---")
-            return "useful"
-        else:
-            print("---DECISION: ANSWER IS FACTUAL BUT DOES NOT ADDRESS THE QUESTION---")
-            return "not useful"
\ No newline at end of file
+            "question": grader_input["question"],
+            "generation": grader_input["generation"]
+        }, config)
+
+        return self._route(hallucination_score.binary_score, answer_score.binary_score, state, config)
+
+    async def ahallucination_answer_edge(self,
+                                         state: AdaptiveRAGState,
+                                         config: Optional[RunnableConfig] = None
+                                         ) -> Literal["useful", "not useful", "not supported", "regeneration_budget_exhausted", "rewrite_budget_exhausted"]:
+        """Asynchronously evaluate answer quality and determine the next routing step.
+
+        Args:
+            state: Current pipeline state with question, documents, and generation
+            config: Run config of the request, carrying its LLM call counter
+
+        Returns:
+            str: Routing decision - "useful", "not useful", "not supported",
+            "regeneration_budget_exhausted" or "rewrite_budget_exhausted"
+        """
+        logger.info("---EVALUATING ANSWER FOR HALLUCINATIONS AND RELEVANCE---")
+
+        grader_input = self._grader_input(state)
+
+        if self.grading_mode == self.COMBINED:
+            logger.info("---CHECKING GROUNDING AND ANSWER QUALITY IN ONE CALL---")
+            score = await self.answer_quality_grader.ainvoke(grader_input, config)
+            return self._route(score.grounded_score, score.answer_score, state, config)
+
+        if self.grading_mode == self.SPECULATIVE:
+            logger.info("---CHECKING GROUNDING AND ANSWER QUALITY IN PARALLEL---")
+            scores = await self.speculative_grader.ainvoke(grader_input, config)
+            return self._route(scores["hallucination"].binary_score, scores["answer"].binary_score, state, config)
+
+        logger.info("---CHECKING IF ANSWER IS FACTUALLY GROUNDED---")
+        hallucination_score = await self.hallucination_grader.ainvoke({
+            "documents": grader_input["documents"],
+            "generation": grader_input["generation"]
+        }, config)
+
+        if hallucination_score.binary_score != "yes":
+            return self._route(hallucination_score.binary_score, "no", state, config)
+
+        logger.info("---ANSWER IS FACTUAL, CHECKING IF IT ADDRESSES THE QUESTION---")
+        answer_score = await self.answer_grader.ainvoke({
+            "question": grader_input["question"],
+            "generation": grader_input["generation"]
+        }, config)
+
+        return self._route(hallucination_score.binary_score, answer_score.binary_score, state, config)
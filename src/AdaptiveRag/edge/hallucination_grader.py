@@ -23,7 +23,7 @@ class HallucinationGrader:
         Args:
             user_input: Dictionary containing user configuration
         """
-        self.llm = get_llm(user_input)
+        self.llm = get_llm(user_input=user_input, use_cache=True)
         self.structured_llm_grader = self.llm.with_structured_output(GradeHallucinations)
         self.hallucination_grader = None
         self._setup_hallucination_grader()
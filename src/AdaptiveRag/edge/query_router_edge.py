@@ -1,7 +1,13 @@
+import logging
 from pydantic import BaseModel, Field
-from typing import Literal, Dict
+from typing import Literal, Dict, Optional
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
 from src.AdaptiveRag.llm import get_llm
+from src.AdaptiveRag.retriever.embeddings import get_embeddings
+from src.AdaptiveRag.edge.embedding_router import EmbeddingRouter
+
+logger = logging.getLogger(__name__)
 
 class QueryRouter(BaseModel):
     """Model for routing a user query to the most relevant data source."""
@@ -11,21 +17,42 @@ class QueryRouter(BaseModel):
     )
 
 class QueryRouterEdge:
-    """Routes user queries to either vectorstore or web search based on the query content."""
+    """Routes user queries to either vectorstore or web search based on the query content.
+
+    The default "llm" mode always asks the LLM. In the opt-in "embedding"
+    mode, questions are first routed locally by an EmbeddingRouter and only
+    ambiguous ones are sent to the LLM router.
+    """
     
     # Topics available in the vectorstore
     VECTORSTORE_TOPICS = ["Agents", "Prompt Engineering", "Adversarial Attacks"]
+
+    # Routing modes
+    EMBEDDING = "embedding"
+    LLM = "llm"
     
-    def __init__(self, user_input: Dict[str, str]):
+    def __init__(self, user_input: Dict[str, str], retriever=None):
         """Initialize the router with user input configuration.
         
         Args:
             user_input: Dictionary containing user configuration
+            retriever: Retriever whose indexed corpus informs the embedding router, optional
         """
-        self.llm = get_llm(user_input=user_input)
+        self.llm = get_llm(user_input=user_input, use_cache=True)
         self.structured_llm_router = self.llm.with_structured_output(QueryRouter)
         self.query_router = None
         self._setup_router()
+
+        self.routing_mode = user_input.get("query_routing_mode", self.LLM)
+        self.embedding_router: Optional[EmbeddingRouter] = None
+        if self.routing_mode == self.EMBEDDING:
+            self.embedding_router = EmbeddingRouter(
+                embeddings=retriever.embeddings if retriever is not None else get_embeddings(user_input),
+                vectorstore_topics=self.VECTORSTORE_TOPICS,
+                retriever=retriever,
+                margin=float(user_input.get("router_margin", 0.05)),
+                corpus_centroids=int(user_input.get("router_corpus_centroids", 8))
+            )
     
     def _setup_router(self):
         """Set up the query router with system prompt and template."""
@@ -44,23 +71,64 @@ class QueryRouterEdge:
         
         self.query_router = prompt | self.structured_llm_router
     
-    def query_router_edge(self, state):
+    def query_router_edge(self, state, config: Optional[RunnableConfig] = None):
         """Route the query based on its content.
         
         Args:
             state: Dictionary containing the current state with the question
+            config: Run config of the request, carrying its LLM call counter
             
         Returns:
             str: Either "vectorstore" or "web_search" based on routing decision
         """
-        print("---ROUTE QUESTION---")
+        logger.info("---ROUTE QUESTION---")
         
         question = state["question"]
-        source = self.query_router.invoke({"question": question})
+        if self.embedding_router is not None:
+            decision = self.embedding_router.route(question)
+            if decision is not None:
+                return self._route(QueryRouter(datasource=decision))
+            logger.info("---AMBIGUOUS QUESTION, FALLING BACK TO THE LLM ROUTER---")
+
+        source = self.query_router.invoke({"question": question}, config)
+        
+        return self._route(source)
+
+    async def aquery_router_edge(self, state, config: Optional[RunnableConfig] = None):
+        """Asynchronously route the query based on its content.
         
+        Args:
+            state: Dictionary containing the current state with the question
+            config: Run config of the request, carrying its LLM call counter
+            
+        Returns:
+            str: Either "vectorstore" or "web_search" based on routing decision
+        """
+        logger.info("---ROUTE QUESTION---")
+        
+        question = state["question"]
+        if self.embedding_router is not None:
+            decision = await self.embedding_router.aroute(question)
+            if decision is not None:
+                return self._route(QueryRouter(datasource=decision))
+            logger.info("---AMBIGUOUS QUESTION, FALLING BACK TO THE LLM ROUTER---")
+
+        source = await self.query_router.ainvoke({"question": question}, config)
+        
+        return self._route(source)
+
+    def _route(self, source: QueryRouter) -> str:
+        """Map the router output to a routing decision.
+        
+        Args:
+            source: The structured output of the query router
+            
+        Returns:
+            str: Either "vectorstore" or "web_search"
+        """
         if source.datasource == "web_search":
-            print("---ROUTE QUESTION TO WEB SEARCH---")
+            logger.info("---ROUTE QUESTION TO WEB SEARCH---")
             return "web_search"
         
-        print("---ROUTE QUESTION TO RAG---")
+        logger.info("---ROUTE QUESTION TO RAG---")
         return "vectorstore"
\ No newline at end of file
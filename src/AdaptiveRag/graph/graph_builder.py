@@ -1,13 +1,19 @@
+import logging
 import traceback
-import streamlit as st
 from typing import Dict, Optional
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import START, END, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 
 from src.AdaptiveRag.state import AdaptiveRAGState
+from src.AdaptiveRag.progress import get_reporter
+from src.AdaptiveRag.metrics import Instrumentation
 from src.AdaptiveRag.tools import get_tool_mananger
+from src.AdaptiveRag.tools.tool_manager import ToolManager
+from src.AdaptiveRag.retriever import Retriever
 from src.AdaptiveRag.nodes import (
     AnswerGeneratorNode,
+    BudgetExhaustedNode,
     DocumentGraderNode,
     QuestionRewriterNode,
     RetrieverNode,
@@ -19,69 +25,119 @@ from src.AdaptiveRag.edge import (
     GenerateOrRewriterEdge
 )
 
+logger = logging.getLogger(__name__)
+
 class GraphBuilder:
     """Builds and compiles the Adaptive RAG workflow graph."""
     
-    def __init__(self, user_input: Dict[str, str]):
+    def __init__(self,
+                 user_input: Dict[str, str],
+                 retriever: Optional[Retriever] = None,
+                 tool_manager: Optional[ToolManager] = None):
         """Initialize the graph builder with user configuration.
         
         Args:
             user_input: Dictionary containing user configuration
+            retriever: An existing retriever to build the graph around, a new one is created if omitted
+            tool_manager: Tool manager providing the web search tool, the default Tavily tools if omitted
         """
         self.user_input = user_input
         self.workflow = StateGraph(AdaptiveRAGState)
-        self.tool_manager = get_tool_mananger()
+        self.tool_manager = tool_manager or get_tool_mananger()
+        self.instrumentation = Instrumentation(enabled=bool(user_input.get("metrics", False)))
         
         # Initialize node and edge references
         self.answer_generator = None
         self.document_grader = None
         self.question_rewriter = None
         self.retriever = None
+        self.document_retriever = retriever
         self.web_search = None
+        self.regeneration_budget_exhausted = None
+        self.rewrite_budget_exhausted = None
         self.query_router = None
         self.hallucination_answer = None
         self.generate_or_rewriter = None
     
     def _graph_nodes(self):
-        """Initialize all processing nodes for the graph."""
+        """Initialize all processing nodes for the graph.
+        
+        Every node is registered with both its sync and async implementation,
+        so the compiled graph runs natively under invoke/stream and ainvoke/astream.
+        """
         try:
-            print("---INITIALIZING GRAPH NODES---")
-            self.answer_generator = AnswerGeneratorNode(self.user_input).answer_generator_node
-            self.document_grader = DocumentGraderNode(self.user_input).document_grader_node
-            self.question_rewriter = QuestionRewriterNode(self.user_input).question_rewriter_node
-            self.retriever = RetrieverNode(self.user_input).retriever_node
-            self.web_search = WebSearchNode().web_search_node
-            print("---NODES INITIALIZED SUCCESSFULLY---")
+            logger.info("---INITIALIZING GRAPH NODES---")
+            answer_generator = AnswerGeneratorNode(self.user_input)
+            self.answer_generator = RunnableLambda(
+                answer_generator.answer_generator_node, afunc=answer_generator.aanswer_generator_node
+            )
+            document_grader = DocumentGraderNode(self.user_input)
+            self.document_grader = RunnableLambda(
+                document_grader.document_grader_node, afunc=document_grader.adocument_grader_node
+            )
+            question_rewriter = QuestionRewriterNode(self.user_input)
+            self.question_rewriter = RunnableLambda(
+                question_rewriter.question_rewriter_node, afunc=question_rewriter.aquestion_rewriter_node
+            )
+            retriever = RetrieverNode(self.user_input, retriever=self.document_retriever)
+            self.retriever = RunnableLambda(retriever.retriever_node, afunc=retriever.aretriever_node)
+            # Shared with the query router so it can route against the indexed corpus
+            self.document_retriever = retriever.retriever
+            web_search = WebSearchNode(self.user_input, tool_manager=self.tool_manager)
+            self.web_search = RunnableLambda(web_search.web_search_node, afunc=web_search.aweb_search_node)
+            self.regeneration_budget_exhausted = BudgetExhaustedNode(
+                self.user_input, next_step="regenerate"
+            ).budget_exhausted_node
+            self.rewrite_budget_exhausted = BudgetExhaustedNode(
+                self.user_input, next_step="rewrite"
+            ).budget_exhausted_node
+            logger.info("---NODES INITIALIZED SUCCESSFULLY---")
         except Exception as e:
-            print(f"---ERROR INITIALIZING NODES: {str(e)}---")
+            logger.error(f"---ERROR INITIALIZING NODES: {str(e)}---")
             raise RuntimeError(f"Failed to initialize graph nodes: {str(e)}")
     
     def _graph_edges(self):
         """Initialize all edge functions for the graph."""
         try:
-            print("---INITIALIZING GRAPH EDGES---")
-            self.query_router = QueryRouterEdge(self.user_input).query_router_edge
-            self.hallucination_answer = HallucinationAnswerEdge(self.user_input).hallucination_answer_edge
-            self.generate_or_rewriter = GenerateOrRewriterEdge().generate_or_rewriter_node
-            print("---EDGES INITIALIZED SUCCESSFULLY---")
+            logger.info("---INITIALIZING GRAPH EDGES---")
+            query_router = QueryRouterEdge(self.user_input, retriever=self.document_retriever)
+            self.query_router = RunnableLambda(
+                query_router.query_router_edge, afunc=query_router.aquery_router_edge
+            )
+            hallucination_answer = HallucinationAnswerEdge(self.user_input)
+            self.hallucination_answer = RunnableLambda(
+                hallucination_answer.hallucination_answer_edge, afunc=hallucination_answer.ahallucination_answer_edge
+            )
+            self.generate_or_rewriter = GenerateOrRewriterEdge(self.user_input).generate_or_rewriter_node
+            logger.info("---EDGES INITIALIZED SUCCESSFULLY---")
         except Exception as e:
-            print(f"---ERROR INITIALIZING EDGES: {str(e)}---")
+            logger.error(f"---ERROR INITIALIZING EDGES: {str(e)}---")
             raise RuntimeError(f"Failed to initialize graph edges: {str(e)}")
 
     def _adaptive_rag_graph(self):
         """Build the complete Adaptive RAG graph with nodes and edges."""
         try:
-            print("---BUILDING ADAPTIVE RAG GRAPH---")
+            logger.info("---BUILDING ADAPTIVE RAG GRAPH---")
             
-            self.workflow.add_node("answer_generator", self.answer_generator)
-            self.workflow.add_node("document_grader", self.document_grader)
-            self.workflow.add_node("question_rewriter", self.question_rewriter)
-            self.workflow.add_node("retriever", self.retriever)
-            self.workflow.add_node("web_search", self.web_search)
+            # Nodes and edges are only wrapped when metrics are enabled
+            instrument = self.instrumentation.wrap
+            self.workflow.add_node("answer_generator", instrument("answer_generator", self.answer_generator))
+            self.workflow.add_node("document_grader", instrument("document_grader", self.document_grader))
+            self.workflow.add_node("question_rewriter", instrument("question_rewriter", self.question_rewriter))
+            self.workflow.add_node("retriever", instrument("retriever", self.retriever))
+            self.workflow.add_node("web_search", instrument("web_search", self.web_search))
+            self.workflow.add_node(
+                "regeneration_budget_exhausted",
+                instrument("regeneration_budget_exhausted", self.regeneration_budget_exhausted)
+            )
+            self.workflow.add_node(
+                "rewrite_budget_exhausted",
+                instrument("rewrite_budget_exhausted", self.rewrite_budget_exhausted)
+            )
             
             self.workflow.add_conditional_edges(
                 START,
-                self.query_router,
+                instrument("query_router", self.query_router, kind="edge"),
                 {
                     "web_search": "web_search",
                     "vectorstore": "retriever"
@@ -93,10 +149,11 @@ class GraphBuilder:
             
             self.workflow.add_conditional_edges(
                 "document_grader",
-                self.generate_or_rewriter,
+                instrument("generate_or_rewriter", self.generate_or_rewriter, kind="edge"),
                 {
                     "question_rewriter_node": "question_rewriter",
-                    "answer_generator_node": "answer_generator"
+                    "answer_generator_node": "answer_generator",
+                    "rewrite_budget_exhausted": "rewrite_budget_exhausted"
                 }
             )
             
@@ -104,39 +161,46 @@ class GraphBuilder:
             
             self.workflow.add_conditional_edges(
                 "answer_generator",
-                self.hallucination_answer,
+                instrument("hallucination_answer", self.hallucination_answer, kind="edge"),
                 {
                     "useful": END,
                     "not useful": "question_rewriter",
-                    "not supported": "answer_generator"
+                    "not supported": "answer_generator",
+                    "regeneration_budget_exhausted": "regeneration_budget_exhausted",
+                    "rewrite_budget_exhausted": "rewrite_budget_exhausted"
                 }
             )
+
+            self.workflow.add_edge("regeneration_budget_exhausted", END)
+            self.workflow.add_edge("rewrite_budget_exhausted", END)
             
-            print("---GRAPH BUILT SUCCESSFULLY---")
+            logger.info("---GRAPH BUILT SUCCESSFULLY---")
         except Exception as e:
-            print(f"---ERROR BUILDING GRAPH: {str(e)}---")
+            logger.error(f"---ERROR BUILDING GRAPH: {str(e)}---")
             raise RuntimeError(f"Failed to build adaptive RAG graph: {str(e)}")
     
     def setup_graph(self) -> Optional[CompiledStateGraph]:
         """Build and compile the workflow graph.
         
+        The compiled graph supports both blocking (invoke/stream) and
+        asynchronous (ainvoke/astream) execution.
+        
         Returns:
             Compiled StateGraph or None if compilation fails
         """
         try:
-            print("---SETTING UP ADAPTIVE RAG WORKFLOW---")
+            logger.info("---SETTING UP ADAPTIVE RAG WORKFLOW---")
             
             self._graph_nodes()
             self._graph_edges()
             self._adaptive_rag_graph()
             
             compiled_graph = self.workflow.compile()
-            print("---WORKFLOW SUCCESSFULLY COMPILED---")
+            logger.info("---WORKFLOW SUCCESSFULLY COMPILED---")
             return compiled_graph
             
         except Exception as e:
-            print(f"---CRITICAL ERROR: GRAPH COMPILATION FAILED: {str(e)}---")
-            print(f"Full error: {traceback.format_exc()}")
-            st.error(f"Full error: {traceback.format_exc()}")
+            logger.exception(f"---CRITICAL ERROR: GRAPH COMPILATION FAILED: {str(e)}---")
+            get_reporter().error(f"Full error: {traceback.format_exc()}")
             
             return None
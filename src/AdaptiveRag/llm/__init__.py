@@ -1 +1 @@
-from src.AdaptiveRag.llm.llm import get_llm
+from src.AdaptiveRag.llm.llm import get_llm, get_llm_cache_key, invalidate_llm_clients
@@ -7,6 +7,9 @@ from src.AdaptiveRag.llm.base_llm import BaseLLMProvider
 
 class AnthropicLLM(BaseLLMProvider):
 
+    API_KEY_NAME = "ANTHROPIC_API_KEY"
+    MODEL_KEY = "selected_anthropic_model"
+
     def get_llm_model(self) -> Optional[BaseChatModel]:
         try:
             # Clear previous error messages
@@ -21,7 +24,8 @@ class AnthropicLLM(BaseLLMProvider):
                                            model_name="Anthropic"):
                 self.llm = ChatAnthropic(
                     api_key=anthropic_api_key,
-                    model=anthropic_selected_model
+                    model=anthropic_selected_model,
+                    **self._get_model_params()
                 )
                 return self.llm
 
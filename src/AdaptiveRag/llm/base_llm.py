@@ -1,18 +1,41 @@
 import os
-import streamlit as st
-from typing import Dict, List, Optional
+import json
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
+from src.AdaptiveRag.progress import get_reporter
 
 
 class BaseLLMProvider(ABC):
+    # Names of the user_input entries holding the API key and the selected model
+    API_KEY_NAME: str = ""
+    MODEL_KEY: str = ""
+
     def __init__(self, user_input: Dict[str, str]):
         self.user_input = user_input
         self.llm = None
         self.error_messages: List[str] = []
     
     def _get_api_key(self, api_key_name):
-        api_key = self.user_input[api_key_name] or os.getenv(api_key_name) or st.session_state[api_key_name]
+        api_key = self.user_input.get(api_key_name) or os.getenv(api_key_name)
         return api_key
+
+    def _get_model_params(self) -> Dict[str, Any]:
+        """Extra keyword arguments for the chat model, e.g. temperature."""
+        return dict(self.user_input.get("llm_params") or {})
+
+    def cache_key(self) -> Tuple[str, str, str, str]:
+        """Key identifying the client configuration in the shared client registry.
+
+        The API key is only included as a hash so it is never kept in plain text.
+        """
+        api_key = self._get_api_key(api_key_name=self.API_KEY_NAME) or ""
+        return (
+            type(self).__name__,
+            self.user_input.get(self.MODEL_KEY) or "",
+            hashlib.sha256(api_key.encode("utf-8")).hexdigest(),
+            json.dumps(self._get_model_params(), sort_keys=True, default=str)
+        )
     
     def _validate_requirements(self,
                                api_key: str,
@@ -34,7 +57,7 @@ class BaseLLMProvider(ABC):
     
     def display_errors(self):
         for message in self.error_messages:
-            st.error(message)
+            get_reporter().error(message)
     
     @abstractmethod
     def get_llm_model(self):
@@ -1,5 +1,4 @@
 import os
-import streamlit as st
 from typing import Dict, Optional
 from langchain_groq import ChatGroq
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -9,6 +8,9 @@ from src.AdaptiveRag.llm.base_llm import BaseLLMProvider
 
 class GroqLLM(BaseLLMProvider):
 
+    API_KEY_NAME = "GROQ_API_KEY"
+    MODEL_KEY = "selected_groq_model"
+
     def get_llm_model(self) -> Optional[BaseChatModel]:
         try:
             # Clear previous error messages
@@ -24,7 +26,8 @@ class GroqLLM(BaseLLMProvider):
                 
                 self.llm = ChatGroq(
                     api_key=groq_api_key,
-                    model=groq_selected_model
+                    model=groq_selected_model,
+                    **self._get_model_params()
                 )
                 
                 return self.llm
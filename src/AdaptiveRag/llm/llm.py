@@ -1,52 +1,99 @@
-import streamlit as st
-from typing import Dict, Optional, Type, Union
+from typing import Dict, Hashable, Optional, Type, Union
 from langchain_core.language_models.chat_models import BaseChatModel
 from src.AdaptiveRag.llm.base_llm import BaseLLMProvider
 from src.AdaptiveRag.llm.groq_llm import GroqLLM
 from src.AdaptiveRag.llm.openai_llm import OpenAILLM
 from src.AdaptiveRag.llm.anthropic_llm import AnthropicLLM
+from src.AdaptiveRag.llm.llm_registry import llm_registry
+from src.AdaptiveRag.cache.llm_cache import get_llm_cache
+from src.AdaptiveRag.progress import get_reporter
 
 
-def get_llm(user_input: Dict[str, str]) -> Optional[BaseChatModel]:
+LLM_PROVIDERS: Dict[str, Type[BaseLLMProvider]] = {
+    "Groq": GroqLLM,
+    "OpenAI": OpenAILLM,
+    "Anthropic": AnthropicLLM
+}
+
+
+def get_llm_cache_key(user_input: Dict[str, str]) -> Optional[Hashable]:
+    """
+    Function to get the client registry key of the configured LLM.
+
+    Args:
+        user_input: Dictionary containing user configuration settings
+
+    Returns:
+        The registry key, or None if the provider is not supported
+    """
+    llm_class = LLM_PROVIDERS.get(user_input.get('selected_llm'))
+    return llm_class(user_input).cache_key() if llm_class else None
+
+
+def invalidate_llm_clients(key: Optional[Hashable] = None, provider: Optional[str] = None) -> int:
+    """
+    Function to drop shared LLM clients, e.g. after the user changed the model or API key.
+
+    Args:
+        key: Drop only the client with this registry key
+        provider: Drop every client of this provider, all clients if neither is given
+
+    Returns:
+        Number of clients dropped
+    """
+    return llm_registry.invalidate(key=key, provider=provider)
+
+
+def get_llm(user_input: Dict[str, str], use_cache: bool = False) -> Optional[BaseChatModel]:
     """
     Function to get the appropriate LLM model instance.
-    
+
+    Clients are shared process-wide: every call with the same provider, model,
+    API key and parameters returns the same client instance.
+
     Args:
         user_input: Dictionary containing user configuration settings
-        
+        use_cache: Serve repeated identical calls from the exact-match LLM cache,
+            meant for deterministic classifiers such as the router and the graders
+
     Returns:
         Configured LLM model instance or None if initialization fails
     """
 
-    llm_providers: Dict[str, Type[BaseLLMProvider]] = {
-        "Groq": GroqLLM,
-        "OpenAI": OpenAILLM,
-        "Anthropic": AnthropicLLM
-    }
     selected_llm = user_input['selected_llm']
     # Get the appropriate LLM class
-    llm_class = llm_providers.get(selected_llm)
-    
+    llm_class = LLM_PROVIDERS.get(selected_llm)
+
     if llm_class:
         try:
-            # Initialize the LLM provider and get the model
+            # Initialize the LLM provider and get the shared model
             llm_provider = llm_class(user_input)
-            llm_model = llm_provider.get_llm_model()
-            
+            llm_key = llm_provider.cache_key()
+            llm_model = llm_registry.get_or_create(llm_key, llm_provider.get_llm_model)
+
+            llm_cache = get_llm_cache(user_input) if use_cache else None
+            if llm_model and llm_cache is not None:
+                # A copy of the shared client that shares its connections but consults the cache
+                shared_model = llm_model
+                llm_model = llm_registry.get_or_create(
+                    llm_key + ("cached", id(llm_cache)),
+                    lambda: shared_model.model_copy(update={"cache": llm_cache})
+                )
+
             if llm_model:
                 return llm_model
             else:
                 return None
-                
+
         except Exception as e:
             error_msg = f"Error initializing {selected_llm} LLM: {str(e)}"
-            st.error(error_msg)
+            get_reporter().error(error_msg)
             return None
     else:
         # Handle unsupported LLM provider
-        supported_providers = ', '.join(llm_providers.keys())
+        supported_providers = ', '.join(LLM_PROVIDERS.keys())
         error_msg = f"Unsupported LLM provider: {selected_llm}"
-        
-        st.error(error_msg)
-        st.info(f"Supported providers: {supported_providers}")
-        return None
\ No newline at end of file
+
+        get_reporter().error(error_msg)
+        get_reporter().info(f"Supported providers: {supported_providers}")
+        return None
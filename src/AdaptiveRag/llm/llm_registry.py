@@ -0,0 +1,70 @@
+import threading
+from typing import Callable, Dict, Hashable, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+
+
+class LLMClientRegistry:
+    """Process-wide registry handing out one shared chat model client per configuration.
+
+    Clients are keyed by provider, model, a hash of the API key and the model
+    parameters. Every node, grader and session asking for the same
+    configuration gets the same client, and with it the same pooled HTTP
+    connections, instead of opening new ones.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._clients: Dict[Hashable, BaseChatModel] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Optional[BaseChatModel]]) -> Optional[BaseChatModel]:
+        """Return the client registered under the key, creating it on first use.
+
+        Args:
+            key: Configuration key of the client
+            factory: Callable creating the client, may return None on failure
+
+        Returns:
+            The shared client, or None if it could not be created
+        """
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = factory()
+                # Failed initializations are not cached so they are retried next time
+                if client is not None:
+                    self._clients[key] = client
+            return client
+
+    def invalidate(self, key: Optional[Hashable] = None, provider: Optional[str] = None) -> int:
+        """Drop clients from the registry.
+
+        Clients already handed out keep working; only future lookups create new ones.
+
+        Args:
+            key: Drop only the client with this key and the clients derived from it
+                (registered under a tuple key extending it)
+            provider: Drop every client of this provider (the first element of the key)
+
+        Returns:
+            int: Number of clients dropped
+        """
+        with self._lock:
+            if key is not None:
+                stale = [
+                    k for k in self._clients
+                    if k == key or (isinstance(k, tuple) and isinstance(key, tuple) and k[:len(key)] == key)
+                ]
+            else:
+                stale = [k for k in self._clients if provider is None or (isinstance(k, tuple) and k[0] == provider)]
+            for k in stale:
+                del self._clients[k]
+            return len(stale)
+
+    def keys(self) -> List[Hashable]:
+        """List the keys of all registered clients."""
+        with self._lock:
+            return list(self._clients)
+
+
+llm_registry = LLMClientRegistry()
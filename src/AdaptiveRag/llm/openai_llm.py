@@ -1,5 +1,4 @@
 import os
-import streamlit as st
 from typing import Dict, Optional
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import ChatOpenAI
@@ -9,6 +8,9 @@ from src.AdaptiveRag.llm.base_llm import BaseLLMProvider
 
 class OpenAILLM(BaseLLMProvider):
 
+    API_KEY_NAME = "OPENAI_API_KEY"
+    MODEL_KEY = "selected_openai_model"
+
     def get_llm_model(self) -> Optional[BaseChatModel]:
         try:
             # Clear previous error messages
@@ -23,7 +25,8 @@ class OpenAILLM(BaseLLMProvider):
                                            model_name="OpenAI"):
                 self.llm = ChatOpenAI(
                     api_key=openai_api_key,
-                    model=openai_selected_model
+                    model=openai_selected_model,
+                    **self._get_model_params()
                 )
                 return self.llm
 
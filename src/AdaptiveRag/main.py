@@ -1,12 +1,20 @@
 import streamlit as st
 
 from src.AdaptiveRag.ui.streamlit.loadui import StreamlitUILoader
-from src.AdaptiveRag.llm import get_llm
+from src.AdaptiveRag.llm import get_llm, get_llm_cache_key, invalidate_llm_clients
 from src.AdaptiveRag.graph import GraphBuilder
+from src.AdaptiveRag.cache import get_semantic_cache
+from src.AdaptiveRag.state import RequestBudget
 from src.AdaptiveRag.ui.streamlit.display_result import DisplayResultStreamlit
+from src.AdaptiveRag.ui.streamlit.progress_reporter import StreamlitProgressReporter
+from src.AdaptiveRag.progress import configure_logging, set_reporter
 
 
 def adaptive_rag():
+    # Render retriever and LLM progress into the page, pipeline steps into the server log
+    set_reporter(StreamlitProgressReporter())
+    configure_logging()
+
     ui = StreamlitUILoader()
     user_input = ui.load_streamlit_ui()
     
@@ -14,13 +22,32 @@ def adaptive_rag():
 
     if user_message:
         try:
+            # Answer from the chunks indexed so far instead of blocking the page until the index is complete
+            user_input["background_indexing"] = True
+
+            # Drop the shared client and the graph built with it when the model or API key changed
+            llm_key = get_llm_cache_key(user_input)
+            if st.session_state.get("llm_key") not in (None, llm_key):
+                invalidate_llm_clients(key=st.session_state["llm_key"])
+                st.session_state.pop("graph", None)
+            st.session_state["llm_key"] = llm_key
+
             llm = get_llm(user_input=user_input)
-            graph_builder = GraphBuilder(user_input)
+            graph_builder = GraphBuilder(user_input, retriever=st.session_state.get("retriever"))
+
+            # Index only the URLs that changed since the retriever was built
+            if "retriever" in st.session_state:
+                # Show the status of a background build again, the rerun cleared the previous page
+                st.session_state["retriever"].report_progress(rerender=True)
+                st.session_state["retriever"].update_urls(user_input["urls"], wait=False)
 
             if "graph" not in st.session_state:
                 st.toast("Graph not found in session state, creating new Graph")
                 graph = graph_builder.setup_graph()
                 st.session_state["graph"] = graph
+                # Keep the retriever across reruns so the index is only rebuilt when the URLs change
+                if graph_builder.document_retriever is not None:
+                    st.session_state["retriever"] = graph_builder.document_retriever
 
             graph = st.session_state["graph"]
             
@@ -28,7 +55,17 @@ def adaptive_rag():
                     st.error("Error: Graph setup failed.")
                     return
             
-            DisplayResultStreamlit(graph, user_message).handle_adaptive_rag_conversation()
+            retriever = st.session_state.get("retriever")
+            if retriever is not None:
+                # Show what a background build reported since the last call
+                retriever.report_progress()
+            DisplayResultStreamlit(
+                graph,
+                user_message,
+                semantic_cache=get_semantic_cache(user_input),
+                index_version=retriever.index_version if retriever else None,
+                budget=RequestBudget(user_input)
+            ).handle_adaptive_rag_conversation()
 
         except Exception as e:
             st.error(f"Error(main.py): Graph setup failed - {e}")
\ No newline at end of file
@@ -0,0 +1,2 @@
+from src.AdaptiveRag.metrics.registry import MetricsRegistry, get_metrics_registry
+from src.AdaptiveRag.metrics.instrumentation import Instrumentation, RequestMetrics
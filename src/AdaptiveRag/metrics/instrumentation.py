@@ -0,0 +1,167 @@
+import time
+import threading
+from typing import Any, Dict, List, Optional
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from src.AdaptiveRag.metrics.registry import MetricsRegistry, get_metrics_registry
+from src.AdaptiveRag.state.budget import RequestBudget
+
+
+class RequestMetrics:
+    """Per-request record of every instrumented node and edge the request went through."""
+
+    CONFIG_KEY = "request_metrics"
+
+    def __init__(self):
+        """Initialize an empty record."""
+        self.steps: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, step: Dict[str, Any]) -> None:
+        with self._lock:
+            self.steps.append(step)
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the request.
+
+        Returns:
+            dict: The steps in execution order and the totals over all of them
+        """
+        with self._lock:
+            steps = list(self.steps)
+        totals = {
+            key: sum(step[key] for step in steps)
+            for key in ("seconds", "llm_calls", "prompt_tokens", "completion_tokens")
+        }
+        totals["seconds"] = round(totals["seconds"], 4)
+        return {"steps": steps, "totals": totals}
+
+
+class Instrumentation:
+    """Wraps graph nodes and edges to record durations, LLM usage, document counts and route decisions.
+
+    Every wrapped call is recorded in the metrics registry (exposed as
+    Prometheus text) and, if the run config carries a ``RequestMetrics``, in
+    that request's summary. LLM calls and tokens are attributed to a step by
+    diffing the request's ``LLMCallCounter`` around it. When disabled,
+    ``wrap`` returns the runnable unchanged, so there is no overhead at all.
+    """
+
+    def __init__(self, enabled: bool = False, registry: Optional[MetricsRegistry] = None):
+        """Initialize the instrumentation.
+
+        Args:
+            enabled: Whether nodes and edges are wrapped
+            registry: Registry the metrics are recorded in, the process-wide one if omitted
+        """
+        self.enabled = enabled
+        self.registry = registry or get_metrics_registry()
+        self.registry.describe("step_duration_seconds", "histogram", "Duration of graph node and edge calls.")
+        self.registry.describe("step_calls_total", "counter", "Number of graph node and edge calls.")
+        self.registry.describe("step_errors_total", "counter", "Number of graph node and edge calls that raised.")
+        self.registry.describe("step_llm_calls_total", "counter", "LLM calls made by graph nodes and edges.")
+        self.registry.describe("step_prompt_tokens_total", "counter", "Prompt tokens used by graph nodes and edges.")
+        self.registry.describe("step_completion_tokens_total", "counter", "Completion tokens used by graph nodes and edges.")
+        self.registry.describe("step_documents_in_total", "counter", "Documents in the state passed to graph nodes.")
+        self.registry.describe("step_documents_out_total", "counter", "Documents in the state returned by graph nodes.")
+        self.registry.describe("route_decisions_total", "counter", "Routing decisions taken by graph edges.")
+
+    @staticmethod
+    def start_request(config: RunnableConfig) -> RequestMetrics:
+        """Attach a new per-request record to a run config.
+
+        Args:
+            config: The run config of the request, modified in place
+
+        Returns:
+            RequestMetrics: The record filled while the request runs
+        """
+        request_metrics = RequestMetrics()
+        config.setdefault("configurable", {})[RequestMetrics.CONFIG_KEY] = request_metrics
+        return request_metrics
+
+    @staticmethod
+    def _usage(config: Optional[RunnableConfig]):
+        counter = ((config or {}).get("configurable") or {}).get(RequestBudget.COUNTER_KEY)
+        if counter is None:
+            return 0, 0, 0
+        return counter.count, counter.prompt_tokens, counter.completion_tokens
+
+    def _record(self,
+                name: str,
+                kind: str,
+                state: Dict[str, Any],
+                result: Any,
+                config: Optional[RunnableConfig],
+                started: float,
+                usage_before) -> None:
+        seconds = time.perf_counter() - started
+        usage_after = self._usage(config)
+        llm_calls, prompt_tokens, completion_tokens = (after - before for after, before in zip(usage_after, usage_before))
+        documents_in = len(state.get("documents") or []) if isinstance(state, dict) else 0
+        documents_out = len(result.get("documents") or []) if isinstance(result, dict) else 0
+
+        self.registry.observe("step_duration_seconds", seconds, step=name, kind=kind)
+        self.registry.inc("step_calls_total", step=name, kind=kind)
+        self.registry.inc("step_llm_calls_total", llm_calls, step=name, kind=kind)
+        self.registry.inc("step_prompt_tokens_total", prompt_tokens, step=name, kind=kind)
+        self.registry.inc("step_completion_tokens_total", completion_tokens, step=name, kind=kind)
+        step = {
+            "step": name,
+            "kind": kind,
+            "seconds": round(seconds, 4),
+            "llm_calls": llm_calls,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens
+        }
+
+        if kind == "edge":
+            self.registry.inc("route_decisions_total", edge=name, decision=str(result))
+            step["decision"] = result
+        else:
+            self.registry.inc("step_documents_in_total", documents_in, step=name, kind=kind)
+            self.registry.inc("step_documents_out_total", documents_out, step=name, kind=kind)
+            step.update(documents_in=documents_in, documents_out=documents_out)
+
+        request_metrics = ((config or {}).get("configurable") or {}).get(RequestMetrics.CONFIG_KEY)
+        if request_metrics is not None:
+            request_metrics.add(step)
+
+    def wrap(self, name: str, runnable: Any, kind: str = "node") -> Any:
+        """Instrument a graph node or edge.
+
+        Args:
+            name: Name of the node or edge in the metrics
+            runnable: The node or edge, a runnable or a function taking the state
+            kind: "node" or "edge"; edges record their return value as the route decision
+
+        Returns:
+            The instrumented runnable, or the runnable itself if instrumentation is disabled
+        """
+        if not self.enabled:
+            return runnable
+
+        inner: Runnable = runnable if isinstance(runnable, Runnable) else RunnableLambda(runnable)
+
+        def call(state: Dict[str, Any], config: RunnableConfig):
+            usage_before = self._usage(config)
+            started = time.perf_counter()
+            try:
+                result = inner.invoke(state, config)
+            except Exception:
+                self.registry.inc("step_errors_total", step=name, kind=kind)
+                raise
+            self._record(name, kind, state, result, config, started, usage_before)
+            return result
+
+        async def acall(state: Dict[str, Any], config: RunnableConfig):
+            usage_before = self._usage(config)
+            started = time.perf_counter()
+            try:
+                result = await inner.ainvoke(state, config)
+            except Exception:
+                self.registry.inc("step_errors_total", step=name, kind=kind)
+                raise
+            self._record(name, kind, state, result, config, started, usage_before)
+            return result
+
+        return RunnableLambda(call, afunc=acall, name=name)
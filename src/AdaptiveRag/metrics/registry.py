@@ -0,0 +1,105 @@
+import threading
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms rendered in the Prometheus text exposition format."""
+
+    def __init__(self, prefix: str = "adaptive_rag", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """Initialize an empty registry.
+
+        Args:
+            prefix: Prefix of every metric name
+            buckets: Upper bounds of the histogram buckets in seconds
+        """
+        self.prefix = prefix
+        self.buckets = buckets
+        self.help: Dict[str, Tuple[str, str]] = {}
+        self.counters: Dict[str, Dict[Labels, float]] = defaultdict(lambda: defaultdict(float))
+        self.histograms: Dict[str, Dict[Labels, List[float]]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def _name(self, name: str) -> str:
+        return f"{self.prefix}_{name}"
+
+    def describe(self, name: str, metric_type: str, description: str) -> None:
+        """Register the type and help text of a metric.
+
+        Args:
+            name: Metric name without prefix
+            metric_type: "counter" or "histogram"
+            description: Help text
+        """
+        self.help[self._name(name)] = (metric_type, description)
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Increase a counter.
+
+        Args:
+            name: Metric name without prefix
+            value: Amount to add
+            labels: Label values of the series
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self.counters[self._name(name)][key] += value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record an observation in a histogram.
+
+        Args:
+            name: Metric name without prefix
+            value: The observed value
+            labels: Label values of the series
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            # Per series: one count per bucket, then the total count and the sum
+            series = self.histograms[self._name(name)].setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    @staticmethod
+    def _labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for _, value in pairs)
+        return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                metric_type, description = self.help.get(name, ("counter", ""))
+                lines += [f"# HELP {name} {description}", f"# TYPE {name} {metric_type}"]
+                lines += [f"{name}{self._labels(labels)} {value:g}" for labels, value in sorted(series.items())]
+
+            for name, series in sorted(self.histograms.items()):
+                metric_type, description = self.help.get(name, ("histogram", ""))
+                lines += [f"# HELP {name} {description}", f"# TYPE {name} {metric_type}"]
+                for labels, values in sorted(series.items()):
+                    for bound, count in zip(self.buckets, values):
+                        lines.append(f"{name}_bucket{self._labels(labels, (('le', f'{bound:g}'),))} {count:g}")
+                    lines.append(f"{name}_bucket{self._labels(labels, (('le', '+Inf'),))} {values[-2]:g}")
+                    lines.append(f"{name}_count{self._labels(labels)} {values[-2]:g}")
+                    lines.append(f"{name}_sum{self._labels(labels)} {values[-1]:g}")
+
+        return "\n".join(lines) + "\n"
+
+
+_metrics_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _metrics_registry
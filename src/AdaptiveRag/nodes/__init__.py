@@ -2,4 +2,5 @@ from src.AdaptiveRag.nodes.document_grader_node import DocumentGraderNode
 from src.AdaptiveRag.nodes.retriever_node import RetrieverNode
 from src.AdaptiveRag.nodes.answer_generator_node import AnswerGeneratorNode
 from src.AdaptiveRag.nodes.question_rewriter_node import QuestionRewriterNode
-from src.AdaptiveRag.nodes.web_search_node import WebSearchNode
\ No newline at end of file
+from src.AdaptiveRag.nodes.web_search_node import WebSearchNode
+from src.AdaptiveRag.nodes.budget_exhausted_node import BudgetExhaustedNode
\ No newline at end of file
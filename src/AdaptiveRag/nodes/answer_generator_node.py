@@ -1,13 +1,32 @@
-from typing import Dict, List
-from langchain import hub
+import logging
+from typing import Dict, List, Optional
 from langchain.schema import Document
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
 from src.AdaptiveRag.llm import get_llm
 from src.AdaptiveRag.state.state import AdaptiveRAGState
+from src.AdaptiveRag.state.budget import RequestBudget
+from src.AdaptiveRag.context import get_context_packer
+
+logger = logging.getLogger(__name__)
 
 class AnswerGeneratorNode:
     """Generates answers to user questions based on retrieved documents."""
     
+    # Tag attached to the generation chain so its tokens can be picked out of the graph's message stream
+    GENERATION_TAG = "answer_generation"
+
+    # The "rlm/rag-prompt" prompt from LangChain Hub, kept here so building the graph needs no network access
+    RAG_PROMPT = (
+        "You are an assistant for question-answering tasks. Use the following pieces of retrieved context "
+        "to answer the question. If you don't know the answer, just say that you don't know. "
+        "Use three sentences maximum and keep the answer concise.\n"
+        "Question: {question} \n"
+        "Context: {context} \n"
+        "Answer:"
+    )
+    
     def __init__(self, user_input: Dict[str, str]):
         """Initialize the answer generator with user input configuration.
         
@@ -15,49 +34,91 @@ class AnswerGeneratorNode:
             user_input: Dictionary containing user configuration
         """
         self.llm = get_llm(user_input=user_input)
+        self.context_packer = get_context_packer(user_input)
         self.rag_chain = None
         self._get_rag_chain()
         
     def _format_docs(self, documents: List[Document]) -> str:
-        """Format a list of documents into a single string.
+        """Pack a list of documents into a single context string.
+        
+        Overlapping passages are dropped and the rest are ordered by relevance
+        and cut off at the configured token budget.
         
         Args:
             documents: List of Document objects to format
             
         Returns:
-            str: Concatenated document contents separated by double newlines
+            str: The packed document contents separated by double newlines
         """
-        return "\n\n".join(doc.page_content for doc in documents)
+        return self.context_packer.pack(documents)
     
     def _get_rag_chain(self):
-        """Set up the RAG chain using a prompt from LangChain Hub.
+        """Set up the RAG chain using the LangChain Hub RAG prompt.
         
         Creates a pipeline that takes context and question and generates an answer.
         """
-        prompt = hub.pull("rlm/rag-prompt")
-        self.rag_chain = prompt | self.llm | StrOutputParser()
+        prompt = ChatPromptTemplate.from_messages([("human", self.RAG_PROMPT)])
+        self.rag_chain = (prompt | self.llm | StrOutputParser()).with_config(tags=[self.GENERATION_TAG])
 
-    def answer_generator_node(self, state:AdaptiveRAGState):
+    def answer_generator_node(self, state:AdaptiveRAGState, config: Optional[RunnableConfig] = None):
         """Generate an answer based on the question and retrieved documents.
         
+        The answer is streamed token by token, so callers using the graph's
+        "messages" stream mode can display it while it is being generated.
+        
+        Args:
+            state: Dictionary containing question and documents
+            config: Run config of the request, carrying its LLM call counter
+            
+        Returns:
+            dict: Updated state with generated answer and the context it is based on
+        """
+        logger.info("---GENERATE ANSWER---")
+
+        question = state["question"]
+        documents = state["documents"]
+
+        context = self._format_docs(documents)
+        generation = "".join(self.rag_chain.stream({
+            "context": context, 
+            "question": question
+        }, config))
+        
+        return {
+            "documents": documents, 
+            "question": question, 
+            "generation": generation,
+            "context": context,
+            "generation_count": state.get("generation_count", 0) + 1,
+            "llm_calls": RequestBudget.llm_calls(state, config)
+        }
+
+    async def aanswer_generator_node(self, state:AdaptiveRAGState, config: Optional[RunnableConfig] = None):
+        """Asynchronously generate an answer based on the question and retrieved documents.
+        
         Args:
             state: Dictionary containing question and documents
+            config: Run config of the request, carrying its LLM call counter
             
         Returns:
-            dict: Updated state with generated answer
+            dict: Updated state with generated answer and the context it is based on
         """
-        print("---GENERATE ANSWER---")
+        logger.info("---GENERATE ANSWER---")
 
         question = state["question"]
         documents = state["documents"]
 
-        generation = self.rag_chain.invoke({
-            "context": self._format_docs(documents), 
+        context = self._format_docs(documents)
+        generation = "".join([token async for token in self.rag_chain.astream({
+            "context": context, 
             "question": question
-        })
+        }, config)])
         
         return {
             "documents": documents, 
             "question": question, 
-            "generation": generation
+            "generation": generation,
+            "context": context,
+            "generation_count": state.get("generation_count", 0) + 1,
+            "llm_calls": RequestBudget.llm_calls(state, config)
         }
\ No newline at end of file
@@ -0,0 +1,59 @@
+import logging
+from typing import Dict, Optional
+from langchain_core.runnables import RunnableConfig
+from src.AdaptiveRag.state.state import AdaptiveRAGState
+from src.AdaptiveRag.state.budget import RequestBudget
+
+logger = logging.getLogger(__name__)
+
+class BudgetExhaustedNode:
+    """Ends a request whose loop, LLM call or time budget is used up with the best answer so far.
+
+    The graph has one such node per loop it can stop: "regenerate", reached
+    when the latest answer is not grounded in the documents, and "rewrite",
+    reached when there is no relevant document or the grounded answer misses
+    the question. Each node reports the limit its edge hit, and an ungrounded
+    answer is never returned.
+    """
+
+    FALLBACK_ANSWER = (
+        "I could not find a reliable answer to this question within the allotted time. "
+        "Please try rephrasing it or adding more relevant sources."
+    )
+
+    def __init__(self, user_input: Dict[str, str], next_step: str = "rewrite"):
+        """Initialize the node with the request budget limits.
+
+        Args:
+            user_input: Dictionary containing user configuration
+            next_step: The step the budget did not allow, "regenerate" or "rewrite"
+        """
+        self.budget = RequestBudget(user_input)
+        self.next_step = next_step
+
+    def budget_exhausted_node(self, state: AdaptiveRAGState, config: Optional[RunnableConfig] = None):
+        """Stop gracefully, keeping the latest generation if it is grounded.
+
+        Args:
+            state: Current pipeline state
+            config: Run config of the request, carrying its LLM call counter
+
+        Returns:
+            dict: Updated state with the best available answer and the stop reason
+        """
+        # The same check the routing edge made for this step
+        stop_reason = self.budget.exhausted(state, config, next_step=self.next_step) or "budget exhausted"
+
+        if self.next_step == "regenerate":
+            logger.info(f"---STOPPING EARLY: {stop_reason.upper()}, ANSWER NOT GROUNDED, RETURNING FALLBACK ANSWER---")
+            generation = self.FALLBACK_ANSWER
+        else:
+            logger.info(f"---STOPPING EARLY: {stop_reason.upper()}, RETURNING BEST ANSWER SO FAR---")
+            # Questions are only rewritten after a grounded answer, so an existing generation is grounded
+            generation = state.get("generation") or self.FALLBACK_ANSWER
+
+        return {
+            "generation": generation,
+            "llm_calls": RequestBudget.llm_calls(state, config),
+            "stop_reason": stop_reason
+        }
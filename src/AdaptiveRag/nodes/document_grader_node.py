@@ -1,8 +1,15 @@
+import logging
 from pydantic import BaseModel, Field
-from typing import Literal, Dict, List
+from typing import Literal, Dict, List, Any, Optional
+from langchain.schema import Document
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
 from src.AdaptiveRag.llm import get_llm
+from src.AdaptiveRag.retriever import RELEVANCE_SCORE_KEY
 from src.AdaptiveRag.state.state import AdaptiveRAGState
+from src.AdaptiveRag.state.budget import RequestBudget
+
+logger = logging.getLogger(__name__)
 
 class GradeDocument(BaseModel):
     """Model for assigning a binary relevance score to retrieved documents."""
@@ -11,11 +18,27 @@ class GradeDocument(BaseModel):
         description="Document relevance: 'yes' (relevant) or 'no' (not relevant)."
     )
 
+class GradeDocuments(BaseModel):
+    """Model for assigning binary relevance scores to several retrieved documents in one call."""
+
+    binary_scores: List[str] = Field(
+        description="One relevance score per document, in the order the documents were given: "
+                    "'yes' (relevant) or 'no' (not relevant)."
+    )
+
 class DocumentGraderNode:
     """Evaluates and filters documents based on their relevance to a user question."""
     
     RELEVANT = "yes"
     NOT_RELEVANT = "no"
+
+    # Grading modes: one concurrent call per document, or all documents in a single call
+    PARALLEL = "parallel"
+    SINGLE_CALL = "single_call"
+
+    # Conservative defaults: only near-paraphrases are accepted and only clearly unrelated chunks rejected
+    DEFAULT_ACCEPT_THRESHOLD = 0.85
+    DEFAULT_REJECT_THRESHOLD = 0.2
     
     def __init__(self, user_input: Dict[str, str]):
         """Initialize the document grader with user input configuration.
@@ -23,11 +46,27 @@ class DocumentGraderNode:
         Args:
             user_input: Dictionary containing user configuration
         """
-        self.llm = get_llm(user_input=user_input)
+        self.llm = get_llm(user_input=user_input, use_cache=True)
         self.structured_llm_grader = self.llm.with_structured_output(GradeDocument)
+        self.structured_llm_batch_grader = self.llm.with_structured_output(GradeDocuments)
+        self.grading_mode = user_input.get("document_grading_mode", self.PARALLEL)
+        self.max_concurrency = int(user_input.get("grader_max_concurrency", 4))
+        # Cosine similarity thresholds above/below which documents skip the LLM grader, None or "" to always grade
+        self.accept_threshold = self._threshold(
+            user_input.get("grader_accept_threshold", self.DEFAULT_ACCEPT_THRESHOLD)
+        )
+        self.reject_threshold = self._threshold(
+            user_input.get("grader_reject_threshold", self.DEFAULT_REJECT_THRESHOLD)
+        )
         self.retrieval_grader = None
+        self.batch_retrieval_grader = None
         self._get_document_grader()
+        self._get_batch_document_grader()
     
+    @staticmethod
+    def _threshold(value: Any) -> Optional[float]:
+        return None if value is None or value == "" else float(value)
+
     def _get_document_grader(self):
         """Create and configure the document grading prompt template.
         
@@ -52,33 +91,238 @@ class DocumentGraderNode:
         ])
 
         self.retrieval_grader = grade_prompt | self.structured_llm_grader
+
+    def _get_batch_document_grader(self):
+        """Create the grading pipeline that evaluates all documents in a single call."""
+        system = """You are an expert grader evaluating the relevance of several retrieved documents to a user question.
+
+        Criteria for grading:
+        - If a document contains keywords, phrases, or semantic meaning related to the user question, classify it as relevant.
+        - The evaluation does not need to be overly strict; the primary goal is to filter out clearly incorrect retrievals.
+        - Grade every document independently and return exactly one binary score per document, in the given order:
+        - "yes" → Relevant to the question.
+        - "no" → Not relevant to the question."""
+
+        grade_prompt = ChatPromptTemplate.from_messages([
+            ("system", system),
+            ("human", "Evaluate the relevance of each of the following {count} documents: \n\n"
+                    "{documents}\n\n"
+                    "User Question: {question}\n\n"
+                    "Provide exactly {count} binary scores ('yes' or 'no'), one per document."),
+        ])
+
+        self.batch_retrieval_grader = grade_prompt | self.structured_llm_batch_grader
+
+    def _batch_grader_input(self, question: str, documents: List[Document]) -> Dict[str, Any]:
+        """Build the input of the single call grader, numbering the documents in order."""
+        return {
+            "question": question,
+            "count": len(documents),
+            "documents": "\n\n".join(
+                f"Document {i}:\n{doc.page_content}" for i, doc in enumerate(documents, start=1)
+            )
+        }
+
+    def _batch_grader_scores(self, result: Optional[GradeDocuments], documents: List[Document]) -> Optional[List[str]]:
+        """Extract the per-document scores of a single call result, or None if they don't match the documents."""
+        if result is not None and len(result.binary_scores) == len(documents):
+            return list(result.binary_scores)
+        logger.warning("---SINGLE CALL GRADING RETURNED A MISMATCHED RESULT, GRADING PER DOCUMENT---")
+        return None
+
+    def _score_documents(self, documents: List[Document]) -> List[Optional[str]]:
+        """Decide the documents whose similarity score is decisive without asking the LLM.
+
+        Scores are cosine similarities in [0, 1]. Documents scoring at least
+        the accept threshold are relevant, documents scoring below the reject
+        threshold are not. Documents without a score, such as web search
+        results and chunks found only by BM25 in hybrid mode, are always left
+        to the LLM grader.
+
+        Args:
+            documents: The retrieved documents
+
+        Returns:
+            List[Optional[str]]: One binary score per document, None for documents the LLM has to grade
+        """
+        scores = []
+        for doc in documents:
+            similarity = doc.metadata.get(RELEVANCE_SCORE_KEY)
+            if similarity is not None and self.accept_threshold is not None and similarity >= self.accept_threshold:
+                logger.info("---GRADE: DOCUMENT ACCEPTED BY SIMILARITY SCORE---")
+                scores.append(self.RELEVANT)
+            elif similarity is not None and self.reject_threshold is not None and similarity < self.reject_threshold:
+                logger.info("---GRADE: DOCUMENT REJECTED BY SIMILARITY SCORE---")
+                scores.append(self.NOT_RELEVANT)
+            else:
+                scores.append(None)
+        return scores
+
+    @staticmethod
+    def _merge_scores(scores: List[Optional[str]], llm_scores: List[str]) -> List[str]:
+        """Fill the undecided scores with the LLM grades, which are in the order of the undecided documents."""
+        llm_scores = iter(llm_scores)
+        return [next(llm_scores) if score is None else score for score in scores]
+
+    def _grade_documents(self,
+                         question: str,
+                         documents: List[Document],
+                         config: Optional[RunnableConfig] = None) -> List[str]:
+        """Grade the documents whose similarity score is not decisive with the LLM.
+
+        Args:
+            question: The user question
+            documents: The retrieved documents
+            config: Run config of the request, passed on to the grader calls
+
+        Returns:
+            List[str]: One binary score per document, in document order
+        """
+        scores = self._score_documents(documents)
+        undecided = [doc for doc, score in zip(documents, scores) if score is None]
+        return self._merge_scores(scores, self._llm_grade_documents(question, undecided, config) if undecided else [])
+
+    async def _agrade_documents(self,
+                                question: str,
+                                documents: List[Document],
+                                config: Optional[RunnableConfig] = None) -> List[str]:
+        """Asynchronously grade the documents whose similarity score is not decisive with the LLM.
+
+        Args:
+            question: The user question
+            documents: The retrieved documents
+            config: Run config of the request, passed on to the grader calls
+
+        Returns:
+            List[str]: One binary score per document, in document order
+        """
+        scores = self._score_documents(documents)
+        undecided = [doc for doc, score in zip(documents, scores) if score is None]
+        return self._merge_scores(scores, await self._allm_grade_documents(question, undecided, config) if undecided else [])
+
+    def _llm_grade_documents(self,
+                             question: str,
+                             documents: List[Document],
+                             config: Optional[RunnableConfig] = None) -> List[str]:
+        """Grade all documents concurrently, or in a single call if configured.
+
+        Args:
+            question: The user question
+            documents: The retrieved documents
+            config: Run config of the request, passed on to the grader calls
+
+        Returns:
+            List[str]: One binary score per document, in document order
+        """
+        if self.grading_mode == self.SINGLE_CALL and len(documents) > 1:
+            result = self.batch_retrieval_grader.invoke(self._batch_grader_input(question, documents), config)
+            scores = self._batch_grader_scores(result, documents)
+            if scores is not None:
+                return scores
+
+        scores = self.retrieval_grader.batch(
+            [{"question": question, "document": doc.page_content} for doc in documents],
+            config={**(config or {}), "max_concurrency": self.max_concurrency}
+        )
+        return [score.binary_score for score in scores]
+
+    async def _allm_grade_documents(self,
+                                    question: str,
+                                    documents: List[Document],
+                                    config: Optional[RunnableConfig] = None) -> List[str]:
+        """Asynchronously grade all documents concurrently, or in a single call if configured.
+
+        Args:
+            question: The user question
+            documents: The retrieved documents
+            config: Run config of the request, passed on to the grader calls
+
+        Returns:
+            List[str]: One binary score per document, in document order
+        """
+        if self.grading_mode == self.SINGLE_CALL and len(documents) > 1:
+            result = await self.batch_retrieval_grader.ainvoke(self._batch_grader_input(question, documents), config)
+            scores = self._batch_grader_scores(result, documents)
+            if scores is not None:
+                return scores
+
+        scores = await self.retrieval_grader.abatch(
+            [{"question": question, "document": doc.page_content} for doc in documents],
+            config={**(config or {}), "max_concurrency": self.max_concurrency}
+        )
+        return [score.binary_score for score in scores]
+
+    def _filter_documents(self, documents: List[Document], scores: List[str]) -> List[Document]:
+        """Keep the documents graded as relevant, in their original order.
+
+        Scores are normalized here for every grading path, so LLM answers
+        such as " Yes" or "NO" count like "yes" and "no". Documents with any
+        other score are dropped.
+
+        Args:
+            documents: The retrieved documents
+            scores: One binary score per document
+
+        Returns:
+            List[Document]: The relevant documents
+        """
+        filtered_docs = []
+        for doc, score in zip(documents, scores):
+            score = (score or "").strip().lower()
+            if score == self.RELEVANT:
+                logger.info("---GRADE: DOCUMENT RELEVANT---")
+                filtered_docs.append(doc)
+            elif score == self.NOT_RELEVANT:
+                logger.info("---GRADE: DOCUMENT NOT RELEVANT---")
+            else:
+                logger.warning(f"---GRADE: UNRECOGNIZED SCORE {score!r}, DOCUMENT DROPPED---")
+
+        return filtered_docs
     
-    def document_grader_node(self, state:AdaptiveRAGState):
+    def document_grader_node(self, state:AdaptiveRAGState, config: Optional[RunnableConfig] = None):
         """Filter documents based on their relevance to the question.
         
         Args:
             state: Dictionary containing the current state with question and documents
+            config: Run config of the request, carrying its LLM call counter
             
         Returns:
             dict: Updated state with filtered documents
         """
-        print("---CHECK DOCUMENT RELEVANCE TO QUESTION---")
+        logger.info("---CHECK DOCUMENT RELEVANCE TO QUESTION---")
 
         question = state["question"]
         documents = state["documents"]  # List[Document]
 
-        # Score each document and filter based on relevance
-        filtered_docs = []
-        for doc in documents:
-            score = self.retrieval_grader.invoke({
-                "question": question, 
-                "document": doc.page_content
-            })
+        # Score the documents and filter based on relevance, keeping their order
+        filtered_docs = self._filter_documents(documents, self._grade_documents(question, documents, config))
             
-            if score.binary_score == self.RELEVANT:
-                print("---GRADE: DOCUMENT RELEVANT---")
-                filtered_docs.append(doc)
-            elif score.binary_score == self.NOT_RELEVANT:
-                print("---GRADE: DOCUMENT NOT RELEVANT---")
+        return {
+            "documents": filtered_docs,
+            "question": question,
+            "llm_calls": RequestBudget.llm_calls(state, config)
+        }
+
+    async def adocument_grader_node(self, state:AdaptiveRAGState, config: Optional[RunnableConfig] = None):
+        """Asynchronously filter documents based on their relevance to the question.
+        
+        Args:
+            state: Dictionary containing the current state with question and documents
+            config: Run config of the request, carrying its LLM call counter
+            
+        Returns:
+            dict: Updated state with filtered documents
+        """
+        logger.info("---CHECK DOCUMENT RELEVANCE TO QUESTION---")
+
+        question = state["question"]
+        documents = state["documents"]  # List[Document]
+
+        # Score the documents and filter based on relevance, keeping their order
+        filtered_docs = self._filter_documents(documents, await self._agrade_documents(question, documents, config))
             
-        return {"documents": filtered_docs, "question": question}
\ No newline at end of file
+        return {
+            "documents": filtered_docs,
+            "question": question,
+            "llm_calls": RequestBudget.llm_calls(state, config)
+        }
\ No newline at end of file
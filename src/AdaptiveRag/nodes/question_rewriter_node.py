@@ -1,8 +1,13 @@
-from typing import Dict
+import logging
+from typing import Dict, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableConfig
 from src.AdaptiveRag.llm import get_llm
 from src.AdaptiveRag.state.state import AdaptiveRAGState
+from src.AdaptiveRag.state.budget import RequestBudget
+
+logger = logging.getLogger(__name__)
 
 class QuestionRewriterNode:
     """Optimizes user questions to improve vector database retrieval accuracy."""
@@ -40,20 +45,48 @@ class QuestionRewriterNode:
 
         self.question_rewriter = rewrite_prompt | self.llm | StrOutputParser()
     
-    def question_rewriter_node(self, state:AdaptiveRAGState):
+    def question_rewriter_node(self, state:AdaptiveRAGState, config: Optional[RunnableConfig] = None):
         """Rewrite the user question to optimize it for vector retrieval.
         
         Args:
             state: Dictionary containing the current state with the original question
+            config: Run config of the request, carrying its LLM call counter
+            
+        Returns:
+            dict: Updated state with optimized question
+        """
+        logger.info("---TRANSFORM QUERY FOR BETTER RETRIEVAL---")
+
+        original_question = state["question"]
+        better_question = self.question_rewriter.invoke({"question": original_question}, config)
+        
+        return {
+            'question': better_question,
+            'rewrite_count': state.get("rewrite_count", 0) + 1,
+            # Regenerations are budgeted per question
+            'generation_count': 0,
+            'llm_calls': RequestBudget.llm_calls(state, config)
+        }
+
+    async def aquestion_rewriter_node(self, state:AdaptiveRAGState, config: Optional[RunnableConfig] = None):
+        """Asynchronously rewrite the user question to optimize it for vector retrieval.
+        
+        Args:
+            state: Dictionary containing the current state with the original question
+            config: Run config of the request, carrying its LLM call counter
             
         Returns:
             dict: Updated state with optimized question
         """
-        print("---TRANSFORM QUERY FOR BETTER RETRIEVAL---")
+        logger.info("---TRANSFORM QUERY FOR BETTER RETRIEVAL---")
 
         original_question = state["question"]
-        better_question = self.question_rewriter.invoke({"question": original_question})
+        better_question = await self.question_rewriter.ainvoke({"question": original_question}, config)
         
         return {
-            'question': better_question
+            'question': better_question,
+            'rewrite_count': state.get("rewrite_count", 0) + 1,
+            # Regenerations are budgeted per question
+            'generation_count': 0,
+            'llm_calls': RequestBudget.llm_calls(state, config)
         }
\ No newline at end of file
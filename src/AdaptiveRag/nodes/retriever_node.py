@@ -1,33 +1,43 @@
-from typing import Dict, List
-import streamlit as st
+import logging
+from typing import Dict, List, Optional
 from src.AdaptiveRag.retriever import Retriever
 from langchain.schema import Document
 from src.AdaptiveRag.state.state import AdaptiveRAGState
 
+logger = logging.getLogger(__name__)
+
 class RetrieverNode:
     """Retrieves relevant documents based on a user question."""
     
-    def __init__(self, user_input: Dict[str, str]):
+    def __init__(self, user_input: Dict[str, str], retriever: Optional[Retriever] = None):
         """Initialize the retriever node with user input configuration.
         
         Args:
             user_input: Dictionary containing user configuration
+            retriever: An existing retriever to reuse, e.g. one kept across Streamlit reruns
         """
-        self._initialize_retriever(user_input)
+        self._initialize_retriever(user_input, retriever)
     
-    def _initialize_retriever(self, user_input: Dict[str, str]):
-        """Initialize or retrieve the retriever from session state.
+    def _initialize_retriever(self, user_input: Dict[str, str], retriever: Optional[Retriever] = None):
+        """Initialize the retriever or reuse the given one.
         
-        Creates a new retriever if one doesn't exist in the session state,
-        otherwise uses the existing one for consistency across reruns.
+        Creates a new retriever if none is given, otherwise uses the existing
+        one for consistency across requests and brings it in line with the
+        current URL list. With "background_indexing" set, the index is built in
+        the background and questions are answered from the chunks indexed so far.
         
         Args:
             user_input: Dictionary containing user configuration
+            retriever: An existing retriever to reuse, optional
         """
-        if "retriever" not in st.session_state:
-            st.session_state["retriever"] = Retriever(user_input).get_retriever()
+        wait = not user_input.get("background_indexing", False)
+        if retriever is None:
+            retriever = Retriever(user_input)
+            retriever.get_retriever(wait=wait)
+        else:
+            retriever.update_urls(user_input.get("urls", []), wait=wait)
         
-        self.retriever = st.session_state["retriever"]
+        self.retriever = retriever
     
     def retriever_node(self, state:AdaptiveRAGState):
         """Retrieve documents relevant to the question.
@@ -38,11 +48,30 @@ class RetrieverNode:
         Returns:
             dict: Updated state with retrieved documents
         """
-        print("---RETRIEVE DOCUMENTS---")
+        logger.info("---RETRIEVE DOCUMENTS---")
 
         question = state["question"]
         documents = self.retriever.invoke(question)
         
+        return {
+            "documents": documents, 
+            "question": question
+        }
+
+    async def aretriever_node(self, state:AdaptiveRAGState):
+        """Asynchronously retrieve documents relevant to the question.
+        
+        Args:
+            state: Dictionary containing the current state with the question
+            
+        Returns:
+            dict: Updated state with retrieved documents
+        """
+        logger.info("---RETRIEVE DOCUMENTS---")
+
+        question = state["question"]
+        documents = await self.retriever.ainvoke(question)
+        
         return {
             "documents": documents, 
             "question": question
@@ -1,17 +1,36 @@
-from typing import Dict, List
+import logging
+from typing import Any, Dict, List, Optional
 from langchain.schema import Document
 from src.AdaptiveRag.tools import get_tool_mananger
+from src.AdaptiveRag.tools.tool_manager import ToolManager
+from src.AdaptiveRag.cache import get_web_search_cache
 from src.AdaptiveRag.state.state import AdaptiveRAGState
 
+logger = logging.getLogger(__name__)
+
 class WebSearchNode:
     """Performs web searches and formats results as Document objects for the RAG pipeline."""
     
-    def __init__(self):
-        """Initialize the web search node with the web search tool."""
-        self.web_search_tool = get_tool_mananger().get_tool("web_search")
+    # Tool settings that change the results and are therefore part of the cache key
+    SEARCH_PARAMS = ["max_results", "search_depth", "include_domains", "exclude_domains", "include_raw_content"]
+    
+    def __init__(self, user_input: Optional[Dict[str, Any]] = None, tool_manager: Optional[ToolManager] = None):
+        """Initialize the web search node with the web search tool.
+        
+        Args:
+            user_input: Dictionary containing user configuration
+            tool_manager: Tool manager providing the "web_search" tool, the default Tavily tools if omitted
+        """
+        self.web_search_tool = (tool_manager or get_tool_mananger()).get_tool("web_search")
         
         if self.web_search_tool is None:
             raise ValueError("Web search tool not found. Please ensure it's properly registered.")
+
+        self.web_search_cache = get_web_search_cache(user_input or {})
+        self.search_params = {"tool": type(self.web_search_tool).__name__}
+        for param in self.SEARCH_PARAMS:
+            if getattr(self.web_search_tool, param, None) is not None:
+                self.search_params[param] = getattr(self.web_search_tool, param)
     
     def web_search_node(self, state: AdaptiveRAGState):
         """Execute a web search based on the user question.
@@ -22,11 +41,43 @@ class WebSearchNode:
         Returns:
             dict: Updated state with search results as documents
         """
-        print("---PERFORMING WEB SEARCH---")
+        logger.info("---PERFORMING WEB SEARCH---")
+
+        question = state["question"]
+        
+        if self.web_search_cache is not None:
+            search_results = self.web_search_cache.search(
+                question, lambda: self.web_search_tool.invoke({"query": question}), params=self.search_params
+            )
+        else:
+            search_results = self.web_search_tool.invoke({"query": question})
+        
+        documents = [Document(page_content=doc["content"]) for doc in search_results]
+
+        return {
+            "documents": documents,
+            "question": question
+        }
+
+    async def aweb_search_node(self, state: AdaptiveRAGState):
+        """Asynchronously execute a web search based on the user question.
+        
+        Args:
+            state: Dictionary containing the current state with the question
+            
+        Returns:
+            dict: Updated state with search results as documents
+        """
+        logger.info("---PERFORMING WEB SEARCH---")
 
         question = state["question"]
         
-        search_results = self.web_search_tool.invoke({"query": question})
+        if self.web_search_cache is not None:
+            search_results = await self.web_search_cache.asearch(
+                question, lambda: self.web_search_tool.ainvoke({"query": question}), params=self.search_params
+            )
+        else:
+            search_results = await self.web_search_tool.ainvoke({"query": question})
         
         documents = [Document(page_content=doc["content"]) for doc in search_results]
 
@@ -0,0 +1,7 @@
+from src.AdaptiveRag.progress.reporter import (
+    ProgressReporter,
+    QueuedProgressReporter,
+    configure_logging,
+    get_reporter,
+    set_reporter
+)
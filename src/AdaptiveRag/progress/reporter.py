@@ -0,0 +1,252 @@
+import sys
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressStatus:
+    """Handle of a running status block, mirroring the parts of ``st.status`` the pipeline uses."""
+
+    def __init__(self, label: str):
+        self.label = label
+
+    def update(self, label: Optional[str] = None, state: Optional[str] = None, expanded: Optional[bool] = None) -> None:
+        """Update the status block, e.g. once the work it tracks is complete.
+
+        Args:
+            label: New label of the block
+            state: "running", "complete" or "error"
+            expanded: Whether the block is shown expanded (ignored outside a UI)
+        """
+        if label:
+            self.label = label
+            logger.info(f"---{label.upper()}---")
+
+
+class ProgressReporter:
+    """Reports pipeline progress, warnings and errors to the log.
+
+    The retriever, the LLM providers and the graph builder report through
+    the process-wide reporter returned by ``get_reporter`` instead of
+    importing a UI framework, so they also run headless (API server, batch
+    jobs). The Streamlit app installs a reporter rendering into the page.
+    """
+
+    # Whether the reporter may be called from any thread; UI reporters may only be called from the UI thread
+    thread_safe = True
+
+    def write(self, message: str) -> None:
+        """Report a progress message."""
+        logger.info(f"---{message}---")
+
+    def info(self, message: str) -> None:
+        """Report an informational message."""
+        logger.info(f"---INFO: {message}---")
+
+    def warning(self, message: str) -> None:
+        """Report a recoverable problem."""
+        logger.warning(f"---WARNING: {message}---")
+
+    def error(self, message: str) -> None:
+        """Report an error."""
+        logger.error(f"---ERROR: {message}---")
+
+    def open_status(self, label: str, expanded: bool = True) -> ProgressStatus:
+        """Show a status block that stays open until its state is set to "complete" or "error".
+
+        Unlike ``status``, the block doesn't group the messages reported after it.
+
+        Args:
+            label: Label of the step
+            expanded: Whether the block is shown expanded (ignored outside a UI)
+
+        Returns:
+            ProgressStatus: Handle to update the label and state of the block
+        """
+        logger.info(f"---{label.upper()}---")
+        return ProgressStatus(label)
+
+    @contextmanager
+    def status(self, label: str, expanded: bool = True) -> Iterator[ProgressStatus]:
+        """Group the progress messages of a longer running step.
+
+        Args:
+            label: Label of the step
+            expanded: Whether the block is shown expanded (ignored outside a UI)
+
+        Yields:
+            ProgressStatus: Handle to update the label and state of the block
+        """
+        yield self.open_status(label, expanded=expanded)
+
+
+class QueuedProgressStatus(ProgressStatus):
+    """Status handle of a ``QueuedProgressReporter``, keeping only its latest update until it is replayed."""
+
+    def __init__(self, reporter: "QueuedProgressReporter", label: str, expanded: bool):
+        super().__init__(label)
+        self.reporter = reporter
+        self.state: Optional[str] = None
+        self.expanded = expanded
+        # Whether an update is queued and not replayed yet, guarded by the reporter's lock
+        self.pending = False
+
+    def update(self, label: Optional[str] = None, state: Optional[str] = None, expanded: Optional[bool] = None) -> None:
+        self.reporter.update_status(self, label=label, state=state, expanded=expanded)
+
+
+class QueuedProgressReporter(ProgressReporter):
+    """Queues progress reported from worker threads until the UI thread renders it.
+
+    Reporters such as Streamlit's may only be called from the thread running
+    the script. Work running in the background reports through this reporter
+    instead, from any thread, and the owning thread replays the queued
+    messages into the wrapped reporter with ``drain``. Status blocks are
+    replayed as status blocks of the wrapped reporter; updates made between
+    two drains are collapsed, so a block shows the latest label instead of
+    one message per update.
+    """
+
+    # States after which a status block is not updated anymore
+    FINAL_STATES = ("complete", "error")
+
+    def __init__(self, target: ProgressReporter):
+        """Initialize the reporter.
+
+        Args:
+            target: Reporter the queued messages are replayed into
+        """
+        self.target = target
+        self._events: "queue.SimpleQueue[Tuple[str, object]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        # Blocks of the wrapped reporter showing the statuses that are still open
+        self._blocks: Dict[QueuedProgressStatus, ProgressStatus] = {}
+
+    def write(self, message: str) -> None:
+        self._events.put(("write", message))
+
+    def info(self, message: str) -> None:
+        self._events.put(("info", message))
+
+    def warning(self, message: str) -> None:
+        self._events.put(("warning", message))
+
+    def error(self, message: str) -> None:
+        self._events.put(("error", message))
+
+    def open_status(self, label: str, expanded: bool = True) -> ProgressStatus:
+        status = QueuedProgressStatus(self, label, expanded)
+        self._events.put(("open_status", status))
+        return status
+
+    def update_status(self,
+                      status: QueuedProgressStatus,
+                      label: Optional[str] = None,
+                      state: Optional[str] = None,
+                      expanded: Optional[bool] = None) -> None:
+        """Record the latest label and state of a status, queueing at most one update per status.
+
+        Updates after the status reached a final state are ignored.
+
+        Args:
+            status: The updated status
+            label: New label of the block
+            state: "running", "complete" or "error"
+            expanded: Whether the block is shown expanded
+        """
+        with self._lock:
+            if status.state in self.FINAL_STATES:
+                return
+            status.label = label or status.label
+            status.state = state or status.state
+            if expanded is not None:
+                status.expanded = expanded
+            if status.pending:
+                return
+            status.pending = True
+        self._events.put(("update_status", status))
+
+    def reopen(self) -> None:
+        """Show the statuses that are still open in new blocks at the next drain.
+
+        Call from the thread owning the wrapped reporter when the blocks shown
+        so far are gone, e.g. on a Streamlit rerun.
+        """
+        statuses = list(self._blocks)
+        self._blocks.clear()
+        for status in statuses:
+            self._events.put(("open_status", status))
+
+    def _replay_status(self, event: str, status: QueuedProgressStatus) -> bool:
+        """Show the latest label and state of a status in its block, opening it if needed."""
+        with self._lock:
+            status.pending = False
+            label, state, expanded = status.label, status.state, status.expanded
+
+        block = self._blocks.get(status)
+        if block is None:
+            # Updates of a closed block, or of one reopened further down the queue, have nothing to show
+            if event != "open_status":
+                return False
+            block = self.target.open_status(label, expanded=expanded)
+            if state:
+                block.update(state=state, expanded=expanded)
+        else:
+            block.update(label=label, state=state, expanded=expanded)
+
+        if state in self.FINAL_STATES:
+            self._blocks.pop(status, None)
+        else:
+            self._blocks[status] = block
+        return True
+
+    def drain(self) -> int:
+        """Replay the queued messages into the wrapped reporter; call from the thread owning it.
+
+        Returns:
+            int: Number of messages and status updates replayed
+        """
+        replayed = 0
+        while True:
+            try:
+                event, item = self._events.get_nowait()
+            except queue.Empty:
+                return replayed
+            if event in ("open_status", "update_status"):
+                replayed += self._replay_status(event, item)
+            else:
+                getattr(self.target, event)(item)
+                replayed += 1
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Send the pipeline's log messages to stderr, keeping stdout free for the output of the scripts.
+
+    Does nothing if logging is already configured, e.g. by the ASGI server.
+
+    Args:
+        level: Minimum level of the messages shown
+    """
+    logging.basicConfig(level=level, format="%(message)s", stream=sys.stderr)
+
+
+_reporter: ProgressReporter = ProgressReporter()
+
+
+def get_reporter() -> ProgressReporter:
+    """Return the process-wide progress reporter."""
+    return _reporter
+
+
+def set_reporter(reporter: ProgressReporter) -> None:
+    """Install the process-wide progress reporter.
+
+    Args:
+        reporter: The reporter used from now on
+    """
+    global _reporter
+    _reporter = reporter
@@ -1 +1,2 @@
-from src.AdaptiveRag.retriever.retriever import Retriever
\ No newline at end of file
+from src.AdaptiveRag.retriever.retriever import Retriever
+from src.AdaptiveRag.retriever.scoring import RELEVANCE_SCORE_KEY
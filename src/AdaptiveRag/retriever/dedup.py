@@ -0,0 +1,162 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain.schema import Document
+
+WORD = re.compile(r"\w+")
+# Prime just above 2**32, so the permuted 32-bit shingle hashes never overflow 64 bits
+PRIME = np.uint64(4294967311)
+
+
+class MinHashDeduplicator:
+    """Removes near-duplicate chunks using MinHash signatures and locality-sensitive hashing.
+
+    Every chunk is reduced to the set of its word shingles and summarized by
+    a MinHash signature, whose agreement with another chunk's signature
+    estimates the Jaccard similarity of their shingle sets. Signatures are
+    split into bands and hashed into buckets so only chunks sharing a bucket
+    are compared. Chunks are processed in order and the first chunk of every
+    cluster is kept as its representative; the sources of the chunks dropped
+    in its favor are recorded in its ``duplicate_sources`` metadata.
+    """
+
+    DUPLICATE_SOURCES_KEY = "duplicate_sources"
+    DUPLICATE_COUNT_KEY = "duplicate_count"
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128, bands: int = 32, shingle_size: int = 5, seed: int = 1):
+        """Initialize the deduplicator.
+
+        Args:
+            threshold: Estimated Jaccard similarity from which two chunks are duplicates
+            num_perm: Number of hash permutations of a MinHash signature
+            bands: Number of LSH bands, must divide num_perm; more bands find more candidates
+            shingle_size: Number of words per shingle
+            seed: Seed of the hash permutations
+
+        Raises:
+            ValueError: If the number of bands doesn't divide the number of permutations
+        """
+        if num_perm % bands:
+            raise ValueError(f"The number of bands ({bands}) must divide the number of permutations ({num_perm})")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = max(1, shingle_size)
+
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        words = WORD.findall(text.lower())
+        shingles = {
+            " ".join(words[i:i + self.shingle_size])
+            for i in range(max(1, len(words) - self.shingle_size + 1))
+        }
+        return np.array([zlib.crc32(shingle.encode("utf-8")) for shingle in shingles], dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a text.
+
+        Args:
+            text: The text
+
+        Returns:
+            np.ndarray: One minimum permuted shingle hash per permutation
+        """
+        hashes = self._shingle_hashes(text)
+        permuted = (np.outer(hashes, self.a) + self.b) % PRIME
+        return permuted.min(axis=0)
+
+    @staticmethod
+    def has_words(text: str) -> bool:
+        """Whether a chunk has any content worth indexing."""
+        return WORD.search(text) is not None
+
+    def band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        """Get the LSH bucket keys of a signature, one per band."""
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def annotate(self, doc: Document, sources: List[str]) -> Document:
+        """Copy a representative with the sources of the chunks dropped in its favor in its metadata."""
+        return Document(
+            page_content=doc.page_content,
+            metadata={
+                **doc.metadata,
+                self.DUPLICATE_SOURCES_KEY: list(dict.fromkeys(sources)),
+                self.DUPLICATE_COUNT_KEY: len(sources)
+            }
+        )
+
+    def deduplicate(self, documents: List[Document]) -> List[Document]:
+        """Keep one representative per cluster of near-duplicate documents.
+
+        Representatives are copied before their metadata is extended, and the
+        documents keep their original order.
+
+        Args:
+            documents: The chunks to deduplicate
+
+        Returns:
+            List[Document]: The representatives
+        """
+        clusters = NearDuplicateIndex(self)
+        kept: List[Document] = []
+        duplicate_sources: Dict[int, List[str]] = defaultdict(list)
+
+        for doc in documents:
+            if not self.has_words(doc.page_content):
+                continue
+
+            representative = clusters.find_or_add(doc.page_content)
+            if representative is not None:
+                duplicate_sources[representative].append(doc.metadata.get("source", ""))
+                continue
+            kept.append(doc)
+
+        for position, sources in duplicate_sources.items():
+            kept[position] = self.annotate(kept[position], sources)
+
+        return kept
+
+
+class NearDuplicateIndex:
+    """Incrementally clusters texts, for deduplicating chunks as they stream in."""
+
+    def __init__(self, deduplicator: MinHashDeduplicator):
+        """Initialize an empty index.
+
+        Args:
+            deduplicator: Deduplicator providing the signatures and the threshold
+        """
+        self.deduplicator = deduplicator
+        self.buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+        self.signatures: List[np.ndarray] = []
+
+    def find_or_add(self, text: str) -> Optional[int]:
+        """Find the representative a text duplicates, or make the text a new representative.
+
+        Args:
+            text: The text
+
+        Returns:
+            Optional[int]: Position of the duplicated representative in the order
+            representatives were added, None if the text was added as a new one
+        """
+        signature = self.deduplicator.signature(text)
+        keys = self.deduplicator.band_keys(signature)
+        candidates = dict.fromkeys(position for key in keys for position in self.buckets.get(key, []))
+
+        for position in candidates:
+            if np.mean(self.signatures[position] == signature) >= self.deduplicator.threshold:
+                return position
+
+        for key in keys:
+            self.buckets[key].append(len(self.signatures))
+        self.signatures.append(signature)
+        return None
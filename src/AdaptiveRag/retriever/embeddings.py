@@ -0,0 +1,135 @@
+import os
+import asyncio
+from typing import Dict, List, Any, Type
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+DEFAULT_CACHE_DIR = os.path.join(os.getenv("ADAPTIVE_RAG_CACHE_DIR", ".cache/adaptive_rag"), "embeddings")
+
+EMBEDDING_PROVIDERS: Dict[str, Type[Embeddings]] = {
+    "OpenAI": OpenAIEmbeddings
+}
+
+
+class BatchedEmbeddings(Embeddings):
+    """Splits document embedding into fixed-size batches sent to the provider concurrently."""
+
+    def __init__(self, embeddings: Embeddings, batch_size: int = 256, max_concurrency: int = 4):
+        """Initialize the batched embeddings wrapper.
+
+        Args:
+            embeddings: The provider embedding model
+            batch_size: Number of texts per provider call
+            max_concurrency: Maximum number of provider calls in flight
+        """
+        self.embeddings = embeddings
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        return [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, keeping the order of the input texts.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            List[List[float]]: One embedding per text
+        """
+        batches = self._batches(texts)
+        if len(batches) <= 1 or self.max_concurrency == 1:
+            return [vector for batch in batches for vector in self.embeddings.embed_documents(batch)]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+            results = executor.map(self.embeddings.embed_documents, batches)
+            return [vector for batch_vectors in results for vector in batch_vectors]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed documents, keeping the order of the input texts.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            List[List[float]]: One embedding per text
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self.embeddings.aembed_documents(batch)
+
+        results = await asyncio.gather(*(embed_batch(batch) for batch in self._batches(texts)))
+        return [vector for batch_vectors in results for vector in batch_vectors]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embeddings.aembed_query(text)
+
+
+def embedding_model_name(embeddings: Embeddings) -> str:
+    """Get the model name of a possibly wrapped embedding model.
+
+    Args:
+        embeddings: An embedding model, optionally wrapped in caching or batching layers
+
+    Returns:
+        str: The model name of the innermost embedding model
+    """
+    while True:
+        model = getattr(embeddings, "model", None)
+        if isinstance(model, str):
+            return model
+
+        inner = getattr(embeddings, "underlying_embeddings", None) or getattr(embeddings, "embeddings", None)
+        if inner is None:
+            return type(embeddings).__name__
+        embeddings = inner
+
+
+def get_embeddings(user_input: Dict[str, Any]) -> Embeddings:
+    """Create the embedding model used for indexing and querying.
+
+    Document embeddings are cached on disk, keyed by a hash of the model name
+    and the chunk text, so only texts that were never embedded before are sent
+    to the provider. Cache misses are embedded in concurrent batches.
+
+    Args:
+        user_input: Dictionary containing user configuration
+
+    Returns:
+        Embeddings: The configured embedding model
+
+    Raises:
+        ValueError: If the embedding provider is not supported
+    """
+    provider = user_input.get("embedding_provider", "OpenAI")
+    embeddings_class = EMBEDDING_PROVIDERS.get(provider)
+    if embeddings_class is None:
+        raise ValueError(f"Unsupported embedding provider: {provider}")
+
+    model_kwargs = {"model": user_input["embedding_model"]} if user_input.get("embedding_model") else {}
+    provider_embeddings = embeddings_class(**model_kwargs)
+
+    batch_size = int(user_input.get("embedding_batch_size", 256))
+    max_concurrency = int(user_input.get("embedding_max_concurrency", 4))
+    embeddings = BatchedEmbeddings(provider_embeddings, batch_size=batch_size, max_concurrency=max_concurrency)
+
+    if not user_input.get("embedding_cache", True):
+        return embeddings
+
+    return CacheBackedEmbeddings.from_bytes_store(
+        embeddings,
+        LocalFileStore(user_input.get("embedding_cache_dir", DEFAULT_CACHE_DIR)),
+        namespace=embedding_model_name(provider_embeddings),
+        batch_size=batch_size * max_concurrency,
+        key_encoder="sha256"
+    )
@@ -0,0 +1,71 @@
+import re
+from typing import List, Sequence
+from langchain.schema import Document
+from langchain.retrievers import EnsembleRetriever
+from langchain_community.retrievers import BM25Retriever
+from langchain_community.vectorstores import FAISS
+from langchain_core.runnables import Runnable, RunnableLambda
+from src.AdaptiveRag.retriever.scoring import create_scored_retriever
+
+# Identifiers such as "faiss.IndexFlatL2", "ERR_CONNECTION_RESET" or "HTTP-404" stay whole
+COMPOUND_TOKEN = re.compile(r"\w+(?:[.\-/:]\w+)+")
+WORD_TOKEN = re.compile(r"\w+")
+
+
+def bm25_tokenize(text: str) -> List[str]:
+    """Tokenize text for the lexical index.
+
+    Compound identifiers are indexed both whole and split into their parts,
+    so exact-term queries match them exactly while partial ones still do.
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        List[str]: Lower-cased tokens
+    """
+    text = text.lower()
+    return WORD_TOKEN.findall(text) + COMPOUND_TOKEN.findall(text)
+
+
+def vector_store_documents(vector_store: FAISS) -> List[Document]:
+    """Return all chunks stored in a FAISS vector store, in index order."""
+    docstore = getattr(vector_store.docstore, "_dict", {})
+    return [docstore[doc_id] for doc_id in vector_store.index_to_docstore_id.values() if doc_id in docstore]
+
+
+def create_hybrid_retriever(vector_store: FAISS,
+                            top_k: int = 4,
+                            weights: Sequence[float] = (0.5, 0.5),
+                            rrf_k: int = 60,
+                            fetch_k: int = 0) -> Runnable:
+    """Create a retriever fusing dense FAISS and lexical BM25 results with reciprocal rank fusion.
+
+    The BM25 index is built from the chunks in the vector store, so it always
+    covers exactly what the dense index covers. Chunks found by the dense
+    search keep their similarity score in their metadata; chunks found only
+    by BM25 carry no score, so the document grader always sends them to the LLM.
+
+    Args:
+        vector_store: The FAISS vector store
+        top_k: Number of documents returned after fusion
+        weights: Weights of the dense and the BM25 ranking in the fusion
+        rrf_k: Rank constant of reciprocal rank fusion
+        fetch_k: Number of candidates taken from each ranking, defaults to twice top_k
+
+    Returns:
+        Runnable: Retriever returning the top_k fused documents for a question
+    """
+    fetch_k = fetch_k or 2 * top_k
+    documents = vector_store_documents(vector_store)
+
+    dense_retriever = create_scored_retriever(vector_store, top_k=fetch_k)
+    if not documents:
+        return dense_retriever | RunnableLambda(lambda docs: docs[:top_k])
+
+    bm25_retriever = BM25Retriever.from_documents(documents, k=fetch_k, preprocess_func=bm25_tokenize)
+    ensemble_retriever = EnsembleRetriever(
+        retrievers=[dense_retriever, bm25_retriever], weights=list(weights), c=rrf_k
+    )
+
+    return ensemble_retriever | RunnableLambda(lambda docs: docs[:top_k])
@@ -0,0 +1,195 @@
+import math
+from typing import List, Optional
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivf", "hnsw", "ivfpq")
+
+
+class IndexFactory:
+    """Builds FAISS indexes of the configured type, trained on a sample of the corpus.
+
+    All index types use the L2 metric of the flat index LangChain builds by
+    default, so relevance scores stay comparable between them. With
+    ``index_type="auto"`` the type is picked from the number of vectors:
+    exact search for small corpora, inverted lists for medium ones and
+    product-quantized inverted lists once the raw vectors get large.
+
+    HNSW graphs cannot remove vectors, and the inverted-list indexes keep their
+    original ids on removal, which breaks the positional id mapping of the
+    LangChain vector store. Only flat indexes therefore support incremental
+    removal; other types are rebuilt when sources are removed.
+    """
+
+    def __init__(self,
+                 index_type: str = "auto",
+                 nprobe: int = 16,
+                 ef_search: int = 64,
+                 hnsw_m: int = 32,
+                 train_size: int = 50000,
+                 ivf_threshold: int = 20000,
+                 ivfpq_threshold: int = 500000):
+        """Initialize the index factory.
+
+        Args:
+            index_type: One of "flat", "ivf", "hnsw", "ivfpq" or "auto"
+            nprobe: Number of inverted lists visited per query by IVF indexes
+            ef_search: Size of the candidate list explored per query by HNSW indexes
+            hnsw_m: Number of neighbors per node of HNSW graphs
+            train_size: Maximum number of vectors used to train IVF indexes
+            ivf_threshold: Number of vectors from which "auto" uses an IVF index
+            ivfpq_threshold: Number of vectors from which "auto" uses an IVF-PQ index
+
+        Raises:
+            ValueError: If the index type is unknown
+        """
+        if index_type != "auto" and index_type not in INDEX_TYPES:
+            raise ValueError(f"Unsupported index type: {index_type}")
+
+        self.index_type = index_type
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.hnsw_m = hnsw_m
+        self.train_size = train_size
+        self.ivf_threshold = ivf_threshold
+        self.ivfpq_threshold = ivfpq_threshold
+
+    def select_type(self, num_vectors: int) -> str:
+        """Get the index type used for a corpus of the given size.
+
+        Args:
+            num_vectors: Number of vectors to index
+
+        Returns:
+            str: The configured type, or the one picked by corpus size for "auto"
+        """
+        if self.index_type != "auto":
+            return self.index_type
+        if num_vectors >= self.ivfpq_threshold:
+            return "ivfpq"
+        if num_vectors >= self.ivf_threshold:
+            return "ivf"
+        return "flat"
+
+    @staticmethod
+    def _nlist(num_vectors: int) -> int:
+        # The usual 4 * sqrt(n) lists, with enough training points (~39 per list) to train them
+        return max(1, min(int(4 * math.sqrt(num_vectors)), num_vectors // 39))
+
+    @staticmethod
+    def _pq_subquantizers(dimension: int) -> int:
+        # Largest sub-quantizer count dividing the dimension with at least 4 dimensions per code
+        for m in (64, 48, 32, 24, 16, 12, 8, 4, 2):
+            if dimension % m == 0 and dimension // m >= 4:
+                return m
+        return 1
+
+    def _sample(self, vectors: np.ndarray) -> np.ndarray:
+        if len(vectors) <= self.train_size:
+            return vectors
+        positions = np.random.default_rng(0).choice(len(vectors), size=self.train_size, replace=False)
+        return vectors[np.sort(positions)]
+
+    def build(self, vectors: np.ndarray, index_type: Optional[str] = None) -> faiss.Index:
+        """Create and, if needed, train an empty index for the given vectors.
+
+        The vectors are only used for training; adding them is left to the
+        vector store so it can record their docstore ids.
+
+        Args:
+            vectors: The vectors that will be indexed, as a float32 matrix
+            index_type: Index type overriding the configured one
+
+        Returns:
+            faiss.Index: The trained, empty index
+        """
+        num_vectors, dimension = vectors.shape
+        index_type = index_type or self.select_type(num_vectors)
+        nlist = self._nlist(num_vectors)
+
+        # Too few vectors to train inverted lists
+        if index_type in ("ivf", "ivfpq") and nlist < 2:
+            index_type = "flat"
+
+        if index_type == "flat":
+            return faiss.IndexFlatL2(dimension)
+
+        if index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(dimension, self.hnsw_m)
+            self.apply_search_params(index)
+            return index
+
+        quantizer = faiss.IndexFlatL2(dimension)
+        if index_type == "ivfpq" and num_vectors >= 256:
+            index = faiss.IndexIVFPQ(quantizer, dimension, nlist, self._pq_subquantizers(dimension), 8)
+        else:
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+
+        index.train(np.ascontiguousarray(self._sample(vectors), dtype=np.float32))
+        # Keep vectors reconstructable by position, e.g. for the embedding router centroids
+        index.make_direct_map()
+        self.apply_search_params(index)
+        return index
+
+    def streaming_type(self) -> str:
+        """Get the type of the index vectors are added to while the corpus size is still unknown.
+
+        Types that need training start out flat and are converted by ``retrain``
+        once all vectors are in.
+        """
+        return "hnsw" if self.index_type == "hnsw" else "flat"
+
+    def retrain(self, index: faiss.Index) -> faiss.Index:
+        """Convert a flat index to the type selected for its final size.
+
+        Vectors keep their positions, so the docstore id mapping of the
+        vector store stays valid.
+
+        Args:
+            index: A flat index holding all vectors
+
+        Returns:
+            faiss.Index: The trained index, or the index itself if it already has the selected type
+        """
+        index_type = self.select_type(index.ntotal)
+        if index_type == self.describe(index) or not index.ntotal:
+            return index
+
+        vectors = index.reconstruct_n(0, index.ntotal)
+        trained_index = self.build(vectors, index_type=index_type)
+        trained_index.add(vectors)
+        return trained_index
+
+    def apply_search_params(self, index: faiss.Index) -> None:
+        """Set the query-time accuracy/speed knobs of an index.
+
+        Args:
+            index: The index, left unchanged if it has no such parameters
+        """
+        ivf_index = faiss.try_extract_index_ivf(index)
+        if ivf_index is not None:
+            ivf_index.nprobe = min(self.nprobe, ivf_index.nlist)
+        if hasattr(index, "hnsw"):
+            index.hnsw.efSearch = self.ef_search
+
+    @staticmethod
+    def describe(index: faiss.Index) -> str:
+        """Get the index type name of an index, as used in ``INDEX_TYPES``."""
+        if isinstance(index, faiss.IndexIVFPQ):
+            return "ivfpq"
+        if faiss.try_extract_index_ivf(index) is not None:
+            return "ivf"
+        if hasattr(index, "hnsw"):
+            return "hnsw"
+        return "flat"
+
+    @staticmethod
+    def supports_removal(index: faiss.Index) -> bool:
+        """Whether vectors can be removed from the index without rebuilding the vector store."""
+        return IndexFactory.describe(index) == "flat"
+
+
+def as_matrix(vectors: List[List[float]]) -> np.ndarray:
+    """Convert embeddings to the float32 matrix FAISS expects."""
+    return np.asarray(vectors, dtype=np.float32)
@@ -0,0 +1,257 @@
+import logging
+import os
+import json
+import time
+import shutil
+import pickle
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+import faiss
+from langchain_core.embeddings import Embeddings
+from langchain_community.vectorstores import FAISS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.getenv("ADAPTIVE_RAG_CACHE_DIR", ".cache/adaptive_rag"), "index")
+
+
+class IndexStore:
+    """Persists FAISS vector stores on disk so they survive across sessions.
+
+    Every stored index lives in its own directory named after a key derived
+    from the URL set, the chunking parameters and the embedding model. The
+    directory holds the raw FAISS index, the pickled docstore (the same layout
+    as ``FAISS.save_local``) and a JSON manifest describing the corpus,
+    including the docstore ids contributed by every source URL so that an
+    index can be updated incrementally when the URL set changes.
+    """
+
+    INDEX_FILE = "index.faiss"
+    DOCSTORE_FILE = "index.pkl"
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self,
+                 cache_dir: str = DEFAULT_CACHE_DIR,
+                 use_mmap: bool = True,
+                 ttl: Optional[float] = None,
+                 max_entries: int = 8):
+        """Initialize the index store.
+
+        Args:
+            cache_dir: Directory under which indexes are stored
+            use_mmap: Memory-map the FAISS index on load instead of reading it into RAM
+            ttl: Maximum age of a stored index in seconds, None to never expire
+            max_entries: Number of indexes kept per configuration, older ones are pruned
+        """
+        self.cache_dir = Path(cache_dir)
+        self.use_mmap = use_mmap
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @staticmethod
+    def make_key(urls: List[str],
+                 chunk_size: int,
+                 chunk_overlap: int,
+                 embedding_model: str,
+                 index_type: str = "flat",
+                 dedup_threshold: Optional[float] = None) -> str:
+        """Derive the cache key for a corpus configuration.
+
+        Args:
+            urls: URLs making up the corpus (order and duplicates are ignored)
+            chunk_size: Chunk size used by the splitter
+            chunk_overlap: Chunk overlap used by the splitter
+            embedding_model: Name of the embedding model
+            index_type: Configured FAISS index type
+            dedup_threshold: Near-duplicate chunk similarity threshold, None if chunks are not deduplicated
+
+        Returns:
+            str: Hex digest identifying the configuration
+        """
+        payload = json.dumps({
+            "urls": sorted(set(urls)),
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "embedding_model": embedding_model,
+            "index_type": index_type,
+            "dedup_threshold": dedup_threshold,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def make_config_key(chunk_size: int,
+                        chunk_overlap: int,
+                        embedding_model: str,
+                        index_type: str = "flat",
+                        dedup_threshold: Optional[float] = None) -> str:
+        """Derive the key shared by all indexes built with the same settings.
+
+        Indexes with the same configuration key differ only in their URL set,
+        so any of them can serve as the base of an incremental update.
+
+        Args:
+            chunk_size: Chunk size used by the splitter
+            chunk_overlap: Chunk overlap used by the splitter
+            embedding_model: Name of the embedding model
+            index_type: Configured FAISS index type
+            dedup_threshold: Near-duplicate chunk similarity threshold, None if chunks are not deduplicated
+
+        Returns:
+            str: Hex digest identifying the settings
+        """
+        payload = json.dumps({
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "embedding_model": embedding_model,
+            "index_type": index_type,
+            "dedup_threshold": dedup_threshold,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def content_hash(texts: List[str]) -> str:
+        """Hash the chunk contents of an index.
+
+        Args:
+            texts: Page contents of every chunk in the index
+
+        Returns:
+            str: Order-independent hex digest of the contents
+        """
+        digest = hashlib.sha256()
+        for text_hash in sorted(hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts):
+            digest.update(text_hash.encode("ascii"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def get_manifest(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read the manifest of a stored index.
+
+        Args:
+            key: Cache key of the index
+
+        Returns:
+            The manifest dictionary, or None if the index is missing or expired
+        """
+        manifest_path = self._path(key) / self.MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+
+        try:
+            with open(manifest_path, mode="r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self.ttl is not None and time.time() - manifest.get("created_at", 0) > self.ttl:
+            return None
+
+        return manifest
+
+    def _manifests(self, config_key: str) -> List[Dict[str, Any]]:
+        """List the manifests of all live indexes built with the given settings, newest first."""
+        if not self.cache_dir.exists():
+            return []
+
+        manifests = []
+        for path in self.cache_dir.iterdir():
+            if not path.is_dir() or path.name.startswith("."):
+                continue
+            manifest = self.get_manifest(path.name)
+            if manifest is not None and manifest.get("config_key") == config_key:
+                manifests.append(manifest)
+
+        return sorted(manifests, key=lambda manifest: manifest.get("created_at", 0), reverse=True)
+
+    def find_base(self, config_key: str) -> Optional[Dict[str, Any]]:
+        """Find the most recent index built with the given settings.
+
+        Args:
+            config_key: Configuration key from ``make_config_key``
+
+        Returns:
+            The manifest of the newest matching index, or None if there is none
+        """
+        manifests = self._manifests(config_key)
+        return manifests[0] if manifests else None
+
+    def prune(self, config_key: str) -> None:
+        """Remove the oldest indexes of a configuration beyond ``max_entries``.
+
+        Args:
+            config_key: Configuration key from ``make_config_key``
+        """
+        for manifest in self._manifests(config_key)[self.max_entries:]:
+            shutil.rmtree(self._path(manifest["key"]), ignore_errors=True)
+
+    def _read_index(self, index_path: Path, writable: bool):
+        if self.use_mmap and not writable:
+            try:
+                return faiss.read_index(str(index_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            except RuntimeError:
+                # Not every index type supports memory mapping, fall back to a regular read
+                pass
+        return faiss.read_index(str(index_path))
+
+    def load(self, key: str, embeddings: Embeddings, writable: bool = False) -> Optional[FAISS]:
+        """Load a stored vector store.
+
+        Args:
+            key: Cache key of the index
+            embeddings: Embedding model used to embed queries
+            writable: Read the index fully into memory so it can be modified
+
+        Returns:
+            The FAISS vector store, or None on a cache miss
+        """
+        if self.get_manifest(key) is None:
+            return None
+
+        path = self._path(key)
+        try:
+            index = self._read_index(path / self.INDEX_FILE, writable=writable)
+            with open(path / self.DOCSTORE_FILE, "rb") as f:
+                docstore, index_to_docstore_id = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"---INDEX CACHE ENTRY {key} UNREADABLE, REBUILDING: {str(e)}---")
+            return None
+
+        return FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=index_to_docstore_id
+        )
+
+    def save(self, key: str, vector_store: FAISS, manifest: Dict[str, Any]) -> None:
+        """Persist a vector store and its manifest.
+
+        The files are written to a temporary directory first and moved into
+        place afterwards, so readers never observe a half-written index.
+
+        Args:
+            key: Cache key of the index
+            vector_store: The FAISS vector store to persist
+            manifest: Metadata describing the indexed corpus
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = self.cache_dir / f".{key}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+
+        faiss.write_index(vector_store.index, str(tmp_path / self.INDEX_FILE))
+        with open(tmp_path / self.DOCSTORE_FILE, "wb") as f:
+            pickle.dump((vector_store.docstore, vector_store.index_to_docstore_id), f)
+        with open(tmp_path / self.MANIFEST_FILE, mode="w", encoding="utf-8") as f:
+            json.dump({**manifest, "key": key, "created_at": time.time()}, f, indent=2)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+
+        if manifest.get("config_key"):
+            self.prune(manifest["config_key"])
@@ -0,0 +1,279 @@
+import queue
+import threading
+from uuid import uuid4
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import faiss
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from langchain_community.vectorstores import FAISS
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from src.AdaptiveRag.retriever.web_loader import ConcurrentWebLoader
+from src.AdaptiveRag.retriever.index_factory import IndexFactory, as_matrix
+from src.AdaptiveRag.retriever.dedup import MinHashDeduplicator, NearDuplicateIndex
+from src.AdaptiveRag.retriever.parallel_splitter import ParallelSplitter
+
+# Marks the end of a stage's output
+DONE = object()
+
+
+@dataclass
+class IngestProgress:
+    """Counters of a running ingest, updated by the pipeline stages."""
+
+    total_pages: int = 0
+    pages: int = 0
+    chunks: int = 0
+    duplicates: int = 0
+    indexed: int = 0
+
+
+class StreamingIngestPipeline:
+    """Fetches, splits, embeds and indexes a corpus as a pipeline of concurrent stages.
+
+    Pages flow through bounded queues: fetch -> split (and deduplicate) ->
+    embed -> index. A full queue blocks the stage feeding it, so at any time
+    only a bounded number of pages and chunk batches are held in memory, and
+    the first vectors are searchable long before the last page is fetched.
+    Fetching, splitting and embedding run in worker threads, with the
+    tokenizing and splitting itself spread over the splitter's worker
+    processes; indexing runs in the calling thread, which also reports progress.
+
+    The index under construction is never searched directly. Whenever it has
+    grown enough, a copy is published through ``on_publish``, so readers
+    always see a consistent index while ingest goes on.
+    """
+
+    def __init__(self,
+                 loader: ConcurrentWebLoader,
+                 splitter: ParallelSplitter,
+                 embeddings: Embeddings,
+                 index_factory: IndexFactory,
+                 deduplicator: Optional[MinHashDeduplicator] = None,
+                 queue_size: int = 8,
+                 batch_size: int = 64,
+                 embed_workers: int = 2,
+                 publish_growth: float = 0.25):
+        """Initialize the pipeline.
+
+        Args:
+            loader: Loader fetching and extracting the pages
+            splitter: Splitter turning the documents of every page into chunks
+            embeddings: Embedding model of the index
+            index_factory: Factory of the index
+            deduplicator: Deduplicator dropping near-duplicate chunks, None to keep all chunks
+            queue_size: Capacity of every queue between two stages
+            batch_size: Number of chunks embedded and indexed together
+            embed_workers: Number of threads embedding batches concurrently
+            publish_growth: Relative index growth after which a new copy is published
+        """
+        self.loader = loader
+        self.splitter = splitter
+        self.embeddings = embeddings
+        self.index_factory = index_factory
+        self.deduplicator = deduplicator
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.embed_workers = max(1, embed_workers)
+        self.publish_growth = publish_growth
+
+    def _put(self, target: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        """Put an item on a bounded queue, waiting for room unless the pipeline is stopped."""
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue, stop: threading.Event) -> Any:
+        """Take the next item off a queue, or DONE once the pipeline is stopped."""
+        while not stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return DONE
+
+    def _fetch(self, urls: List[str], pages: queue.Queue, stop: threading.Event, progress: IngestProgress) -> None:
+        for url, documents in self.loader.lazy_load(urls, max_pending=self.queue_size):
+            progress.pages += 1
+            if not self._put(pages, (url, documents), stop):
+                return
+
+    def _split(self,
+               pages: queue.Queue,
+               batches: queue.Queue,
+               stop: threading.Event,
+               progress: IngestProgress,
+               duplicate_sources: Dict[str, List[str]]) -> None:
+        clusters = NearDuplicateIndex(self.deduplicator) if self.deduplicator else None
+        representative_ids: List[str] = []
+        batch: List[Tuple[str, Document]] = []
+
+        def page_documents() -> Iterator[List[Document]]:
+            while True:
+                item = self._get(pages, stop)
+                if item is DONE:
+                    return
+                yield item[1]
+
+        for chunks in self.splitter.imap(page_documents()):
+            for chunk in chunks:
+                if clusters is not None:
+                    if not self.deduplicator.has_words(chunk.page_content):
+                        continue
+                    representative = clusters.find_or_add(chunk.page_content)
+                    if representative is not None:
+                        duplicate_sources[representative_ids[representative]].append(chunk.metadata.get("source", ""))
+                        progress.duplicates += 1
+                        continue
+
+                chunk_id = str(uuid4())
+                representative_ids.append(chunk_id)
+                batch.append((chunk_id, chunk))
+                progress.chunks += 1
+
+                if len(batch) >= self.batch_size:
+                    if not self._put(batches, batch, stop):
+                        return
+                    batch = []
+
+        if batch:
+            self._put(batches, batch, stop)
+
+    def _embed(self, batches: queue.Queue, vectors: queue.Queue, stop: threading.Event) -> None:
+        while True:
+            batch = self._get(batches, stop)
+            if batch is DONE:
+                # Let the other embedding workers see the end of the input too
+                self._put(batches, DONE, stop)
+                return
+            embedded = self.embeddings.embed_documents([chunk.page_content for _, chunk in batch])
+            if not self._put(vectors, (batch, as_matrix(embedded)), stop):
+                return
+
+    def _run_stage(self,
+                   target: Callable[..., None],
+                   args: Tuple,
+                   output: queue.Queue,
+                   stop: threading.Event,
+                   errors: List[Exception]) -> threading.Thread:
+        """Run a stage in a worker thread; a failing stage stops the whole pipeline."""
+        def run():
+            try:
+                target(*args)
+                self._put(output, DONE, stop)
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+
+        thread = threading.Thread(target=run, name=f"ingest-{target.__name__.strip('_')}", daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def snapshot(vector_store: FAISS) -> FAISS:
+        """Copy a vector store, so it can be searched while the original keeps growing."""
+        return FAISS(
+            embedding_function=vector_store.embedding_function,
+            index=faiss.clone_index(vector_store.index),
+            docstore=InMemoryDocstore(dict(vector_store.docstore._dict)),
+            index_to_docstore_id=dict(vector_store.index_to_docstore_id)
+        )
+
+    def run(self,
+            urls: List[str],
+            on_publish: Optional[Callable[[FAISS], None]] = None,
+            on_progress: Optional[Callable[[IngestProgress], None]] = None
+            ) -> Tuple[Optional[FAISS], Dict[str, List[str]], IngestProgress]:
+        """Ingest the pages of the given URLs.
+
+        Args:
+            urls: The URLs to ingest
+            on_publish: Called with a searchable copy of the index whenever it has grown enough
+            on_progress: Called after every indexed batch
+
+        Returns:
+            The vector store (None if no chunk was indexed), the docstore ids of
+            every source URL and the final progress counters
+
+        Raises:
+            Exception: The first error raised by a stage
+        """
+        progress = IngestProgress(total_pages=len(urls))
+        stop = threading.Event()
+        errors: List[Exception] = []
+        duplicate_sources: Dict[str, List[str]] = defaultdict(list)
+
+        pages: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        batches: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        vectors: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        threads = [
+            self._run_stage(self._fetch, (urls, pages, stop, progress), pages, stop, errors),
+            self._run_stage(self._split, (pages, batches, stop, progress, duplicate_sources), batches, stop, errors)
+        ]
+        threads += [
+            self._run_stage(self._embed, (batches, vectors, stop), vectors, stop, errors)
+            for _ in range(self.embed_workers)
+        ]
+
+        vector_store: Optional[FAISS] = None
+        source_ids: Dict[str, List[str]] = {}
+        published = 0
+        finished_workers = 0
+
+        try:
+            while finished_workers < self.embed_workers:
+                item = self._get(vectors, stop)
+                if stop.is_set():
+                    break
+                if item is DONE:
+                    finished_workers += 1
+                    continue
+
+                batch, matrix = item
+                if vector_store is None:
+                    vector_store = FAISS(
+                        embedding_function=self.embeddings,
+                        index=self.index_factory.build(matrix, index_type=self.index_factory.streaming_type()),
+                        docstore=InMemoryDocstore(),
+                        index_to_docstore_id={}
+                    )
+
+                vector_store.add_embeddings(
+                    zip([chunk.page_content for _, chunk in batch], matrix),
+                    metadatas=[chunk.metadata for _, chunk in batch],
+                    ids=[chunk_id for chunk_id, _ in batch]
+                )
+                for chunk_id, chunk in batch:
+                    source_ids.setdefault(chunk.metadata.get("source", ""), []).append(chunk_id)
+
+                progress.indexed = vector_store.index.ntotal
+                if on_publish is not None and progress.indexed >= published * (1 + self.publish_growth) + 1:
+                    on_publish(self.snapshot(vector_store))
+                    published = progress.indexed
+                if on_progress is not None:
+                    on_progress(progress)
+        finally:
+            # Every stage polls the stop flag while it waits, so they all exit
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+        if vector_store is None:
+            return None, source_ids, progress
+
+        vector_store.index = self.index_factory.retrain(vector_store.index)
+        for chunk_id, sources in duplicate_sources.items():
+            vector_store.docstore._dict[chunk_id] = self.deduplicator.annotate(
+                vector_store.docstore.search(chunk_id), sources
+            )
+
+        return vector_store, source_ids, progress
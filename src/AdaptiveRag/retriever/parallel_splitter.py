@@ -0,0 +1,129 @@
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Iterable, Iterator, List, Optional
+
+from langchain.schema import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter, TextSplitter
+
+# Splitter of a worker process, created once by the pool initializer
+_worker_splitter: Optional[TextSplitter] = None
+
+# Splitting saturates well before the core count of large machines, while every worker holds its own tokenizer
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def create_splitter(chunk_size: int = 500, chunk_overlap: int = 0) -> TextSplitter:
+    """Create the token-based splitter used for every chunk of the index."""
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def _init_worker(chunk_size: int, chunk_overlap: int) -> None:
+    global _worker_splitter
+    _worker_splitter = create_splitter(chunk_size, chunk_overlap)
+
+
+def _split_batch(documents: List[Document]) -> List[Document]:
+    return _worker_splitter.split_documents(documents)
+
+
+class ParallelSplitter:
+    """Splits documents into chunks across a pool of worker processes.
+
+    Tokenizing and splitting is CPU-bound, so documents are sent to worker
+    processes in work units of ``chunksize`` documents. Every document is
+    split on its own with the same splitter as the serial path, and results
+    are collected in input order, so the chunks are exactly those of a serial
+    split, in the same order. Small inputs are split in-process, where
+    starting the pool would cost more than it saves. The pool is started on
+    first use and kept until ``close``.
+    """
+
+    def __init__(self,
+                 chunk_size: int = 500,
+                 chunk_overlap: int = 0,
+                 max_workers: Optional[int] = None,
+                 chunksize: int = 8,
+                 min_documents: int = 32):
+        """Initialize the splitter.
+
+        Args:
+            chunk_size: Chunk size in tokens
+            chunk_overlap: Chunk overlap in tokens
+            max_workers: Number of worker processes, defaults to DEFAULT_MAX_WORKERS; 1 splits in-process
+            chunksize: Number of documents per work unit sent to a worker
+            min_documents: Number of documents from which the worker processes are used
+        """
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.max_workers = max(1, max_workers or DEFAULT_MAX_WORKERS)
+        self.chunksize = max(1, chunksize)
+        self.min_documents = min_documents
+        self.splitter = create_splitter(chunk_size, chunk_overlap)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers don't inherit the parent's threads (web loader, Streamlit) in a forked state
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.chunk_size, self.chunk_overlap)
+            )
+        return self._executor
+
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        """Split documents into chunks.
+
+        Args:
+            documents: The documents to split
+
+        Returns:
+            List[Document]: The chunks of all documents, in document order
+        """
+        if self.max_workers == 1 or len(documents) < self.min_documents:
+            return self.splitter.split_documents(documents)
+
+        batches = [documents[i:i + self.chunksize] for i in range(0, len(documents), self.chunksize)]
+        return [chunk for chunks in self._pool().map(_split_batch, batches) for chunk in chunks]
+
+    def imap(self, units: Iterable[List[Document]]) -> Iterator[List[Document]]:
+        """Split a stream of work units, yielding the chunks of every unit in input order.
+
+        At most two units per worker are in flight, so a slow consumer stops
+        the input from being read ahead. The first ``min_documents`` units are
+        split in-process, so short streams never start the pool.
+
+        Args:
+            units: Lists of documents to split, e.g. the documents of one page each
+
+        Yields:
+            List[Document]: The chunks of each unit
+        """
+        units = iter(units)
+        if self.max_workers == 1:
+            for documents in units:
+                yield self.splitter.split_documents(documents)
+            return
+
+        for _ in range(self.min_documents):
+            documents = next(units, None)
+            if documents is None:
+                return
+            yield self.splitter.split_documents(documents)
+
+        pending: Deque[Future] = deque()
+        for documents in units:
+            pending.append(self._pool().submit(_split_batch, documents))
+            if len(pending) >= 2 * self.max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def close(self) -> None:
+        """Shut the worker processes down; the next parallel split starts a new pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -1,80 +1,695 @@
-from typing import Dict
+import logging
+import threading
+from uuid import uuid4
+from typing import Dict, List, Optional, Any
 from itertools import chain
-import streamlit as st
-from langchain_community.document_loaders import WebBaseLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
+import numpy as np
+from langchain.schema import Document
 from langchain_community.vectorstores import FAISS
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from src.AdaptiveRag.retriever.index_store import IndexStore, DEFAULT_CACHE_DIR
+from src.AdaptiveRag.retriever.web_loader import ConcurrentWebLoader
+from src.AdaptiveRag.retriever.embeddings import get_embeddings, embedding_model_name
+from src.AdaptiveRag.retriever.hybrid import create_hybrid_retriever
+from src.AdaptiveRag.retriever.scoring import create_scored_retriever
+from src.AdaptiveRag.retriever.index_factory import IndexFactory, as_matrix
+from src.AdaptiveRag.retriever.dedup import MinHashDeduplicator
+from src.AdaptiveRag.retriever.ingest import IngestProgress, StreamingIngestPipeline
+from src.AdaptiveRag.retriever.parallel_splitter import DEFAULT_MAX_WORKERS, ParallelSplitter
+from src.AdaptiveRag.progress import ProgressReporter, QueuedProgressReporter, get_reporter
+from src.AdaptiveRag.progress.reporter import ProgressStatus
+
+logger = logging.getLogger(__name__)
 
 class Retriever:
     def __init__(self, user_input: Dict[str, str]):
         """
         Initialize the Retriever class with user input.
-        
+
         Args:
             user_input (Dict[str, str]): A dictionary containing user input, including URLs.
         """
-        self.urls = user_input.get("urls", [])
+        self.urls = self._normalize_urls(user_input.get("urls", []))
+        self.chunk_size = int(user_input.get("chunk_size", 500))
+        self.chunk_overlap = int(user_input.get("chunk_overlap", 0))
+        self.splitter = ParallelSplitter(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            max_workers=int(user_input.get("split_workers", DEFAULT_MAX_WORKERS)),
+            chunksize=int(user_input.get("split_chunksize", 8))
+        )
+        self.top_k = 4
+        # "hybrid" fuses BM25 and dense results, "dense" only uses the FAISS index
+        self.retrieval_mode = user_input.get("retrieval_mode", "hybrid")
+        self.hybrid_weights = [float(weight) for weight in user_input.get("hybrid_weights", [0.5, 0.5])]
+        self.rrf_k = int(user_input.get("rrf_k", 60))
+        self.embeddings = get_embeddings(user_input)
+        self.embedding_model = embedding_model_name(self.embeddings)
+        self.index_store = IndexStore(
+            cache_dir=user_input.get("index_cache_dir", DEFAULT_CACHE_DIR),
+            use_mmap=user_input.get("index_cache_mmap", True),
+            ttl=user_input.get("index_cache_ttl")
+        )
+        self.use_index_cache = user_input.get("index_cache", True)
+        # Near-duplicate chunks (navigation, footers, boilerplate) are dropped before embedding
+        self.deduplicator = MinHashDeduplicator(
+            threshold=float(user_input.get("chunk_dedup_threshold", 0.9))
+        ) if user_input.get("chunk_dedup", True) else None
+        self.index_factory = IndexFactory(
+            index_type=user_input.get("index_type", "auto"),
+            nprobe=int(user_input.get("index_nprobe", 16)),
+            ef_search=int(user_input.get("index_ef_search", 64)),
+            train_size=int(user_input.get("index_train_size", 50000))
+        )
+        self.loader = ConcurrentWebLoader(
+            max_workers=int(user_input.get("loader_max_workers", 8)),
+            timeout=float(user_input.get("loader_timeout", 10.0)),
+            requests_per_second=float(user_input.get("loader_requests_per_second", 2.0))
+        )
+        # Full builds stream pages through fetch -> split -> embed -> index instead of loading everything first
+        self.streaming_ingest = user_input.get("streaming_ingest", True)
+        self.ingest_queue_size = int(user_input.get("ingest_queue_size", 8))
+        self.ingest_batch_size = int(user_input.get("ingest_batch_size", 64))
+        self.ingest_embed_workers = int(user_input.get("ingest_embed_workers", 2))
         self.documents = []
         self.chunks = []
         self.vector_store = None
         self.retriever = None
-    
-    def _load_documents(self) -> None:
+        # Docstore ids contributed by every indexed URL
+        self.source_ids: Dict[str, List[str]] = {}
+        # Whether the in-memory index may be modified (memory-mapped indexes may not)
+        self.writable = False
+        self.manifest_key = None
+        # Content hash of the indexed chunks, changes whenever the index does
+        self.index_version = None
+        # Background build started by get_retriever(wait=False)
+        self._build_thread: Optional[threading.Thread] = None
+        self._queryable = threading.Event()
+        self.build_error: Optional[Exception] = None
+        # Queues the progress of a background build for reporters bound to the UI thread
+        self._build_reporter: Optional[QueuedProgressReporter] = None
+
+    @staticmethod
+    def _normalize_urls(urls: List[str]) -> List[str]:
         """
-        Load documents from the given URLs.
+        Strip whitespace and drop empty or repeated URLs, keeping the input order.
+
+        Args:
+            urls (List[str]): Raw URLs as entered by the user.
+
+        Returns:
+            List[str]: The cleaned list of URLs.
         """
-        self.documents = list(chain.from_iterable(
-            [WebBaseLoader(web_path=url).load() for url in self.urls]
-        ))
-    
-    def _split_documents(self, chunk_size: int = 500, chunk_overlap: int = 0) -> None:
+        return list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+
+    def _index_key(self, urls: Optional[List[str]] = None) -> str:
         """
-        Split documents into smaller chunks using RecursiveCharacterTextSplitter.
-        
+        Get the index cache key for the URLs, chunking parameters and embedding model.
+
         Args:
-            chunk_size (int): The size of each chunk.
-            chunk_overlap (int): The overlap between chunks.
+            urls (Optional[List[str]]): URLs to derive the key from, defaults to all configured URLs.
         """
-        splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-            chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        return IndexStore.make_key(
+            urls=self.urls if urls is None else urls,
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            embedding_model=self.embedding_model,
+            index_type=self.index_factory.index_type,
+            dedup_threshold=self.deduplicator.threshold if self.deduplicator else None
         )
-        self.chunks = splitter.split_documents(self.documents)
-    
+
+    def _config_key(self) -> str:
+        """
+        Get the index cache key shared by every URL set indexed with the current settings.
+        """
+        return IndexStore.make_config_key(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            embedding_model=self.embedding_model,
+            index_type=self.index_factory.index_type,
+            dedup_threshold=self.deduplicator.threshold if self.deduplicator else None
+        )
+
+    def _load_documents(self, urls: Optional[List[str]] = None) -> None:
+        """
+        Load documents from the given URLs concurrently.
+
+        URLs that fail to load are reported and skipped, the rest of the batch is kept.
+
+        Args:
+            urls (Optional[List[str]]): URLs to load, defaults to all configured URLs.
+        """
+        urls = self.urls if urls is None else urls
+        self.documents = self.loader.load(urls)
+        self._report_failed_urls()
+
+    def _report_failed_urls(self) -> None:
+        """
+        Warn about the URLs that failed to load in the last batch.
+        """
+        if self.loader.failed_urls:
+            self._reporter().warning(
+                f"Failed to load {len(self.loader.failed_urls)} URL(s): "
+                + ", ".join(self.loader.failed_urls)
+            )
+
+    def _loaded_urls(self, urls: List[str]) -> List[str]:
+        """
+        Filter out the URLs that failed to load in the last batch.
+
+        Failed URLs are not recorded as indexed, so they are retried on the next update.
+        """
+        return [url for url in urls if url not in self.loader.failed_urls]
+
+    def _split_documents(self) -> None:
+        """
+        Split documents into smaller chunks using RecursiveCharacterTextSplitter.
+
+        Large document sets are split across worker processes, with the same
+        chunks in the same order as a serial split.
+        """
+        self.chunks = self.splitter.split_documents(self.documents)
+        self._deduplicate_chunks()
+
+    def _deduplicate_chunks(self) -> None:
+        """
+        Replace the current chunks by one representative per cluster of near-duplicates,
+        reporting how much smaller the index gets.
+        """
+        if self.deduplicator is None or not self.chunks:
+            return
+
+        num_chunks = len(self.chunks)
+        self.chunks = self.deduplicator.deduplicate(self.chunks)
+
+        self._report_duplicates(num_chunks - len(self.chunks), num_chunks)
+
+    def _report_duplicates(self, removed: int, num_chunks: int) -> None:
+        """
+        Report how much smaller near-duplicate elimination made the index.
+        """
+        if removed:
+            self._reporter().write(
+                f"Removed {removed} near-duplicate chunk(s) of {num_chunks}, "
+                f"the index is {removed / num_chunks:.0%} smaller..."
+            )
+
+    def _assign_chunk_ids(self, urls: List[str]) -> List[str]:
+        """
+        Generate docstore ids for the current chunks and record them per source URL.
+
+        Args:
+            urls (List[str]): The URLs the current chunks were loaded from.
+
+        Returns:
+            List[str]: One docstore id per chunk.
+        """
+        ids = []
+        for url in urls:
+            self.source_ids.setdefault(url, [])
+
+        for chunk in self.chunks:
+            chunk_id = str(uuid4())
+            self.source_ids.setdefault(chunk.metadata.get("source", ""), []).append(chunk_id)
+            ids.append(chunk_id)
+
+        return ids
+
     def _create_vector_store(self) -> None:
         """
         Create a FAISS vector store from the document chunks.
+
+        The index type is chosen by the index factory from the number of chunks,
+        and IVF indexes are trained on a sample of the chunk embeddings.
+
+        Raises:
+            ValueError: If no chunk could be loaded from the configured URLs.
         """
-        self.vector_store = FAISS.from_documents(
-            documents=self.chunks, embedding=OpenAIEmbeddings()
+        if not self.chunks:
+            raise ValueError("No content could be loaded from the configured URLs")
+
+        self.source_ids = {}
+        ids = self._assign_chunk_ids(self._loaded_urls(self.urls))
+        texts = [chunk.page_content for chunk in self.chunks]
+        vectors = as_matrix(self.embeddings.embed_documents(texts))
+
+        index = self.index_factory.build(vectors)
+        self._reporter().write(f"Indexing {len(texts)} chunk(s) in a {IndexFactory.describe(index)} index...")
+
+        self.vector_store = FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={}
+        )
+        self.vector_store.add_embeddings(
+            zip(texts, vectors), metadatas=[chunk.metadata for chunk in self.chunks], ids=ids
         )
-    
-    def get_retriever(self, top_k: int = 4):
+        self.writable = True
+
+    def _ingest_vector_store(self, status: Optional[ProgressStatus] = None) -> None:
         """
-        Get the retriever object.
-        
+        Build the vector store with the streaming ingest pipeline.
+
+        Pages are split, embedded and indexed while the rest are still being
+        fetched, with bounded queues between the stages, so memory does not grow
+        with the corpus. Copies of the growing index are published as the
+        retriever, so it can be queried before ingest completes.
+
         Args:
-            top_k (int): Number of documents to retrieve.
-        
+            status (Optional[ProgressStatus]): Status block the progress is reported in.
+        """
+        pipeline = StreamingIngestPipeline(
+            loader=self.loader,
+            splitter=self.splitter,
+            embeddings=self.embeddings,
+            index_factory=self.index_factory,
+            deduplicator=self.deduplicator,
+            queue_size=self.ingest_queue_size,
+            batch_size=self.ingest_batch_size,
+            embed_workers=self.ingest_embed_workers
+        )
+
+        def report(progress: IngestProgress) -> None:
+            if status is not None:
+                status.update(
+                    label=f"Indexed {progress.indexed} chunk(s) from {progress.pages}/{progress.total_pages} page(s)..."
+                )
+
+        vector_store, source_ids, progress = pipeline.run(self.urls, on_publish=self._publish, on_progress=report)
+        self._report_failed_urls()
+        self._report_duplicates(progress.duplicates, progress.chunks + progress.duplicates)
+        if vector_store is None:
+            raise ValueError("No content could be loaded from the configured URLs")
+
+        self.vector_store = vector_store
+        self.source_ids = {url: source_ids.pop(url, []) for url in self._loaded_urls(self.urls)}
+        self.source_ids.update(source_ids)
+        self.writable = True
+
+    def _add_urls(self, urls: List[str]) -> None:
+        """
+        Load, split and embed only the given URLs and add them to the vector store.
+
+        Args:
+            urls (List[str]): URLs that are not indexed yet.
+        """
+        self._reporter().write(f"Loading {len(urls)} new document source(s)...")
+        self._load_documents(urls)
+
+        self._reporter().write("Splitting the new documents...")
+        self._split_documents()
+
+        if self.chunks:
+            self._reporter().write(f"Embedding {len(self.chunks)} new chunk(s)...")
+            self.vector_store.add_documents(self.chunks, ids=self._assign_chunk_ids(self._loaded_urls(urls)))
+        else:
+            self._assign_chunk_ids(self._loaded_urls(urls))
+
+    def _remove_urls(self, urls: List[str]) -> None:
+        """
+        Delete the vectors of the given URLs from the vector store.
+
+        Args:
+            urls (List[str]): Indexed URLs that are no longer configured.
+        """
+        ids = list(chain.from_iterable(self.source_ids.pop(url, []) for url in urls))
+        if ids:
+            self._reporter().write(f"Removing {len(ids)} chunk(s) from {len(urls)} removed source(s)...")
+            self.vector_store.delete(ids)
+
+    def _represents_other_sources(self, urls: List[str]) -> bool:
+        """
+        Check whether chunks of the given URLs stand in for near-duplicates of sources that stay indexed.
+
+        Removing such chunks would also remove that content for the remaining sources.
+
+        Args:
+            urls (List[str]): Indexed URLs that are about to be removed.
+        """
+        remaining = set(self.source_ids) - set(urls)
+        for chunk_id in chain.from_iterable(self.source_ids.get(url, []) for url in urls):
+            chunk = self.vector_store.docstore.search(chunk_id)
+            if isinstance(chunk, Document) and remaining.intersection(
+                chunk.metadata.get(MinHashDeduplicator.DUPLICATE_SOURCES_KEY, [])
+            ):
+                return True
+        return False
+
+    def _update_vector_store(self) -> bool:
+        """
+        Bring the vector store in line with the configured URLs by only indexing
+        added URLs and deleting the vectors of removed ones.
+
+        Returns:
+            bool: False if nothing of the current index can be reused, or the sources to remove
+            cannot be removed on their own, and a full build is needed.
+        """
+        added = [url for url in self.urls if url not in self.source_ids]
+        removed = [url for url in self.source_ids if url not in self.urls]
+
+        if len(removed) == len(self.source_ids):
+            return False
+        if removed and not IndexFactory.supports_removal(self.vector_store.index):
+            return False
+        if removed and self._represents_other_sources(removed):
+            return False
+
+        self._remove_urls(removed)
+        if added:
+            self._add_urls(added)
+
+        return True
+
+    def _load_base_vector_store(self) -> bool:
+        """
+        Make a writable index available to update from, either the in-memory one
+        or the most recent cached index built with the same settings.
+
+        Returns:
+            bool: True if a base index is available.
+        """
+        if self.vector_store is not None and self.writable:
+            return True
+
+        manifest = None
+        if self.vector_store is not None and self.use_index_cache:
+            manifest = self.index_store.get_manifest(self.manifest_key)
+        if manifest is None and self.use_index_cache:
+            manifest = self.index_store.find_base(self._config_key())
+        if manifest is None:
+            return False
+
+        vector_store = self.index_store.load(manifest["key"], self.embeddings, writable=True)
+        if vector_store is None:
+            return False
+
+        self.index_factory.apply_search_params(vector_store.index)
+        self.vector_store = vector_store
+        self.source_ids = manifest.get("source_ids", {})
+        self.writable = True
+        return True
+
+    def _manifest(self) -> Dict[str, Any]:
+        """
+        Describe the current vector store for the index cache.
+        """
+        docstore_ids = list(self.vector_store.index_to_docstore_id.values())
+        return {
+            "urls": list(self.source_ids),
+            "config_key": self._config_key(),
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "embedding_model": self.embedding_model,
+            "index_type": IndexFactory.describe(self.vector_store.index),
+            "num_chunks": len(docstore_ids),
+            "content_hash": IndexStore.content_hash(
+                [self.vector_store.docstore.search(doc_id).page_content for doc_id in docstore_ids]
+            ),
+            "source_ids": self.source_ids
+        }
+
+    def _save_vector_store(self, manifest: Dict[str, Any]) -> str:
+        """
+        Persist the vector store to the index cache.
+
+        The index is stored under the key of the URLs that were actually indexed,
+        so URLs that failed to load are picked up by the next incremental update.
+
+        Args:
+            manifest (Dict[str, Any]): Description of the vector store from _manifest.
+
         Returns:
-            retriever: A retriever object for similarity search.
+            str: The index cache key.
+        """
+        key = self._index_key(list(self.source_ids))
+        self.index_store.save(key, self.vector_store, manifest=manifest)
+        return key
+
+    def _sync_vector_store(self, status: Optional[ProgressStatus] = None) -> None:
         """
-        with st.status("Getting the retriever...", expanded=True) as status:
-            st.write("Loading the documents...")
+        Load, update or build the vector store for the configured URLs.
+
+        Tries, in order: the cached index for exactly these URLs, an incremental
+        update of the current or most recent compatible index, and a full build.
+
+        Args:
+            status (Optional[ProgressStatus]): Status block the progress of a streaming build is reported in.
+        """
+        key = self._index_key()
+
+        manifest = self.index_store.get_manifest(key) if self.use_index_cache else None
+        vector_store = self.index_store.load(key, self.embeddings) if manifest else None
+        if vector_store is not None:
+            self._reporter().write("Loaded the vector store from the index cache...")
+            self.index_factory.apply_search_params(vector_store.index)
+            self.vector_store = vector_store
+            self.source_ids = manifest.get("source_ids", {})
+            self.writable = not self.index_store.use_mmap
+            self.manifest_key = key
+            self.index_version = manifest.get("content_hash")
+            return
+
+        if self._load_base_vector_store() and self._update_vector_store():
+            self._reporter().write("Updated the vector store incrementally...")
+        elif self.streaming_ingest:
+            self._reporter().write("Streaming the documents into the vector store...")
+            self._ingest_vector_store(status)
+        else:
+            self._reporter().write("Loading the documents...")
             self._load_documents()
 
-            st.write("Splitting the documents...")
+            self._reporter().write("Splitting the documents...")
             self._split_documents()
 
-            st.write("Creating the vector store...")
+            self._reporter().write("Creating the vector store...")
             self._create_vector_store()
 
-            st.write("Creating the retriever...")
-            self.retriever = self.vector_store.as_retriever(search_kwargs={"k": top_k})
-            
+        # The documents and chunks are in the docstore now, don't keep a second copy
+        self.documents = []
+        self.chunks = []
+
+        manifest = self._manifest()
+        if self.use_index_cache:
+            self._reporter().write("Saving the vector store to the index cache...")
+            key = self._save_vector_store(manifest)
+        self.manifest_key = key
+        self.index_version = manifest["content_hash"]
+
+    def update_urls(self, urls: List[str], wait: bool = True) -> None:
+        """
+        Switch the retriever to a new URL list, indexing only what changed.
+
+        Args:
+            urls (List[str]): The new list of URLs.
+            wait (bool): Wait for the index to be complete, see get_retriever.
+        """
+        urls = self._normalize_urls(urls)
+        if set(urls) == set(self.urls) and self.vector_store is not None:
+            return
+
+        self.urls = urls
+        self.get_retriever(top_k=self.top_k, wait=wait)
+
+    def invoke(self, question: str) -> List[Document]:
+        """
+        Retrieve the documents most similar to the question.
+
+        Args:
+            question (str): The query to search for.
+
+        Returns:
+            List[Document]: The top_k most similar chunks, with their similarity score in the metadata.
+        """
+        return self.retriever.invoke(question)
+
+    async def ainvoke(self, question: str) -> List[Document]:
+        """
+        Asynchronously retrieve the documents most similar to the question.
+
+        Args:
+            question (str): The query to search for.
+
+        Returns:
+            List[Document]: The top_k most similar chunks, with their similarity score in the metadata.
+        """
+        return await self.retriever.ainvoke(question)
+
+    def corpus_vectors(self, max_vectors: int = 4096) -> Optional[np.ndarray]:
+        """
+        Read the embedding vectors of the indexed chunks back from the FAISS index.
+
+        Args:
+            max_vectors (int): Maximum number of vectors returned, sampled evenly across the index.
+
+        Returns:
+            Optional[np.ndarray]: The chunk vectors, or None if the index cannot reconstruct them.
+        """
+        if self.vector_store is None or not self.vector_store.index.ntotal:
+            return None
+
+        index = self.vector_store.index
+        try:
+            if index.ntotal <= max_vectors:
+                return index.reconstruct_n(0, index.ntotal)
+            positions = np.linspace(0, index.ntotal - 1, num=max_vectors, dtype=np.int64)
+            return np.vstack([index.reconstruct(int(position)) for position in positions])
+        except RuntimeError:
+            # Indexes without a direct map (e.g. some compressed ones) cannot reconstruct vectors
+            return None
+
+    def _create_retriever(self, vector_store: FAISS):
+        """
+        Create the dense or hybrid retriever over a vector store.
+        """
+        if self.retrieval_mode == "hybrid":
+            return create_hybrid_retriever(vector_store, top_k=self.top_k, weights=self.hybrid_weights, rrf_k=self.rrf_k)
+        return create_scored_retriever(vector_store, top_k=self.top_k)
+
+    def _publish(self, vector_store: FAISS) -> None:
+        """
+        Make a vector store the one queries are answered from.
+
+        Called with copies of the growing index during a streaming build, so
+        concurrent queries see a consistent index at all times.
+        """
+        self.vector_store = vector_store
+        self.retriever = self._create_retriever(vector_store)
+        self._queryable.set()
+
+    def _build_retriever(self) -> None:
+        """
+        Sync the vector store with the configured URLs and create the retriever over it.
+        """
+        with self._reporter().status("Getting the retriever...", expanded=True) as status:
+            try:
+                self._sync_vector_store(status)
+            finally:
+                # Don't keep idle connections and worker processes around between builds
+                self.close()
+
+            if self.retrieval_mode == "hybrid":
+                self._reporter().write("Creating the BM25 index and the hybrid retriever...")
+            else:
+                self._reporter().write("Creating the retriever...")
+            self._publish(self.vector_store)
+
             status.update(label="Retriever created successfully!", state="complete", expanded=False)
 
-        return self.retriever
+    def close(self) -> None:
+        """
+        Release the loader's pooled connections and the splitter's worker processes.
+
+        Both are recreated on demand, so the retriever stays usable and can be rebuilt.
+        """
+        self.loader.close()
+        self.splitter.close()
+
+    def _reporter(self) -> ProgressReporter:
+        """
+        Get the reporter of the running build: the queue of a background build if it has one, else the process-wide one.
+        """
+        return self._build_reporter or get_reporter()
+
+    def report_progress(self, rerender: bool = False) -> None:
+        """
+        Render the progress a background build queued since the last call.
+
+        Only needed for reporters that are not thread-safe, such as Streamlit's;
+        call it from the thread owning the reporter.
+
+        Args:
+            rerender (bool): Show the status blocks still open again, e.g. once per Streamlit rerun,
+                which clears the blocks rendered by the previous run.
+        """
+        if self._build_reporter is not None:
+            if rerender:
+                self._build_reporter.reopen()
+            self._build_reporter.drain()
 
+    @property
+    def indexing(self) -> bool:
+        """
+        Whether a build started with get_retriever(wait=False) is still running.
+        """
+        return self._build_thread is not None and self._build_thread.is_alive()
+
+    def _build_in_background(self) -> None:
+        try:
+            self._build_retriever()
+        except Exception as e:
+            logger.error(f"---BUILDING THE RETRIEVER FAILED: {str(e)}---")
+            self.build_error = e
+        finally:
+            self._queryable.set()
+
+    def wait_until_indexed(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a build started with get_retriever(wait=False) to complete.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait, None to wait until done.
 
+        Returns:
+            bool: True if the build is complete.
+
+        Raises:
+            Exception: The error the build failed with.
+        """
+        if self._build_thread is not None:
+            self._build_thread.join(timeout)
+            if self._build_thread.is_alive():
+                return False
+        if self.build_error is not None:
+            raise self.build_error
+        return True
+
+    def get_retriever(self, top_k: int = 4, wait: bool = True):
+        """
+        Get the retriever object.
 
+        The vector store is loaded from the on-disk index cache when the same
+        URLs were indexed before with the same settings, updated incrementally
+        from a previously indexed URL set when possible, and built otherwise.
+        In hybrid mode a BM25 index is built from the same chunks and its
+        ranking is merged with the dense one using reciprocal rank fusion.
+
+        A background build reports its progress from its own thread. If the
+        process-wide reporter is not thread-safe, the progress is queued and
+        rendered by this call while it waits for the first chunks, and by
+        ``report_progress`` afterwards.
+
+        Args:
+            top_k (int): Number of documents to retrieve.
+            wait (bool): Wait for the index to be complete; otherwise build it in the
+                background and return as soon as the first chunks are searchable.
+
+        Returns:
+            retriever: A retriever object for similarity or hybrid search.
+        """
+        # Builds never overlap; a new one starts from the result of the previous one
+        if self.indexing:
+            self._build_thread.join()
+        self.report_progress()
+        self._build_reporter = None
+        self.top_k = top_k
+
+        if wait:
+            self._build_retriever()
+            return self.retriever
+
+        reporter = get_reporter()
+        if not reporter.thread_safe:
+            self._build_reporter = QueuedProgressReporter(reporter)
+
+        self.build_error = None
+        self._queryable.clear()
+        self._build_thread = threading.Thread(target=self._build_in_background, name="retriever-build", daemon=True)
+        self._build_thread.start()
+        while not self._queryable.wait(timeout=0.1):
+            self.report_progress()
+        self.report_progress()
+
+        if self.build_error is not None:
+            raise self.build_error
+        return self.retriever
@@ -0,0 +1,58 @@
+from typing import List, Tuple
+from langchain.schema import Document
+from langchain_community.vectorstores import FAISS
+from langchain_core.runnables import Runnable, RunnableLambda
+
+# Metadata key holding the cosine similarity of a retrieved chunk to the question, clamped to [0, 1]
+RELEVANCE_SCORE_KEY = "relevance_score"
+
+
+def cosine_similarity(distance: float) -> float:
+    """Convert a squared L2 distance between unit vectors to their cosine similarity.
+
+    All indexes use the L2 metric and FAISS reports squared distances, so for
+    the unit-length vectors of the supported embedding models the cosine
+    similarity is ``1 - distance / 2``. It is clamped to [0, 1]: opposite
+    vectors are as irrelevant as orthogonal ones, and vectors that are not
+    exactly unit length never leave the scale the grader thresholds use.
+
+    Args:
+        distance: Squared L2 distance reported by the index
+
+    Returns:
+        float: The similarity, 1 for identical directions and 0 for unrelated ones
+    """
+    return min(1.0, max(0.0, 1.0 - float(distance) / 2.0))
+
+
+def _with_scores(results: List[Tuple[Document, float]]) -> List[Document]:
+    # Copy the documents so the scores of one question never leak into the shared docstore
+    return [
+        Document(page_content=doc.page_content,
+                 metadata={**doc.metadata, RELEVANCE_SCORE_KEY: cosine_similarity(distance)})
+        for doc, distance in results
+    ]
+
+
+def create_scored_retriever(vector_store: FAISS, top_k: int = 4) -> Runnable:
+    """Create a dense retriever that keeps the similarity scores of the documents it returns.
+
+    Scores are computed from the raw index distances rather than LangChain's
+    relevance scores, whose Euclidean conversion assumes plain rather than
+    squared distances and goes negative for weakly related chunks.
+
+    Args:
+        vector_store: The FAISS vector store
+        top_k: Number of documents to retrieve
+
+    Returns:
+        Runnable: Retriever returning the top_k most similar chunks, with their
+        cosine similarity in the ``relevance_score`` metadata
+    """
+    def retrieve(question: str) -> List[Document]:
+        return _with_scores(vector_store.similarity_search_with_score(question, k=top_k))
+
+    async def aretrieve(question: str) -> List[Document]:
+        return _with_scores(await vector_store.asimilarity_search_with_score(question, k=top_k))
+
+    return RunnableLambda(retrieve, afunc=aretrieve, name="ScoredVectorStoreRetriever")
@@ -0,0 +1,170 @@
+import logging
+import time
+import threading
+from urllib.parse import urlparse
+from typing import Dict, List, Iterator, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from langchain.schema import Document
+from langchain_community.document_loaders import WebBaseLoader
+from langchain_community.document_loaders.web_base import default_header_template
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host so no host sees more than a fixed request rate."""
+
+    def __init__(self, requests_per_second: float):
+        """Initialize the rate limiter.
+
+        Args:
+            requests_per_second: Maximum requests per second per host, 0 to disable
+        """
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str) -> None:
+        """Block until the next request slot for the host is due.
+
+        Args:
+            host: Network location of the URL about to be requested
+        """
+        if not self.min_interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ConcurrentWebLoader:
+    """Loads web pages concurrently with pooled connections, timeouts and per-host rate limits.
+
+    Pages are fetched by a bounded pool of worker threads. Each host gets its
+    own ``requests.Session`` so connections are kept alive and reused across
+    pages of the same site. A page that fails to load is recorded in
+    ``failed_urls`` and does not abort the rest of the batch.
+    """
+
+    def __init__(self,
+                 max_workers: int = 8,
+                 timeout: float = 10.0,
+                 requests_per_second: float = 2.0):
+        """Initialize the loader.
+
+        Args:
+            max_workers: Maximum number of pages fetched at the same time
+            timeout: Connect and read timeout per request in seconds
+            requests_per_second: Maximum requests per second per host, 0 to disable
+        """
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.failed_urls: Dict[str, str] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _get_session(self, host: str) -> requests.Session:
+        """Get the pooled session for a host, creating it on first use.
+
+        Args:
+            host: Network location of the URL
+
+        Returns:
+            requests.Session: Session whose connection pool is shared by all pages of the host
+        """
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(default_header_template)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def _load_url(self, url: str) -> List[Document]:
+        """Fetch and parse a single page.
+
+        Args:
+            url: The URL to load
+
+        Returns:
+            List[Document]: The documents extracted from the page
+        """
+        host = urlparse(url).netloc
+        self.rate_limiter.wait(host)
+
+        loader = WebBaseLoader(
+            web_path=url,
+            session=self._get_session(host),
+            requests_kwargs={"timeout": self.timeout},
+            raise_for_status=True,
+            show_progress=False
+        )
+        return loader.load()
+
+    def lazy_load(self, urls: List[str], max_pending: Optional[int] = None) -> Iterator[Tuple[str, List[Document]]]:
+        """Load pages concurrently, yielding each one as soon as it is fetched.
+
+        Args:
+            urls: The URLs to load
+            max_pending: Maximum number of pages requested or fetched but not yet
+                consumed, None for no limit; a slow consumer then pauses fetching
+
+        Yields:
+            Tuple[str, List[Document]]: The URL and its documents, in completion order
+        """
+        self.failed_urls = {}
+        remaining_urls = iter(urls)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, len(urls)))) as executor:
+            futures = {}
+
+            def submit_next() -> None:
+                url = next(remaining_urls, None)
+                if url is not None:
+                    futures[executor.submit(self._load_url, url)] = url
+
+            for _ in range(max_pending or len(urls)):
+                submit_next()
+
+            while futures:
+                future = next(iter(wait(futures, return_when=FIRST_COMPLETED).done))
+                url = futures.pop(future)
+                submit_next()
+                try:
+                    documents = future.result()
+                except Exception as e:
+                    logger.warning(f"---FAILED TO LOAD {url}: {str(e)}---")
+                    self.failed_urls[url] = str(e)
+                    continue
+                yield url, documents
+
+    def load(self, urls: List[str]) -> List[Document]:
+        """Load pages concurrently.
+
+        Args:
+            urls: The URLs to load
+
+        Returns:
+            List[Document]: The documents of all pages that loaded, in the order of ``urls``
+        """
+        loaded = dict(self.lazy_load(urls))
+        return [document for url in urls for document in loaded.get(url, [])]
+
+    def close(self) -> None:
+        """Close all pooled sessions."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
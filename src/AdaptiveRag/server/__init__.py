@@ -0,0 +1,3 @@
+from src.AdaptiveRag.server.settings import ServerSettings, load_settings
+from src.AdaptiveRag.server.service import AdaptiveRAGService
+from src.AdaptiveRag.server.app import create_app
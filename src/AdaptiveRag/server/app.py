@@ -0,0 +1,71 @@
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from src.AdaptiveRag.server.settings import ServerSettings, load_settings
+from src.AdaptiveRag.server.service import AdaptiveRAGService
+from src.AdaptiveRag.metrics import get_metrics_registry
+
+
+class QueryRequest(BaseModel):
+    """Body of a query request."""
+
+    question: str = Field(min_length=1, description="The question to answer.")
+
+
+class QueryResponse(BaseModel):
+    """Answer to a query request."""
+
+    answer: Optional[str] = Field(description="The validated answer, or the best answer so far if the budget ran out.")
+    stop_reason: Optional[str] = Field(default=None, description="Why the request stopped early, if it did.")
+    llm_calls: int = Field(default=0, description="Number of LLM calls made for the request.")
+    cached: bool = Field(default=False, description="Whether the answer was served from the semantic cache.")
+    metrics: Optional[Dict[str, Any]] = Field(default=None, description="Per-step metrics, if metrics are enabled.")
+
+
+def create_app(settings: Optional[ServerSettings] = None) -> FastAPI:
+    """Create the ASGI application serving the Adaptive RAG graph.
+
+    The graph is built once at startup, and requests are served as soon as
+    the first chunks are indexed while ingest continues in the background.
+    Requests run concurrently on the event loop using the async
+    implementations of the graph nodes.
+
+    Args:
+        settings: Server settings, read from the environment and the ini file if omitted
+
+    Returns:
+        FastAPI: The application
+    """
+    settings = settings or load_settings()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.service = AdaptiveRAGService(settings.user_input)
+        yield
+        app.state.service.close()
+
+    app = FastAPI(title="Adaptive RAG", lifespan=lifespan)
+
+    @app.get("/health")
+    async def health():
+        retriever = app.state.service.retriever
+        return {"status": "ok", "indexing": retriever.indexing, "index_version": retriever.index_version}
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        return get_metrics_registry().render()
+
+    @app.post("/query", response_model=QueryResponse)
+    async def query(request: QueryRequest):
+        try:
+            return await app.state.service.aquery(request.question)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error processing the question: {str(e)}")
+
+    @app.post("/query/stream")
+    async def query_stream(request: QueryRequest):
+        return StreamingResponse(app.state.service.astream(request.question), media_type="application/x-ndjson")
+
+    return app
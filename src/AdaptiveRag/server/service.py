@@ -0,0 +1,145 @@
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+from langgraph.graph.state import CompiledStateGraph
+from src.AdaptiveRag.graph import GraphBuilder
+from src.AdaptiveRag.llm import get_llm
+from src.AdaptiveRag.retriever import Retriever
+from src.AdaptiveRag.cache import SemanticCache, get_semantic_cache
+from src.AdaptiveRag.state import RequestBudget
+from src.AdaptiveRag.nodes import AnswerGeneratorNode
+from src.AdaptiveRag.metrics import Instrumentation, RequestMetrics
+
+
+class AdaptiveRAGService:
+    """Answers questions with a graph built once and shared by all requests."""
+
+    def __init__(self, user_input: Dict[str, Any]):
+        """Start building the index and compile the graph.
+
+        Returns once the first chunks are searchable; the index keeps growing
+        in the background.
+
+        Args:
+            user_input: Dictionary containing user configuration
+
+        Raises:
+            RuntimeError: If the LLM or the graph cannot be initialized
+        """
+        self.user_input = user_input
+
+        if get_llm(user_input=user_input) is None:
+            raise RuntimeError(f"Failed to initialize the {user_input.get('selected_llm')} LLM")
+
+        # Serve requests from the chunks indexed so far while the rest of the corpus is ingested
+        self.retriever = Retriever(user_input)
+        self.retriever.get_retriever(wait=False)
+
+        self.graph: Optional[CompiledStateGraph] = GraphBuilder(user_input, retriever=self.retriever).setup_graph()
+        if self.graph is None:
+            raise RuntimeError("Graph setup failed")
+
+        self.budget = RequestBudget(user_input)
+        self.semantic_cache: Optional[SemanticCache] = get_semantic_cache(user_input)
+        self.metrics_enabled = bool(user_input.get("metrics", False))
+
+    def close(self) -> None:
+        """Release the resources held by the retriever."""
+        self.retriever.close()
+
+    def _start(self, question: str):
+        """Create the graph input and run config of a request, with a metrics record if metrics are enabled."""
+        state, config = self.budget.start(question)
+        request_metrics = Instrumentation.start_request(config) if self.metrics_enabled else None
+        return state, config, request_metrics
+
+    async def _cached_answer(self, question: str):
+        """Look the question up in the semantic cache, returning the answer and the question embedding."""
+        if self.semantic_cache is None:
+            return None, None
+
+        embedding = await self.semantic_cache.aembed(question)
+        answer = self.semantic_cache.lookup(question, index_version=self.retriever.index_version, embedding=embedding)
+        return answer, embedding
+
+    def _store_answer(self, question: str, final_state: Dict[str, Any], embedding) -> None:
+        """Cache an answer that passed both graders; best-effort answers are not cached."""
+        if self.semantic_cache is not None and final_state.get("generation") and not final_state.get("stop_reason"):
+            self.semantic_cache.store(
+                question, final_state["generation"], index_version=self.retriever.index_version, embedding=embedding
+            )
+
+    @staticmethod
+    def _result(final_state: Dict[str, Any],
+                cached: bool = False,
+                request_metrics: Optional[RequestMetrics] = None) -> Dict[str, Any]:
+        return {
+            "answer": final_state.get("generation"),
+            "stop_reason": final_state.get("stop_reason"),
+            "llm_calls": final_state.get("llm_calls", 0),
+            "cached": cached,
+            "metrics": request_metrics.summary() if request_metrics is not None else None
+        }
+
+    async def aquery(self, question: str) -> Dict[str, Any]:
+        """Answer a question.
+
+        Args:
+            question: The user question
+
+        Returns:
+            dict: The answer, the stop reason if the request ran out of budget,
+            the number of LLM calls, whether the answer came from the cache and,
+            with metrics enabled, the per-step metrics of the request
+        """
+        answer, embedding = await self._cached_answer(question)
+        if answer:
+            return self._result({"generation": answer}, cached=True)
+
+        state, config, request_metrics = self._start(question)
+        final_state = await self.graph.ainvoke(state, config=config)
+
+        self._store_answer(question, final_state, embedding)
+        return self._result(final_state, request_metrics=request_metrics)
+
+    async def astream(self, question: str) -> AsyncIterator[str]:
+        """Answer a question, streaming newline-delimited JSON events.
+
+        Emits ``token`` events while the answer is generated, a ``reset`` event
+        when a rejected draft is regenerated, and a final ``answer`` event with
+        the validated answer.
+
+        Args:
+            question: The user question
+
+        Yields:
+            str: One JSON encoded event per line
+        """
+        answer, embedding = await self._cached_answer(question)
+        if answer:
+            yield json.dumps({"type": "answer", **self._result({"generation": answer}, cached=True)}) + "\n"
+            return
+
+        draft_step = None
+        final_state: Dict[str, Any] = {}
+
+        state, config, request_metrics = self._start(question)
+        async for mode, chunk in self.graph.astream(state, config=config, stream_mode=["messages", "values"]):
+            if mode == "values":
+                final_state = chunk
+                continue
+
+            message, metadata = chunk
+            if AnswerGeneratorNode.GENERATION_TAG not in metadata.get("tags", []):
+                continue
+            if not isinstance(message.content, str) or not message.content:
+                continue
+
+            if metadata.get("langgraph_step") != draft_step:
+                if draft_step is not None:
+                    yield json.dumps({"type": "reset"}) + "\n"
+                draft_step = metadata.get("langgraph_step")
+
+            yield json.dumps({"type": "token", "content": message.content}) + "\n"
+
+        self._store_answer(question, final_state, embedding)
+        yield json.dumps({"type": "answer", **self._result(final_state, request_metrics=request_metrics)}) + "\n"
@@ -0,0 +1,67 @@
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from src.AdaptiveRag.ui.uiconfigfile import Config
+from src.AdaptiveRag.llm.llm import LLM_PROVIDERS
+
+ENV_PREFIX = "ADAPTIVE_RAG_"
+DEFAULT_CONFIG_FILE = "./src/AdaptiveRag/ui/uiconfigfile.ini"
+
+
+@dataclass
+class ServerSettings:
+    """Settings of the headless API server."""
+
+    host: str = "0.0.0.0"
+    port: int = 8000
+    # The same configuration dictionary the Streamlit UI builds from its widgets
+    user_input: Dict[str, Any] = field(default_factory=dict)
+
+
+def load_settings(config_file_path: Optional[str] = None) -> ServerSettings:
+    """Read the server settings from the environment and the [SERVER] section of the ini file.
+
+    Every option can be overridden by an environment variable of the same
+    name prefixed with ``ADAPTIVE_RAG_`` (e.g. ``ADAPTIVE_RAG_URLS``). The
+    grader thresholds default to the [GRADER] section shared with the UI and
+    can be overridden as ``GRADER_ACCEPT_THRESHOLD`` and
+    ``GRADER_REJECT_THRESHOLD``. API keys
+    are read from the usual provider variables (``OPENAI_API_KEY``,
+    ``TAVILY_API_KEY``, ...).
+
+    Args:
+        config_file_path: Path of the ini file, defaults to ``ADAPTIVE_RAG_CONFIG_FILE`` or the UI config file
+
+    Returns:
+        ServerSettings: The server settings
+
+    Raises:
+        ValueError: If the configured LLM provider is not supported
+    """
+    config = Config(config_file_path or os.getenv(f"{ENV_PREFIX}CONFIG_FILE", DEFAULT_CONFIG_FILE))
+    options = config.get_server_options()
+
+    def option(name: str, default: Optional[str] = None) -> Optional[str]:
+        return os.getenv(f"{ENV_PREFIX}{name}") or options.get(name) or default
+
+    selected_llm = option("SELECTED_LLM", "OpenAI")
+    llm_class = LLM_PROVIDERS.get(selected_llm)
+    if llm_class is None:
+        raise ValueError(f"Unsupported LLM provider: {selected_llm}")
+
+    thresholds = config.get_grader_thresholds()
+    urls = option("URLS", "")
+    user_input: Dict[str, Any] = {
+        "selected_llm": selected_llm,
+        llm_class.MODEL_KEY: option("MODEL"),
+        "urls": [url.strip() for url in urls.replace("\n", ",").split(",") if url.strip()],
+        "metrics": option("METRICS", "false").lower() in ("1", "true", "yes"),
+        "grader_accept_threshold": float(option("GRADER_ACCEPT_THRESHOLD", thresholds["grader_accept_threshold"])),
+        "grader_reject_threshold": float(option("GRADER_REJECT_THRESHOLD", thresholds["grader_reject_threshold"]))
+    }
+
+    return ServerSettings(
+        host=option("HOST", "0.0.0.0"),
+        port=int(option("PORT", "8000")),
+        user_input=user_input
+    )
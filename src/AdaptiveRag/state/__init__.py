@@ -1 +1,2 @@
-from src.AdaptiveRag.state.state import AdaptiveRAGState
\ No newline at end of file
+from src.AdaptiveRag.state.state import AdaptiveRAGState
+from src.AdaptiveRag.state.budget import RequestBudget, LLMCallCounter
@@ -0,0 +1,154 @@
+import time
+import threading
+from typing import Any, Dict, Optional, Tuple
+from itertools import chain
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import RunnableConfig
+from src.AdaptiveRag.cache.llm_cache import CACHED_GENERATION_KEY
+
+
+class LLMCallCounter(BaseCallbackHandler):
+    """Callback handler counting the LLM calls and tokens used while answering one request.
+
+    Calls are counted when they end, since LangChain starts a run before it
+    consults the LLM cache; calls served from the cache are not counted.
+    Failed calls are counted, as the provider was still called.
+    """
+
+    # Count synchronously even under async execution, so budget checks see up-to-date numbers
+    run_inline = True
+
+    def __init__(self):
+        """Initialize the counters at zero."""
+        self.count = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def _increment(self) -> None:
+        with self._lock:
+            self.count += 1
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        self._increment()
+
+    @staticmethod
+    def _from_cache(response: LLMResult) -> bool:
+        generations = list(chain.from_iterable(response.generations))
+        return bool(generations) and all(
+            (generation.generation_info or {}).get(CACHED_GENERATION_KEY) for generation in generations
+        )
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        if self._from_cache(response):
+            return
+
+        prompt_tokens = completion_tokens = 0
+        for generation in chain.from_iterable(response.generations):
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+
+        # Providers that don't attach usage to the messages report it in llm_output
+        if not prompt_tokens and not completion_tokens:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            prompt_tokens = token_usage.get("prompt_tokens", 0)
+            completion_tokens = token_usage.get("completion_tokens", 0)
+
+        with self._lock:
+            self.count += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+
+class RequestBudget:
+    """Per-request limits on the retry cycles, LLM calls and wall-clock time of the graph.
+
+    The regeneration and rewrite counters and the deadline live in the
+    ``AdaptiveRAGState``; LLM calls are counted by an ``LLMCallCounter``
+    attached to the request's run config. Edges check the budget before
+    looping back, and route to the budget exhausted node of the step they
+    could not take once any limit is used up. Regenerations are limited per
+    question, as every rewrite resets the generation counter, while rewrites,
+    LLM calls and time are limited per request.
+    """
+
+    COUNTER_KEY = "llm_call_counter"
+
+    def __init__(self, user_input: Dict[str, Any]):
+        """Initialize the budget limits from the user configuration.
+
+        Args:
+            user_input: Dictionary containing user configuration
+        """
+        self.max_regenerations = int(user_input.get("max_regenerations", 2))
+        self.max_rewrites = int(user_input.get("max_rewrites", 2))
+        self.max_llm_calls = int(user_input.get("max_llm_calls", 30))
+        timeout = user_input.get("request_timeout", 120)
+        self.timeout = float(timeout) if timeout else None
+
+    def start(self, question: str) -> Tuple[Dict[str, Any], RunnableConfig]:
+        """Create the graph input and run config for a new request.
+
+        Args:
+            question: The user question
+
+        Returns:
+            The initial graph state and the run config carrying the LLM call counter
+        """
+        counter = LLMCallCounter()
+        state = {
+            "question": question,
+            "generation_count": 0,
+            "rewrite_count": 0,
+            "llm_calls": 0,
+            "deadline": time.time() + self.timeout if self.timeout else None,
+            "stop_reason": None
+        }
+        config: RunnableConfig = {"callbacks": [counter], "configurable": {self.COUNTER_KEY: counter}}
+        return state, config
+
+    @classmethod
+    def llm_calls(cls, state: Dict[str, Any], config: Optional[RunnableConfig] = None) -> int:
+        """Number of LLM calls made so far in the request.
+
+        Args:
+            state: Current pipeline state
+            config: Run config of the request
+
+        Returns:
+            int: The live counter value, or the last value recorded in the state
+        """
+        counter = ((config or {}).get("configurable") or {}).get(cls.COUNTER_KEY)
+        return counter.count if counter is not None else state.get("llm_calls") or 0
+
+    def exhausted(self,
+                  state: Dict[str, Any],
+                  config: Optional[RunnableConfig] = None,
+                  next_step: Optional[str] = None) -> Optional[str]:
+        """Check whether the request may continue with the next step.
+
+        Args:
+            state: Current pipeline state
+            config: Run config of the request
+            next_step: "regenerate" or "rewrite" to also check the matching loop budget
+
+        Returns:
+            The reason the budget is exhausted, or None if the request may continue
+        """
+        deadline = state.get("deadline")
+        if deadline is not None and time.time() >= deadline:
+            return "deadline exceeded"
+
+        if self.llm_calls(state, config) >= self.max_llm_calls:
+            return "llm call budget exhausted"
+
+        if next_step == "regenerate" and state.get("generation_count", 0) > self.max_regenerations:
+            return "regeneration budget exhausted"
+
+        if next_step == "rewrite" and state.get("rewrite_count", 0) >= self.max_rewrites:
+            return "rewrite budget exhausted"
+
+        return None
@@ -3,17 +3,29 @@ from typing import TypedDict, List, Optional
 
 class AdaptiveRAGState(TypedDict):
     """Represents the state of the adaptive RAG processing pipeline.
-    
+
     This state object is passed between nodes in the RAG graph and tracks
     the question, retrieved documents, and generated answers throughout
     the processing pipeline.
-    
+
     Attributes:
         question: The user's original question or query
         documents: List of retrieved documents relevant to the question
         generation: The final generated answer based on the documents
+        context: The packed document context the generation was based on
+        generation_count: Number of answers generated for the current question, reset by every rewrite
+        rewrite_count: Number of question rewrites so far in this request
+        llm_calls: Number of LLM calls made so far in this request
+        deadline: Wall-clock time (epoch seconds) by which the request must finish
+        stop_reason: Why the request stopped early, None if it completed normally
     """
-    
+
     question: str
     documents: List[Document]
-    generation: Optional[str]
\ No newline at end of file
+    generation: Optional[str]
+    context: Optional[str]
+    generation_count: int
+    rewrite_count: int
+    llm_calls: int
+    deadline: Optional[float]
+    stop_reason: Optional[str]
@@ -1,19 +1,30 @@
 
 import streamlit as st
-from typing import Literal
+from typing import Literal, Optional
 from langgraph.graph.state import CompiledStateGraph
+from src.AdaptiveRag.nodes import AnswerGeneratorNode
+from src.AdaptiveRag.cache import SemanticCache
+from src.AdaptiveRag.state import RequestBudget
 
 class DisplayResultStreamlit:
     """Displays chatbot interaction results in Streamlit UI."""
 
-    def __init__(self, graph: CompiledStateGraph, user_message: str):
+    def __init__(self,
+                 graph: CompiledStateGraph,
+                 user_message: str,
+                 semantic_cache: Optional[SemanticCache] = None,
+                 index_version: Optional[str] = None,
+                 budget: Optional[RequestBudget] = None):
         self.graph = graph
         self.user_message = user_message
+        self.semantic_cache = semantic_cache
+        self.index_version = index_version
+        self.budget = budget or RequestBudget({})
 
         # Initialize message history if not in session state
         if "message_history" not in st.session_state:
-            st.session_state.message_history = []   
-    
+            st.session_state.message_history = []
+
     def _display_message(self,role:Literal["user","assistant"], message:str) -> None:
         with st.chat_message(role):
             st.markdown(message)
@@ -21,25 +32,95 @@ class DisplayResultStreamlit:
     def _display_chat_history(self) -> None:
         for chat in st.session_state.message_history:
             self._display_message(chat["role"], chat["message"])
-    
+
+    def _stream_response(self) -> Optional[dict]:
+        """Run the graph, showing the draft answer token by token while it is generated.
+
+        The draft is shown as soon as the answer generator starts producing
+        tokens and is marked as unverified while the grading edges run. A
+        regeneration replaces the draft, and once the graph has finished the
+        validated answer confirms or replaces whatever draft is on screen.
+
+        Returns:
+            The final graph state, or None if the graph produced none
+        """
+        with st.chat_message("assistant"):
+            draft_placeholder = st.empty()
+            status_placeholder = st.empty()
+
+            draft = ""
+            draft_step = None
+            final_state = None
+
+            state, config = self.budget.start(self.user_message)
+            for mode, chunk in self.graph.stream(
+                input=state,
+                config=config,
+                stream_mode=["messages", "values"]
+            ):
+                if mode == "values":
+                    final_state = chunk
+                    continue
+
+                message, metadata = chunk
+                if AnswerGeneratorNode.GENERATION_TAG not in metadata.get("tags", []):
+                    continue
+                if not isinstance(message.content, str) or not message.content:
+                    continue
+
+                # A new generation attempt (after a failed grading) starts a new draft
+                if metadata.get("langgraph_step") != draft_step:
+                    draft_step = metadata.get("langgraph_step")
+                    draft = ""
+
+                draft += message.content
+                draft_placeholder.markdown(draft + "▌")
+                status_placeholder.caption("Verifying the answer...")
+
+            status_placeholder.empty()
+
+            generation = (final_state or {}).get("generation")
+            if generation:
+                draft_placeholder.markdown(generation)
+            else:
+                draft_placeholder.empty()
+
+            if (final_state or {}).get("stop_reason"):
+                status_placeholder.caption(f"Stopped early: {final_state['stop_reason']}")
+
+            return final_state
+
     def handle_adaptive_rag_conversation(self) -> None:
         self._display_chat_history()
 
         st.session_state.message_history.append({"role": "user", "message": self.user_message})
         self._display_message("user", self.user_message)
-        
+
         try:
-            response = self.graph.invoke(
-                input= {
-                    'question': self.user_message
-                }
-            )
-            ai_response = response['generation']
-            
-            st.session_state.message_history.append({"role": "assistant", "message": ai_response})
-            self._display_message("assistant", ai_response)
-                
+            # Answer rephrasings of already answered questions without running the graph
+            embedding = None
+            ai_response = None
+            if self.semantic_cache is not None:
+                embedding = self.semantic_cache.embed(self.user_message)
+                ai_response = self.semantic_cache.lookup(
+                    self.user_message, index_version=self.index_version, embedding=embedding
+                )
+
+            if ai_response:
+                self._display_message("assistant", ai_response)
+            else:
+                final_state = self._stream_response() or {}
+                ai_response = final_state.get("generation")
+
+                # Only answers that passed both graders are cached, not best-effort ones from an exhausted budget
+                if ai_response and not final_state.get("stop_reason") and self.semantic_cache is not None:
+                    self.semantic_cache.store(
+                        self.user_message, ai_response, index_version=self.index_version, embedding=embedding
+                    )
+
+            if ai_response:
+                st.session_state.message_history.append({"role": "assistant", "message": ai_response})
 
         except Exception as e:
             st.error(f"Error processing response: {str(e)}")
-            
\ No newline at end of file
+
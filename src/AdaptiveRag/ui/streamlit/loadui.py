@@ -81,6 +81,27 @@ class StreamlitUILoader:
             "https://app.tavily.com/home"
         )
     
+    def _setup_grader_configuration(self) -> None:
+        """Set up the similarity thresholds that let the document grader skip the LLM."""
+        thresholds = self.config.get_grader_thresholds()
+        with st.expander("Document grading"):
+            self.user_input['grader_accept_threshold'] = st.number_input(
+                label="Accept without LLM from similarity",
+                min_value=0.0,
+                max_value=1.0,
+                value=thresholds['grader_accept_threshold'],
+                step=0.05,
+                help="Cosine similarity from which retrieved chunks count as relevant without an LLM call."
+            )
+            self.user_input['grader_reject_threshold'] = st.number_input(
+                label="Reject without LLM below similarity",
+                min_value=0.0,
+                max_value=1.0,
+                value=thresholds['grader_reject_threshold'],
+                step=0.05,
+                help="Cosine similarity below which retrieved chunks count as irrelevant without an LLM call."
+            )
+
     def _home_page(self):
         page_title = self.config.get_page_title()
         # st.set_page_config(page_title="🤖 " + page_title, layout="wide")
@@ -177,5 +198,6 @@ class StreamlitUILoader:
                     self._setup_anthropic_configuration()
                 
                 self._setup_tavily_configuration()
+                self._setup_grader_configuration()
         
         return self.user_input
\ No newline at end of file
@@ -0,0 +1,31 @@
+from contextlib import contextmanager
+from typing import Iterator
+import streamlit as st
+from src.AdaptiveRag.progress import ProgressReporter
+
+
+class StreamlitProgressReporter(ProgressReporter):
+    """Renders pipeline progress, warnings and errors into the Streamlit page."""
+
+    # Streamlit elements can only be created from the script thread
+    thread_safe = False
+
+    def write(self, message: str) -> None:
+        st.write(message)
+
+    def info(self, message: str) -> None:
+        st.info(message)
+
+    def warning(self, message: str) -> None:
+        st.warning(message)
+
+    def error(self, message: str) -> None:
+        st.error(message)
+
+    def open_status(self, label: str, expanded: bool = True):
+        return st.status(label, expanded=expanded)
+
+    @contextmanager
+    def status(self, label: str, expanded: bool = True) -> Iterator:
+        with st.status(label, expanded=expanded) as status:
+            yield status
@@ -39,6 +39,18 @@ class Config:
     def get_page_title(self):
         return self.config['DEFAULT'].get('PAGE_TITLE', 'Adaptive RAG')
 
+    def get_grader_thresholds(self):
+        section = self.config['GRADER'] if 'GRADER' in self.config else {}
+        return {
+            "grader_accept_threshold": float(section.get('ACCEPT_THRESHOLD', 0.85)),
+            "grader_reject_threshold": float(section.get('REJECT_THRESHOLD', 0.2))
+        }
+
+    def get_server_options(self):
+        if 'SERVER' not in self.config:
+            return {}
+        return {key.upper(): value.strip() for key, value in self.config['SERVER'].items() if key != 'page_title'}
+
 if __name__ == "__main__":
     config = Config()
     print(config.get_llm_options())
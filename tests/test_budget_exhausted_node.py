@@ -0,0 +1,37 @@
+from src.AdaptiveRag.nodes.budget_exhausted_node import BudgetExhaustedNode
+from src.AdaptiveRag.state.budget import RequestBudget
+
+USER_INPUT = {"max_regenerations": 2, "max_rewrites": 2, "max_llm_calls": 30, "request_timeout": 0}
+
+
+def request_state(**updates) -> tuple:
+    state, config = RequestBudget(USER_INPUT).start("What is agent memory?")
+    state.update(generation="Agents store memories in a vector database.", **updates)
+    return state, config
+
+
+def test_exhausted_regenerations_return_fallback_answer():
+    # Both loop budgets are used up; the reason must be the one of the regeneration edge
+    state, config = request_state(generation_count=3, rewrite_count=2)
+    result = BudgetExhaustedNode(USER_INPUT, next_step="regenerate").budget_exhausted_node(state, config)
+
+    assert result["stop_reason"] == "regeneration budget exhausted"
+    assert result["generation"] == BudgetExhaustedNode.FALLBACK_ANSWER
+
+
+def test_exhausted_rewrites_keep_grounded_answer():
+    state, config = request_state(generation_count=3, rewrite_count=2)
+    result = BudgetExhaustedNode(USER_INPUT, next_step="rewrite").budget_exhausted_node(state, config)
+
+    assert result["stop_reason"] == "rewrite budget exhausted"
+    assert result["generation"] == state["generation"]
+
+
+def test_regenerations_are_budgeted_per_question():
+    budget = RequestBudget(USER_INPUT)
+    state, config = request_state(generation_count=3, rewrite_count=1)
+    assert budget.exhausted(state, config, next_step="regenerate") == "regeneration budget exhausted"
+
+    # A rewrite resets the counter, so the new question gets its own regenerations
+    state.update(generation_count=1, rewrite_count=2)
+    assert budget.exhausted(state, config, next_step="regenerate") is None
@@ -0,0 +1,30 @@
+from langchain.schema import Document
+from src.AdaptiveRag.context.packer import ContextPacker
+from src.AdaptiveRag.retriever import RELEVANCE_SCORE_KEY
+
+
+def _passage(topic: str, words: int) -> str:
+    return " ".join(f"{topic}{i}" for i in range(words))
+
+
+def test_retriever_order_is_kept_when_some_documents_are_unscored():
+    fused = [
+        Document(page_content=_passage("keyword", 20)),
+        Document(page_content=_passage("dense", 20), metadata={RELEVANCE_SCORE_KEY: 0.9}),
+        Document(page_content=_passage("web", 20))
+    ]
+
+    passages = ContextPacker(token_budget=None).select(fused)
+
+    assert passages == [doc.page_content for doc in fused]
+
+
+def test_passages_over_the_budget_are_skipped_for_smaller_ones():
+    packer = ContextPacker(token_budget=None, min_truncated_tokens=1000)
+    large = _passage("large", 200)
+    small = _passage("small", 10)
+    packer.token_budget = packer.count_tokens(small) + 10
+
+    passages = packer.select([Document(page_content=large), Document(page_content=small)])
+
+    assert passages == [small]
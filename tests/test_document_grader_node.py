@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+from langchain.schema import Document
+from src.AdaptiveRag.benchmark.fakes import FAKE_PROVIDER, register_fakes
+from src.AdaptiveRag.nodes.document_grader_node import DocumentGraderNode
+
+DOCUMENTS = [
+    Document(page_content="Agents keep long-term memory in a vector store."),
+    Document(page_content="The match ended two to one after extra time.")
+]
+
+
+def grader(grading_mode: str) -> DocumentGraderNode:
+    register_fakes()
+    return DocumentGraderNode({
+        "selected_llm": FAKE_PROVIDER,
+        "llm_params": {"responses": {
+            # Graders answer with stray whitespace and capitals
+            "GradeDocument": [
+                {"when": "long-term memory", "output": {"binary_score": " Yes"}},
+                {"output": {"binary_score": "NO\n"}}
+            ],
+            "GradeDocuments": [{"output": {"binary_scores": ["YES ", "No"]}}]
+        }},
+        "llm_cache": False,
+        "document_grading_mode": grading_mode
+    })
+
+
+@pytest.mark.parametrize("grading_mode", [DocumentGraderNode.PARALLEL, DocumentGraderNode.SINGLE_CALL])
+def test_scores_are_normalized_on_every_grading_path(grading_mode):
+    node = grader(grading_mode)
+    state = {"question": "How do agents remember things?", "documents": DOCUMENTS}
+
+    assert node.document_grader_node(state)["documents"] == DOCUMENTS[:1]
+    assert asyncio.run(node.adocument_grader_node(state))["documents"] == DOCUMENTS[:1]
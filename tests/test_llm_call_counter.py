@@ -0,0 +1,55 @@
+import pytest
+from langchain.schema import Document
+from langchain_core.runnables import RunnableLambda
+from src.AdaptiveRag.benchmark.fakes import FAKE_PROVIDER, register_fakes
+from src.AdaptiveRag.cache import llm_cache
+from src.AdaptiveRag.nodes.document_grader_node import DocumentGraderNode
+from src.AdaptiveRag.state.budget import RequestBudget
+
+
+GRADER_USER_INPUT = {
+    "selected_llm": FAKE_PROVIDER,
+    "llm_params": {"responses": {"GradeDocument": [{"output": {"binary_score": "yes"}}]}},
+    "llm_cache": True
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_caches():
+    # Every test starts from empty process-wide caches, so no other test has warmed them up
+    llm_cache._llm_caches.clear()
+    yield
+    llm_cache._llm_caches.clear()
+
+
+def grade(node: DocumentGraderNode, documents: list) -> int:
+    """Grade the documents as the graph does and return the number of counted LLM calls."""
+    budget = RequestBudget({})
+    state, config = budget.start("What is agent memory?")
+    state["documents"] = documents
+    result = RunnableLambda(node.document_grader_node).invoke(state, config)
+    assert len(result["documents"]) == len(documents)
+    return config["configurable"][RequestBudget.COUNTER_KEY].count
+
+
+def test_repeated_grading_makes_no_counted_calls():
+    register_fakes()
+    node = DocumentGraderNode(GRADER_USER_INPUT)
+    documents = [Document(page_content=f"Agents keep memory in store {i}.") for i in range(3)]
+
+    assert grade(node, documents) == len(documents)
+    assert grade(node, documents) == 0
+
+
+def test_cache_hits_are_not_counted_as_tokens():
+    register_fakes()
+    node = DocumentGraderNode(GRADER_USER_INPUT)
+    documents = [Document(page_content="Agents plan with task decomposition.")]
+    grade(node, documents)
+
+    budget = RequestBudget({})
+    state, config = budget.start("What is agent memory?")
+    state["documents"] = documents
+    RunnableLambda(node.document_grader_node).invoke(state, config)
+    counter = config["configurable"][RequestBudget.COUNTER_KEY]
+    assert (counter.count, counter.prompt_tokens, counter.completion_tokens) == (0, 0, 0)
@@ -0,0 +1,96 @@
+import threading
+
+from src.AdaptiveRag.progress import ProgressReporter, QueuedProgressReporter
+from src.AdaptiveRag.progress.reporter import ProgressStatus
+
+
+class RecordingStatus(ProgressStatus):
+    def __init__(self, reporter: "RecordingReporter", label: str):
+        super().__init__(label)
+        self.reporter = reporter
+
+    def update(self, label=None, state=None, expanded=None) -> None:
+        self.reporter.messages.append(("update_status", label, state, threading.current_thread().name))
+
+
+class RecordingReporter(ProgressReporter):
+    thread_safe = False
+
+    def __init__(self):
+        self.messages = []
+
+    def write(self, message: str) -> None:
+        self.messages.append(("write", message, threading.current_thread().name))
+
+    def warning(self, message: str) -> None:
+        self.messages.append(("warning", message, threading.current_thread().name))
+
+    def open_status(self, label: str, expanded: bool = True) -> ProgressStatus:
+        self.messages.append(("open_status", label, threading.current_thread().name))
+        return RecordingStatus(self, label)
+
+
+def run_in_thread(target) -> None:
+    worker = threading.Thread(target=target, name="retriever-build")
+    worker.start()
+    worker.join()
+
+
+def test_background_progress_is_rendered_by_the_draining_thread():
+    target = RecordingReporter()
+    reporter = QueuedProgressReporter(target)
+
+    def build():
+        reporter.write("Loading 2 document source(s)...")
+        reporter.warning("Failed to load 1 URL(s)")
+
+    run_in_thread(build)
+    assert target.messages == []
+
+    assert reporter.drain() == 2
+    main_thread = threading.current_thread().name
+    assert target.messages == [
+        ("write", "Loading 2 document source(s)...", main_thread),
+        ("warning", "Failed to load 1 URL(s)", main_thread)
+    ]
+    assert reporter.drain() == 0
+
+
+def test_status_updates_between_drains_are_collapsed_into_one():
+    target = RecordingReporter()
+    reporter = QueuedProgressReporter(target)
+    status = reporter.open_status("Getting the retriever...")
+    assert reporter.drain() == 1
+
+    def index():
+        for indexed in range(64, 1025, 64):
+            status.update(label=f"Indexed {indexed} chunk(s)...")
+
+    run_in_thread(index)
+    assert reporter.drain() == 1
+    main_thread = threading.current_thread().name
+    assert target.messages == [
+        ("open_status", "Getting the retriever...", main_thread),
+        ("update_status", "Indexed 1024 chunk(s)...", None, main_thread)
+    ]
+
+    status.update(label="Retriever created successfully!", state="complete")
+    status.update(label="Ignored once complete")
+    assert reporter.drain() == 1
+    assert target.messages[-1] == ("update_status", "Retriever created successfully!", "complete", main_thread)
+
+
+def test_open_statuses_are_shown_again_after_reopen():
+    target = RecordingReporter()
+    reporter = QueuedProgressReporter(target)
+    running = reporter.open_status("Getting the retriever...")
+    done = reporter.open_status("Loading the index...")
+    done.update(state="complete")
+    reporter.drain()
+    running.update(label="Indexed 64 chunk(s)...")
+
+    target.messages.clear()
+    reporter.reopen()
+    reporter.drain()
+
+    assert [message[:2] for message in target.messages] == [("open_status", "Indexed 64 chunk(s)...")]
@@ -0,0 +1,19 @@
+from langchain_community.vectorstores import FAISS
+from src.AdaptiveRag.benchmark.fakes import HashingEmbeddings
+from src.AdaptiveRag.retriever.scoring import RELEVANCE_SCORE_KEY, create_scored_retriever
+
+
+def test_relevance_scores_are_cosine_similarities_in_unit_range():
+    texts = [
+        "Agents keep short-term memory in the context window.",
+        "Prompt engineering steers model behavior without updating weights.",
+        "Adversarial attacks craft inputs that trigger unsafe outputs."
+    ]
+    vector_store = FAISS.from_texts(texts, HashingEmbeddings())
+    documents = create_scored_retriever(vector_store, top_k=3).invoke(texts[0])
+
+    scores = [doc.metadata[RELEVANCE_SCORE_KEY] for doc in documents]
+    assert all(0.0 <= score <= 1.0 for score in scores)
+    assert documents[0].page_content == texts[0]
+    assert abs(scores[0] - 1.0) < 1e-5
+    assert scores == sorted(scores, reverse=True)
@@ -0,0 +1,56 @@
+import time
+
+from src.AdaptiveRag.benchmark.corpus import LocalCorpusServer
+from src.AdaptiveRag.retriever.web_loader import ConcurrentWebLoader
+
+
+def test_loader_bounds_concurrent_requests():
+    with LocalCorpusServer(pages_per_topic=4, paragraphs=2, latency=0.2) as server:
+        urls = server.urls()
+        loader = ConcurrentWebLoader(max_workers=3, requests_per_second=0)
+        documents = loader.load(urls)
+        loader.close()
+
+    assert len(documents) == len(urls)
+    assert server.max_in_flight == 3
+
+
+def test_loader_rate_limits_requests_per_host():
+    requests_per_second = 10
+    with LocalCorpusServer(pages_per_topic=2, paragraphs=2) as server:
+        loader = ConcurrentWebLoader(max_workers=6, requests_per_second=requests_per_second)
+        started = time.monotonic()
+        loader.load(server.urls())
+        elapsed = time.monotonic() - started
+        loader.close()
+
+    # All pages are served by the same host, so requests are spaced by the minimum interval
+    request_times = sorted(server.request_times)
+    gaps = [later - earlier for earlier, later in zip(request_times, request_times[1:])]
+    assert len(request_times) == 6
+    assert min(gaps) >= 0.8 / requests_per_second
+    assert elapsed >= 5 * 0.8 / requests_per_second
+
+
+def test_loader_keeps_url_order_when_pages_complete_out_of_order():
+    with LocalCorpusServer(pages_per_topic=3, paragraphs=2, jitter=0.2) as server:
+        urls = server.urls()
+        loader = ConcurrentWebLoader(max_workers=9, requests_per_second=0)
+        completion_order = [url for url, _ in loader.lazy_load(urls)]
+        documents = loader.load(urls)
+        loader.close()
+
+    assert completion_order != urls
+    assert [doc.metadata["source"] for doc in documents] == urls
+
+
+def test_loader_records_failed_urls_and_loads_the_rest():
+    with LocalCorpusServer(pages_per_topic=1, paragraphs=2) as server:
+        urls = server.urls()
+        missing_url = urls[0].rsplit("/", 2)[0] + "/unknown-topic/0"
+        loader = ConcurrentWebLoader(max_workers=2, requests_per_second=0)
+        documents = loader.load([missing_url] + urls)
+        loader.close()
+
+    assert list(loader.failed_urls) == [missing_url]
+    assert [doc.metadata["source"] for doc in documents] == urls
@@ -0,0 +1,131 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.AdaptiveRag.benchmark.fakes import stub_tool_manager
+from src.AdaptiveRag.cache import web_search_cache
+from src.AdaptiveRag.cache.web_search_cache import WebSearchCache
+from src.AdaptiveRag.nodes.web_search_node import WebSearchNode
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fresh_web_search_caches():
+    # Every test starts from empty process-wide caches
+    web_search_cache._web_search_caches.clear()
+    yield
+    web_search_cache._web_search_caches.clear()
+
+
+def web_search_node(ttl: float = 900, latency: float = 0.0) -> WebSearchNode:
+    return WebSearchNode(
+        {"web_search_cache": True, "web_search_cache_ttl": ttl},
+        tool_manager=stub_tool_manager(latency=latency)
+    )
+
+
+def test_cache_hit_skips_the_tool():
+    node = web_search_node()
+    first = node.web_search_node({"question": "What is LangGraph?"})
+    second = node.web_search_node({"question": "What is LangGraph?"})
+
+    assert node.web_search_tool.calls == 1
+    assert [doc.page_content for doc in second["documents"]] == [doc.page_content for doc in first["documents"]]
+    assert node.web_search_cache.stats()["hits"] == 1
+
+
+def test_async_cache_hit_skips_the_tool():
+    node = web_search_node()
+
+    async def search_twice():
+        await node.aweb_search_node({"question": "What is LangGraph?"})
+        await node.aweb_search_node({"question": "What is LangGraph?"})
+
+    asyncio.run(search_twice())
+    assert node.web_search_tool.calls == 1
+
+
+def test_trivially_different_queries_share_an_entry():
+    node = web_search_node()
+    for question in ["What is LangGraph?", "  what is   langgraph ", "WHAT IS LANGGRAPH!"]:
+        node.web_search_node({"question": question})
+
+    assert WebSearchCache.normalize_query("  What is\tLangGraph?! ") == "what is langgraph"
+    assert node.web_search_tool.calls == 1
+
+
+def test_concurrent_identical_searches_share_one_call():
+    node = web_search_node(latency=0.3)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda _: node.web_search_node({"question": "What is LangGraph?"}), range(8)
+        ))
+
+    assert node.web_search_tool.calls == 1
+    assert node.web_search_cache.stats()["coalesced"] > 0
+    assert all(len(result["documents"]) == len(results[0]["documents"]) for result in results)
+
+
+def test_concurrent_identical_async_searches_share_one_call():
+    node = web_search_node(latency=0.3)
+
+    async def search_concurrently():
+        return await asyncio.gather(*[
+            node.aweb_search_node({"question": "What is LangGraph?"}) for _ in range(8)
+        ])
+
+    results = asyncio.run(search_concurrently())
+    assert node.web_search_tool.calls == 1
+    assert node.web_search_cache.stats()["coalesced"] > 0
+    assert all(len(result["documents"]) == len(results[0]["documents"]) for result in results)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = WebSearchCache(ttl=900, max_entries=2)
+    cache.search("agents", lambda: ["agents"])
+    cache.search("prompts", lambda: ["prompts"])
+    cache.search("agents", lambda: ["agents again"])
+    cache.search("attacks", lambda: ["attacks"])
+
+    assert cache.stats()["entries"] == 2
+    assert cache.search("agents", lambda: ["agents again"]) == ["agents"]
+    assert cache.search("prompts", lambda: ["prompts again"]) == ["prompts again"]
+    assert cache.stats()["misses"] == 4
+
+
+def test_search_params_are_part_of_the_key():
+    cache = WebSearchCache(ttl=900)
+    cache.search("langgraph", lambda: ["five results"], params={"max_results": 5})
+    results = cache.search("langgraph", lambda: ["ten results"], params={"max_results": 10})
+
+    assert results == ["ten results"]
+    assert cache.stats()["misses"] == 2
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(web_search_cache, "time", clock)
+    node = web_search_node(ttl=60)
+
+    node.web_search_node({"question": "What is LangGraph?"})
+    clock.now += 59
+    node.web_search_node({"question": "What is LangGraph?"})
+    assert node.web_search_tool.calls == 1
+
+    clock.now += 2
+    node.web_search_node({"question": "What is LangGraph?"})
+    assert node.web_search_tool.calls == 2
+
+
+def test_failed_searches_are_not_cached():
+    cache = WebSearchCache(ttl=900)
+    assert cache.search("langgraph", lambda: "Tavily error: rate limited") == "Tavily error: rate limited"
+    assert cache.search("langgraph", lambda: ["result"]) == ["result"]
+    assert cache.stats()["misses"] == 2